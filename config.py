@@ -1,9 +1,22 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(basedir, '.env'))
 
+
+def pool_options(prefix):
+    """Engine pool settings read from <prefix>_POOL_SIZE, _MAX_OVERFLOW, _POOL_RECYCLE and _POOL_TIMEOUT"""
+    options = {'pool_pre_ping': True}
+    for suffix, name in (('POOL_SIZE', 'pool_size'), ('MAX_OVERFLOW', 'max_overflow'),
+                         ('POOL_RECYCLE', 'pool_recycle'), ('POOL_TIMEOUT', 'pool_timeout')):
+        value = os.environ.get(f'{prefix}_{suffix}')
+        if value is not None:
+            options[name] = int(value)
+    return options
+
+
 class Config:
     # Flask
     SECRET_KEY = os.environ.get('SECRET_KEY')
@@ -13,17 +26,80 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', 'False') == 'True'
     
-    # Database Pool
-    # SQLALCHEMY_ENGINE_OPTIONS = {
-    #     'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
-    #     'pool_recycle': 3600,
-    #     'pool_pre_ping': True,
-    #     'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20))
-    # }
+    # Database Pool (primary: DB_POOL_SIZE, DB_MAX_OVERFLOW, ...)
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options('DB')
+    
+    # Read replicas: comma-separated URLs, each its own bind with
+    # DB_REPLICA_POOL_SIZE, DB_REPLICA_MAX_OVERFLOW, ... pool settings
+    DATABASE_REPLICA_URLS = [
+        url.strip() for url in os.environ.get('DATABASE_REPLICA_URL', '').split(',') if url.strip()
+    ]
+    SQLALCHEMY_BINDS = {
+        f'replica_{index}': dict(pool_options('DB_REPLICA'), url=url)
+        for index, url in enumerate(DATABASE_REPLICA_URLS)
+    }
+    
+    # Read-only views served from a replica on GET/HEAD
+    REPLICA_BLUEPRINTS = ['reports', 'api']
+    REPLICA_ENDPOINTS = [
+        'main.index', 'main.dashboard', 'items.list', 'items.detail',
+        'transactions.list', 'transactions.detail', 'categories.list', 'suppliers.list'
+    ]
+    
+    # Seconds a client keeps reading from the primary after it writes
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
     
     # Pagination
     ITEMS_PER_PAGE = 20
     
+    # Dashboard snapshot lifetime (seconds)
+    DASHBOARD_CACHE_SECONDS = int(os.environ.get('DASHBOARD_CACHE_SECONDS', 30))
+    
+    # Read model for list and report views: 'normalized' or 'denormalized'
+    READ_MODEL = os.environ.get('READ_MODEL', 'normalized')
+    
+    # Maintain and read the supplier_stats table for supplier performance.
+    # The table is not maintained while this is off: after turning it back
+    # on, run `flask rebuild-supplier-stats` before serving traffic, or the
+    # report shows the totals from when it was switched off
+    SUPPLIER_STATS_ENABLED = os.environ.get('SUPPLIER_STATS_ENABLED', 'True') == 'True'
+    
+    # Rendered report pages kept per worker
+    REPORT_CACHE_SIZE = int(os.environ.get('REPORT_CACHE_SIZE', 256))
+    # Longest a movement-dependent report may lag a movement committed
+    # out of transaction_id order
+    REPORT_CACHE_LEDGER_SECONDS = int(os.environ.get('REPORT_CACHE_LEDGER_SECONDS', 60))
+    
+    # Background report jobs
+    REPORT_JOB_DIR = os.environ.get(
+        'REPORT_JOB_DIR', os.path.join(tempfile.gettempdir(), 'invent_report_jobs')
+    )
+    REPORT_JOB_WORKERS = int(os.environ.get('REPORT_JOB_WORKERS', 2))
+    REPORT_JOB_START_METHOD = os.environ.get('REPORT_JOB_START_METHOD', 'spawn')
+    REPORT_JOB_TTL_SECONDS = int(os.environ.get('REPORT_JOB_TTL_SECONDS', 3600))
+    REPORT_JOB_TIMEOUT_SECONDS = int(os.environ.get('REPORT_JOB_TIMEOUT_SECONDS', 1800))
+    
+    # Socket.IO push (stock alert transitions to open dashboards)
+    SOCKETIO_ENABLED = os.environ.get('SOCKETIO_ENABLED', 'True') == 'True'
+    # Redis or Kombu URL shared by all processes; unset keeps events in-process
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    # 'threading' for the dev server and threaded workers; 'gevent' or
+    # 'eventlet' only under the matching (monkey-patched) server
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+    
+    # Bulk stock movement ingestion
+    BULK_MAX_MOVEMENTS = int(os.environ.get('BULK_MAX_MOVEMENTS', 50000))
+    
+    # Query profiler (per-endpoint query counts, DB time, N+1 and slow plans)
+    QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', 'True') == 'True'
+    # Statements at least this slow get their plan captured
+    QUERY_PROFILER_SLOW_MS = float(os.environ.get('QUERY_PROFILER_SLOW_MS', 100))
+    # Repeats of one statement in a request flagged as N+1
+    QUERY_PROFILER_DUPLICATE_THRESHOLD = int(os.environ.get('QUERY_PROFILER_DUPLICATE_THRESHOLD', 5))
+    # Re-run slow reads under EXPLAIN ANALYZE on a background thread (adds load)
+    QUERY_PROFILER_EXPLAIN = os.environ.get('QUERY_PROFILER_EXPLAIN', 'False') == 'True'
+    QUERY_PROFILER_EXPLAIN_INTERVAL = int(os.environ.get('QUERY_PROFILER_EXPLAIN_INTERVAL', 300))
+    
     # Performance Testing
     # PERF_TEST_DATA_SIZE = int(os.environ.get('PERF_TEST_DATA_SIZE', 10000))
 
@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
+from invent_app.database.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 from .app import create_app
\ No newline at end of file
@@ -2,12 +2,16 @@
 Flask Application Factory
 """
 import os
+import click
 from dotenv import load_dotenv
 from flask import Flask, render_template, session
 from flask_migrate import Migrate
 from config import Config
 from datetime import timedelta
 from invent_app import db 
+from invent_app.database import routing
+from invent_app.utils import realtime
+from performance.profilers import query_profiler
 
 load_dotenv()
 migrate = Migrate()
@@ -31,7 +35,10 @@ def create_app():
     
     # Initialize extensions with app
     db.init_app(app)
+    routing.init_app(app)
     migrate.init_app(app, db)
+    realtime.init_app(app)
+    query_profiler.init_app(app)
     
     # Register blueprints
     register_blueprints(app)
@@ -41,6 +48,9 @@ def create_app():
     
     # Register template filters
     register_template_filters(app)
+    
+    # Register CLI commands
+    register_cli_commands(app)
 
 
 
@@ -194,7 +204,7 @@ def register_cli_commands(app):
     @app.cli.command()
     def init_db():
         """Initialize the database with tables and seed data"""
-        from app.models.normalized.transaction_type import TransactionType
+        from invent_app.models.normalized.transaction_type import TransactionType
         
         # Create all tables
         db.create_all()
@@ -220,10 +230,10 @@ def register_cli_commands(app):
     @app.cli.command()
     def seed_sample_data():
         """Seed database with sample data for testing"""
-        from app.models.normalized.category import Category
-        from app.models.normalized.supplier import Supplier
-        from app.models.normalized.location import Location
-        from app.models.normalized.item import Item
+        from invent_app.models.normalized.category import Category
+        from invent_app.models.normalized.supplier import Supplier
+        from invent_app.models.normalized.location import Location
+        from invent_app.models.normalized.item import Item
         
         # Sample Categories
         categories = [
@@ -302,6 +312,74 @@ def register_cli_commands(app):
         
         print("Sample data seeding complete!")
     
+    @app.cli.command('rebuild-rollups')
+    @click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), help='First day to rebuild')
+    @click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), help='Last day to rebuild')
+    def rebuild_rollups(start, end):
+        """Backfill or rebuild the daily movement rollup from the ledger"""
+        from invent_app.services import rollup_service
+        
+        rows = rollup_service.rebuild(
+            start_date=start.date() if start else None,
+            end_date=end.date() if end else None
+        )
+        print(f"✓ Daily rollup rebuilt ({rows} rows)")
+    
+    @app.cli.command('rebuild-read-models')
+    def rebuild_read_models():
+        """Backfill or rebuild item_denorm and transaction_denorm"""
+        from invent_app.services import read_model_sync
+        
+        items, transactions = read_model_sync.rebuild()
+        print(f"✓ Read models rebuilt ({items} items, {transactions} transactions)")
+    
+    @app.cli.command('verify-valuation')
+    @click.option('--fix', is_flag=True, help='Rebuild the summary if it has drifted')
+    def verify_valuation(fix):
+        """Check category_valuation against a fresh aggregate of items"""
+        from invent_app.services import valuation_service
+        
+        mismatches = valuation_service.verify()
+        for category_id, stored, actual in mismatches:
+            print(f"✗ Category {category_id}: stored {stored}, actual {actual}")
+        
+        if not mismatches:
+            print("✓ Category valuation is consistent")
+        elif fix:
+            rows = valuation_service.rebuild()
+            print(f"✓ Category valuation rebuilt ({rows} categories)")
+    
+    @app.cli.command('rebuild-supplier-stats')
+    def rebuild_supplier_stats():
+        """Backfill or rebuild supplier_stats from the ledger"""
+        from invent_app.services import supplier_service
+        
+        rows = supplier_service.rebuild()
+        print(f"✓ Supplier stats rebuilt ({rows} suppliers)")
+    
+    @app.cli.command('rebuild-stock-alerts')
+    def rebuild_stock_alerts():
+        """Backfill or rebuild stock_alerts from items"""
+        from invent_app.services import alert_service
+        
+        rows = alert_service.rebuild()
+        print(f"✓ Stock alerts rebuilt ({rows} items)")
+    
+    @app.cli.command('snapshot-stock')
+    @click.option('--date', 'day', type=click.DateTime(formats=['%Y-%m-%d']),
+                  help='Day to record (default: yesterday, UTC)')
+    @click.option('--keep-days', type=int, help='Delete snapshots older than this many days')
+    def snapshot_stock(day, keep_days):
+        """Record closing stock per item for a day (run daily from cron)"""
+        from invent_app.services import stock_snapshot_service
+        
+        rows = stock_snapshot_service.take_snapshot(day.date() if day else None)
+        print(f"✓ Stock snapshot taken ({rows} items)")
+        
+        if keep_days is not None:
+            removed = stock_snapshot_service.prune_snapshots(keep_days)
+            print(f"✓ Old snapshots pruned ({removed} rows)")
+    
     @app.cli.command()
     def reset_db():
         """Drop all tables and recreate (CAUTION: Deletes all data!)"""
@@ -317,9 +395,11 @@ def register_cli_commands(app):
 
 def import_models():
     """Import all models to ensure they're registered with SQLAlchemy"""
-    from app.models.normalized import (
+    from invent_app.models.normalized import (
         category, supplier, location, item, 
         transaction, transaction_type
     )
-    # Import denormalized models if needed
-    # from app.models.denormalized import item_denorm, transaction_denorm
\ No newline at end of file
+    from invent_app.models.denormalized import (
+        daily_rollup, item_denorm, transaction_denorm, category_valuation, supplier_stats,
+        stock_snapshot, stock_alert
+    )
\ No newline at end of file
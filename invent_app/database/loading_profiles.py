@@ -0,0 +1,61 @@
+"""
+Eager-loading profiles
+One named set of loader options per view, so every row a template
+touches is fetched with the page query instead of one lazy load per
+relationship per row. Routes and exports apply profiles by name and
+never add their own joinedload() calls.
+"""
+
+from sqlalchemy.orm import joinedload
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+
+
+PROFILES = {
+    # Transactions
+    'transaction_list': (
+        joinedload(Transaction.item).load_only(Item.item_id, Item.item_name),
+        joinedload(Transaction.transaction_type),
+    ),
+    'transaction_detail': (
+        joinedload(Transaction.item).load_only(Item.item_id, Item.item_code, Item.item_name),
+        joinedload(Transaction.transaction_type),
+        joinedload(Transaction.supplier),
+    ),
+    'movement_history': (
+        joinedload(Transaction.item).load_only(Item.item_id, Item.item_code, Item.item_name),
+        joinedload(Transaction.transaction_type),
+        joinedload(Transaction.supplier),
+    ),
+    'item_recent_transactions': (
+        joinedload(Transaction.transaction_type),
+    ),
+
+    # Items
+    'item_list': (
+        joinedload(Item.category),
+        joinedload(Item.supplier),
+    ),
+    'item_detail': (
+        joinedload(Item.category),
+        joinedload(Item.supplier),
+        joinedload(Item.location),
+    ),
+    'stock_levels': (
+        joinedload(Item.category),
+    ),
+    'low_stock': (
+        joinedload(Item.category),
+        joinedload(Item.supplier),
+    ),
+}
+
+
+def apply_profile(query, name):
+    """Add the loader options of a named profile to a query"""
+    return query.options(*PROFILES[name])
+
+
+def profile_options(name):
+    """Loader options of a named profile, for Session.get(options=...)"""
+    return list(PROFILES[name])
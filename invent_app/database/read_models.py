@@ -0,0 +1,52 @@
+"""
+Read model selection
+List and report views ask here for the mapped class and base query to
+read from. READ_MODEL = 'normalized' serves them from the 3NF tables
+with their eager-loading profile; 'denormalized' serves them from
+item_denorm / transaction_denorm with no joins. Both expose the same
+column and display attribute names, so views and templates do not care
+which one they get.
+"""
+
+from flask import current_app
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.denormalized.item_denorm import ItemDenorm
+from invent_app.models.denormalized.transaction_denorm import TransactionDenorm
+from invent_app.database.loading_profiles import apply_profile
+
+
+def denormalized_reads():
+    """True when list and report views read the denormalized tables"""
+    return current_app.config['READ_MODEL'] == 'denormalized'
+
+
+def item_query(profile):
+    """
+    Item source for a list or report view
+
+    Args:
+        profile: Eager-loading profile used on the normalized schema
+
+    Returns:
+        tuple: (mapped class, query)
+    """
+    if denormalized_reads():
+        return ItemDenorm, db.session.query(ItemDenorm)
+    return Item, apply_profile(db.session.query(Item), profile)
+
+
+def transaction_query(profile):
+    """
+    Transaction source for a list or report view
+
+    Args:
+        profile: Eager-loading profile used on the normalized schema
+
+    Returns:
+        tuple: (mapped class, query)
+    """
+    if denormalized_reads():
+        return TransactionDenorm, db.session.query(TransactionDenorm)
+    return Transaction, apply_profile(db.session.query(Transaction), profile)
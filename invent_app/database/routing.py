@@ -0,0 +1,117 @@
+"""
+Read replica routing
+db.session is a RoutingSession. Within a GET/HEAD request to a read-only
+view (REPLICA_BLUEPRINTS, REPLICA_ENDPOINTS) its reads go to one of the
+replica binds from DATABASE_REPLICA_URL; everything else goes to the
+primary:
+
+- flushes, INSERT/UPDATE/DELETE and SELECT ... FOR UPDATE
+- every statement after the first write in the same transaction
+- CLI commands and other work outside a request (background report
+  jobs opt in with choose_replica())
+- requests from a client that wrote within REPLICA_STICKY_SECONDS, so
+  a redirect after a POST reads its own writes
+
+With no replica configured the session behaves exactly like the
+Flask-SQLAlchemy default.
+"""
+
+import random
+import time
+from flask import g, request, session as http_session, has_app_context, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+
+# Bind keys starting with this are treated as read replicas
+REPLICA_BIND_PREFIX = 'replica'
+
+# Flask session key holding the end of the read-your-writes window
+STICKY_SESSION_KEY = '_primary_until'
+
+
+class RoutingSession(Session):
+    """Session sending read-only request traffic to a replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or _is_write(clause):
+                self.info['wrote_primary'] = True
+            elif not self.info.get('wrote_primary'):
+                replica = _context_replica()
+                if replica is not None:
+                    return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_binds(app):
+    """Bind keys of the configured read replicas"""
+    return sorted(
+        key for key in (app.config.get('SQLALCHEMY_BINDS') or {})
+        if key and key.startswith(REPLICA_BIND_PREFIX)
+    )
+
+
+def choose_replica(app):
+    """Send the reads of the current app context to a random replica"""
+    replicas = replica_binds(app)
+    g.db_replica = random.choice(replicas) if replicas else None
+    return g.db_replica
+
+
+def init_app(app):
+    """Register the per-request routing hooks"""
+    replicas = replica_binds(app)
+    if not replicas:
+        return
+
+    blueprints = set(app.config['REPLICA_BLUEPRINTS'])
+    endpoints = set(app.config['REPLICA_ENDPOINTS'])
+
+    @app.before_request
+    def _choose_bind():
+        g.db_replica = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        if request.blueprint not in blueprints and request.endpoint not in endpoints:
+            return
+        if http_session.get(STICKY_SESSION_KEY, 0) > time.time():
+            return
+        g.db_replica = random.choice(replicas)
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if g.pop('db_wrote', False):
+            http_session[STICKY_SESSION_KEY] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+        return response
+
+
+# HELPER FUNCTIONS
+
+def _context_replica():
+    """Replica bind key chosen for the current request or job, if any"""
+    if not has_app_context():
+        return None
+    return g.get('db_replica')
+
+
+def _is_write(clause):
+    """True for DML and locking reads"""
+    if clause is None:
+        return False
+    if isinstance(clause, UpdateBase):
+        return True
+    return getattr(clause, '_for_update_arg', None) is not None
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_write(session):
+    """Open the read-your-writes window for the client that committed"""
+    if session.info.pop('wrote_primary', False) and has_request_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _forget_write(session):
+    session.info.pop('wrote_primary', None)
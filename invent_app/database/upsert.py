@@ -0,0 +1,36 @@
+"""
+Additive upserts
+INSERT ... ON CONFLICT statements that add the inserted values to the
+counters of an existing row, used to apply deltas to summary tables in
+one round trip per batch.
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite, mysql
+from invent_app import db
+
+
+def additive_upsert(table, key_columns, counter_columns):
+    """
+    Upsert statement for the current session's dialect
+
+    Args:
+        table: Table to write
+        key_columns: Names of the primary key columns
+        counter_columns: Names of the columns to add to on conflict
+
+    Returns:
+        Insert statement to execute with a list of parameter dicts
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({
+            name: table.c[name] + stmt.inserted[name] for name in counter_columns
+        })
+
+    stmt = (postgresql if dialect == 'postgresql' else sqlite).insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={name: table.c[name] + stmt.excluded[name] for name in counter_columns}
+    )
@@ -11,10 +11,10 @@ from invent_app import db
 class StockInForm(FlaskForm):
     """Form for recording stock in transactions"""
     
-    item_id = SelectField(
+    # Chosen through the /api/items/suggest typeahead
+    item_id = IntegerField(
         'Item',
-        validators=[DataRequired(message='Please select an item')],
-        coerce=int
+        validators=[DataRequired(message='Please select an item')]
     )
     
     quantity = IntegerField(
@@ -63,10 +63,10 @@ class StockInForm(FlaskForm):
 class StockOutForm(FlaskForm):
     """Form for recording stock out transactions"""
     
-    item_id = SelectField(
+    # Chosen through the /api/items/suggest typeahead
+    item_id = IntegerField(
         'Item',
-        validators=[DataRequired(message='Please select an item')],
-        coerce=int
+        validators=[DataRequired(message='Please select an item')]
     )
     
     quantity = IntegerField(
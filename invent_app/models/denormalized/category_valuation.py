@@ -0,0 +1,18 @@
+"""
+Database Models - Derived Summary Tables
+"""
+
+from sqlalchemy import Column, Integer, Numeric
+from invent_app import db
+
+class CategoryValuation(db.Model):
+    """Running item count, stock units and stock value per category"""
+    __tablename__ = 'category_valuation'
+    
+    category_id = Column(Integer, primary_key=True, autoincrement=False)
+    item_count = Column(Integer, default=0, nullable=False)
+    total_stock = Column(Integer, default=0, nullable=False)
+    total_value = Column(Numeric(16, 2), default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<CategoryValuation {self.category_id}: {self.total_value}>'
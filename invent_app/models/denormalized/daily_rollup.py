@@ -0,0 +1,26 @@
+"""
+Database Models - Derived Summary Tables
+"""
+
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey, Index
+from invent_app import db
+
+class TransactionDailyRollup(db.Model):
+    """Per day, item and transaction type movement totals"""
+    __tablename__ = 'transaction_daily_rollup'
+    
+    rollup_date = Column(Date, primary_key=True)
+    item_id = Column(Integer, ForeignKey('items.item_id'), primary_key=True)
+    type_id = Column(Integer, ForeignKey('transaction_types.type_id'), primary_key=True)
+    quantity = Column(Integer, default=0, nullable=False)
+    total_value = Column(Numeric(14, 2), default=0, nullable=False)
+    transaction_count = Column(Integer, default=0, nullable=False)
+    
+    # Indexes for common queries
+    __table_args__ = (
+        Index('idx_rollup_type_date', 'type_id', 'rollup_date'),
+        Index('idx_rollup_item_date', 'item_id', 'rollup_date'),
+    )
+    
+    def __repr__(self):
+        return f'<TransactionDailyRollup {self.rollup_date} item={self.item_id} type={self.type_id}>'
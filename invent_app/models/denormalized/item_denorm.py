@@ -0,0 +1,60 @@
+"""
+Database Models - Denormalized Read Models
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, Index
+from invent_app import db
+
+class ItemDenorm(db.Model):
+    """Items with their category, supplier and warehouse names inlined"""
+    __tablename__ = 'item_denorm'
+    
+    item_id = Column(Integer, primary_key=True, autoincrement=False)
+    item_code = Column(String(50), nullable=False, unique=True)
+    item_name = Column(String(200), nullable=False)
+    description = Column(Text)
+    category_id = Column(Integer, nullable=False, index=True)
+    category_name = Column(String(100), nullable=False)
+    supplier_id = Column(Integer, index=True)
+    supplier_name = Column(String(200))
+    location_id = Column(Integer)
+    warehouse = Column(String(50))
+    unit_price = Column(Numeric(10, 2), nullable=False)
+    current_stock = Column(Integer, default=0, nullable=False, index=True)
+    reorder_level = Column(Integer, default=10, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Indexes for common queries
+    __table_args__ = (
+        Index('idx_item_denorm_name', 'item_name', 'item_id'),
+    )
+    
+    def __repr__(self):
+        return f'<ItemDenorm {self.item_code}: {self.item_name}>'
+    
+    @property
+    def is_low_stock(self):
+        """Check if item is below reorder level"""
+        return self.current_stock <= self.reorder_level
+    
+    @property
+    def is_out_of_stock(self):
+        """Check if item is out of stock"""
+        return self.current_stock == 0
+    
+    @property
+    def stock_value(self):
+        """Calculate total stock value"""
+        return float(self.current_stock * self.unit_price)
+    
+    @property
+    def stock_status(self):
+        """Get stock status as string"""
+        if self.is_out_of_stock:
+            return 'Out of Stock'
+        elif self.is_low_stock:
+            return 'Low Stock'
+        else:
+            return 'In Stock'
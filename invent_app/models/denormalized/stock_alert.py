@@ -0,0 +1,20 @@
+"""
+Database Models - Derived Summary Tables
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from invent_app import db
+
+class StockAlert(db.Model):
+    """Items at or below their reorder level ('low') or with no stock ('out')"""
+    __tablename__ = 'stock_alerts'
+    
+    item_id = Column(Integer, primary_key=True, autoincrement=False)
+    level = Column(String(10), nullable=False, index=True)
+    current_stock = Column(Integer, nullable=False)
+    reorder_level = Column(Integer, nullable=False)
+    raised_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<StockAlert {self.item_id}: {self.level}>'
@@ -0,0 +1,18 @@
+"""
+Database Models - Derived Summary Tables
+"""
+
+from sqlalchemy import Column, Integer, Numeric, Date
+from invent_app import db
+
+class StockSnapshot(db.Model):
+    """Closing stock and unit price of each item at the end of a day"""
+    __tablename__ = 'stock_snapshots'
+    
+    snapshot_date = Column(Date, primary_key=True)
+    item_id = Column(Integer, primary_key=True, autoincrement=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Numeric(10, 2), nullable=False)
+    
+    def __repr__(self):
+        return f'<StockSnapshot {self.snapshot_date} item={self.item_id}: {self.quantity}>'
@@ -0,0 +1,18 @@
+"""
+Database Models - Derived Summary Tables
+"""
+
+from sqlalchemy import Column, Integer, Numeric
+from invent_app import db
+
+class SupplierStats(db.Model):
+    """Running STOCK_IN totals per supplier"""
+    __tablename__ = 'supplier_stats'
+    
+    supplier_id = Column(Integer, primary_key=True, autoincrement=False)
+    transaction_count = Column(Integer, default=0, nullable=False)
+    total_quantity = Column(Integer, default=0, nullable=False)
+    total_value = Column(Numeric(16, 2), default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<SupplierStats {self.supplier_id}: {self.transaction_count}>'
@@ -0,0 +1,47 @@
+"""
+Database Models - Denormalized Read Models
+"""
+
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, Index
+from invent_app import db
+
+class TransactionDenorm(db.Model):
+    """Stock movements with item, type and supplier names inlined"""
+    __tablename__ = 'transaction_denorm'
+    
+    transaction_id = Column(Integer, primary_key=True, autoincrement=False)
+    item_id = Column(Integer, nullable=False)
+    item_code = Column(String(50), nullable=False)
+    item_name = Column(String(200), nullable=False)
+    type_id = Column(Integer, nullable=False)
+    type_name = Column(String(50), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Numeric(10, 2))
+    supplier_id = Column(Integer)
+    supplier_name = Column(String(200))
+    reference_number = Column(String(100))
+    notes = Column(Text)
+    transaction_date = Column(DateTime, nullable=False)
+    created_by = Column(String(100))
+    
+    # Indexes for common queries
+    __table_args__ = (
+        Index('idx_trx_denorm_date', 'transaction_date', 'transaction_id'),
+        Index('idx_trx_denorm_type_date', 'type_id', 'transaction_date'),
+        Index('idx_trx_denorm_item_date', 'item_id', 'transaction_date'),
+    )
+    
+    def __repr__(self):
+        return f'<TransactionDenorm {self.transaction_id}: {self.type_name}>'
+    
+    @property
+    def total_value(self):
+        """Calculate transaction total value"""
+        if self.unit_price:
+            return float(self.quantity * self.unit_price)
+        return 0.0
+    
+    @property
+    def formatted_date(self):
+        """Get formatted transaction date"""
+        return self.transaction_date.strftime('%Y-%m-%d %H:%M')
@@ -22,7 +22,7 @@ class Item(db.Model):
     current_stock = Column(Integer, default=0, nullable=False, index=True)
     reorder_level = Column(Integer, default=10, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     category = relationship('Category', back_populates='items')
@@ -56,6 +56,21 @@ class Item(db.Model):
         """Calculate total stock value"""
         return float(self.current_stock * self.unit_price)
     
+    @property
+    def category_name(self):
+        """Category name, matching the denormalized read model"""
+        return self.category.category_name if self.category else None
+    
+    @property
+    def supplier_name(self):
+        """Supplier name, matching the denormalized read model"""
+        return self.supplier.supplier_name if self.supplier else None
+    
+    @property
+    def warehouse(self):
+        """Warehouse name, matching the denormalized read model"""
+        return self.location.warehouse if self.location else None
+    
     @property
     def stock_status(self):
         """Get stock status as string"""
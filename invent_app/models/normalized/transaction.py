@@ -31,6 +31,7 @@ class Transaction(db.Model):
     __table_args__ = (
         Index('idx_item_date', 'item_id', 'transaction_date'),
         Index('idx_type_date', 'type_id', 'transaction_date'),
+        Index('idx_type_supplier', 'type_id', 'supplier_id'),
         CheckConstraint('quantity > 0', name='check_quantity_positive'),
     )
     
@@ -44,6 +45,26 @@ class Transaction(db.Model):
             return float(self.quantity * self.unit_price)
         return 0.0
     
+    @property
+    def item_code(self):
+        """Item code, matching the denormalized read model"""
+        return self.item.item_code if self.item else None
+    
+    @property
+    def item_name(self):
+        """Item name, matching the denormalized read model"""
+        return self.item.item_name if self.item else None
+    
+    @property
+    def type_name(self):
+        """Transaction type name, matching the denormalized read model"""
+        return self.transaction_type.type_name if self.transaction_type else None
+    
+    @property
+    def supplier_name(self):
+        """Supplier name, matching the denormalized read model"""
+        return self.supplier.supplier_name if self.supplier else None
+    
     @property
     def formatted_date(self):
         """Get formatted transaction date"""
@@ -0,0 +1,16 @@
+"""
+Database Models - Cache Invalidation
+"""
+
+from sqlalchemy import Column, Integer, String
+from invent_app import db
+
+class TableVersion(db.Model):
+    """Write-version counter per table, shared by every worker process"""
+    __tablename__ = 'table_versions'
+    
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<TableVersion {self.table_name}={self.version}>'
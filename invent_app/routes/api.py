@@ -1,53 +1,300 @@
-from flask import Blueprint, jsonify, request
+import json
+from datetime import datetime
+from decimal import Decimal
+from flask import Blueprint, jsonify, request, current_app, url_for
+from sqlalchemy import func
 from invent_app import db
 from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.category import Category
+from invent_app.services import (
+    transaction_service, item_index, table_versions, search_service, report_service,
+    valuation_service, alert_service
+)
+from invent_app.utils.pagination import keyset_paginate
+from invent_app.utils.http_cache import make_etag, not_modified, with_etag
+from invent_app.services.transaction_service import (
+    StockError, UnknownItemError, InsufficientStockError
+)
 
 bp = Blueprint('api', __name__)
 
+# Columns a client may ask for with ?fields=
+ITEM_FIELDS = {
+    'item_id': Item.item_id,
+    'item_code': Item.item_code,
+    'item_name': Item.item_name,
+    'description': Item.description,
+    'category_id': Item.category_id,
+    'category': Category.category_name.label('category'),
+    'supplier_id': Item.supplier_id,
+    'location_id': Item.location_id,
+    'current_stock': Item.current_stock,
+    'reorder_level': Item.reorder_level,
+    'unit_price': Item.unit_price,
+    'updated_at': Item.updated_at,
+}
+
+ITEM_LIST_DEFAULT_FIELDS = ['item_id', 'item_code', 'item_name', 'current_stock', 'unit_price']
+ITEM_DEFAULT_FIELDS = [
+    'item_id', 'item_code', 'item_name', 'description', 'category',
+    'current_stock', 'unit_price', 'reorder_level'
+]
+
+ITEMS_PAGE_SIZE = 100
+ITEMS_MAX_PAGE_SIZE = 1000
+
 
 @bp.route('/items')
 def get_items():
-    """Get items as JSON"""
-    items = db.session.query(Item).all()
+    """
+    Get a page of items as JSON
+    
+    Query params: limit, cursor (from the Link rel="next" header) and
+    fields (comma separated); q switches to ranked search results (best
+    match first, no further pages; X-Total-Count holds the number of
+    matches). Answers 304 to a matching If-None-Match without querying
+    the items themselves.
+    """
+    fields = _requested_fields(ITEM_LIST_DEFAULT_FIELDS)
+    if fields is None:
+        return jsonify({'error': 'Unknown field requested'}), 400
+    
+    limit = max(1, min(request.args.get('limit', ITEMS_PAGE_SIZE, type=int), ITEMS_MAX_PAGE_SIZE))
+    cursor = request.args.get('cursor')
+    search = request.args.get('q', '').strip()
+    
+    etag = make_etag(
+        'items', _items_watermark(), _category_version(fields), fields, limit, cursor, search
+    )
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
-    return jsonify([{
-        'item_id': item.item_id,
-        'item_code': item.item_code,
-        'item_name': item.item_name,
-        'current_stock': item.current_stock,
-        'unit_price': float(item.unit_price)
-    } for item in items])
+    if search:
+        ids = [item_id for item_id, _ in search_service.search_item_ids(search, limit=limit)]
+        rows = _item_columns_query(fields).filter(Item.item_id.in_(ids)).all() if ids else []
+        by_id = {row.item_id: row for row in rows}
+        total = len(ids) if len(ids) < limit else search_service.count_item_matches(search)
+        response = with_etag(jsonify([_item_dict(by_id[i], fields) for i in ids if i in by_id]), etag)
+        response.headers['X-Total-Count'] = str(total)
+        return response
+    
+    page = keyset_paginate(
+        _item_columns_query(fields),
+        (Item.item_id,),
+        cursor=cursor,
+        per_page=limit,
+        descending=False
+    )
+    
+    response = with_etag(jsonify([_item_dict(row, fields) for row in page]), etag)
+    if page.next_cursor:
+        next_url = url_for('api.get_items', **{**request.args, 'cursor': page.next_cursor})
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+@bp.route('/items/suggest')
+def suggest_items():
+    """Typeahead matches on item code and name"""
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    
+    return jsonify(item_index.suggest(query, limit))
 
 
 @bp.route('/items/<int:id>')
 def get_item(id):
-    """Get single item as JSON"""
-    item = db.session.get(Item, id)
+    """Get single item as JSON (supports fields= and If-None-Match)"""
+    fields = _requested_fields(ITEM_DEFAULT_FIELDS)
+    if fields is None:
+        return jsonify({'error': 'Unknown field requested'}), 400
     
-    if not item:
+    updated_at = db.session.query(Item.updated_at).filter(Item.item_id == id).first()
+    if updated_at is None:
         return jsonify({'error': 'Item not found'}), 404
     
-    return jsonify({
-        'item_id': item.item_id,
-        'item_code': item.item_code,
-        'item_name': item.item_name,
-        'description': item.description,
-        'category': item.category.category_name,
-        'current_stock': item.current_stock,
-        'unit_price': float(item.unit_price),
-        'reorder_level': item.reorder_level
-    })
+    etag = make_etag('item', id, updated_at[0], _category_version(fields), fields)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    row = _item_columns_query(fields).filter(Item.item_id == id).first()
+    if row is None:
+        return jsonify({'error': 'Item not found'}), 404
+    
+    return with_etag(jsonify(_item_dict(row, fields)), etag)
 
 
 @bp.route('/stats')
 def get_stats():
-    """Get dashboard statistics as JSON"""
-    total_items = db.session.query(Item).count()
-    low_stock = db.session.query(Item).filter(
-        Item.current_stock <= Item.reorder_level
-    ).count()
+    """Get dashboard statistics as JSON (supports If-None-Match)"""
+    etag = make_etag('stats', _items_watermark())
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    return with_etag(jsonify({
+        'total_items': valuation_service.item_count(),
+        'low_stock_items': alert_service.alert_count()
+    }), etag)
+
+
+@bp.route('/turnover')
+def get_turnover():
+    """
+    Stock turnover and days of cover as JSON (supports If-None-Match)
+    Query params: days (default 30), sort (turnover/cover), limit
+    """
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    sort = request.args.get('sort', 'turnover')
+    if sort not in report_service.TURNOVER_SORTS:
+        return jsonify({'error': f'sort must be one of {", ".join(report_service.TURNOVER_SORTS)}'}), 400
+    limit = min(max(request.args.get('limit', ITEMS_PAGE_SIZE, type=int), 1), ITEMS_MAX_PAGE_SIZE)
+    
+    versions = table_versions.current_versions()
+    etag = make_etag(
+        'turnover', days, sort, limit, datetime.utcnow().date(),
+        versions.get('items', 0), versions.get('transactions', 0)
+    )
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    return with_etag(jsonify(report_service.turnover_report(days, sort, limit)), etag)
+
+
+@bp.route('/transactions', methods=['POST'])
+def create_transaction():
+    """Record a single stock movement from JSON"""
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        movement = transaction_service.record_movement(
+            item_id=data.get('item_id'),
+            type_name=data.get('type', 'STOCK_IN'),
+            quantity=data.get('quantity'),
+            unit_price=data.get('unit_price'),
+            supplier_id=data.get('supplier_id'),
+            reference_number=data.get('reference_number'),
+            notes=data.get('notes'),
+            created_by=data.get('created_by')
+        )
+    except UnknownItemError as e:
+        return jsonify({'error': str(e)}), 404
+    except InsufficientStockError as e:
+        return jsonify({'error': str(e), 'available': e.available}), 409
+    except StockError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(movement._asdict()), 201
+
+
+@bp.route('/transactions/bulk', methods=['POST'])
+def create_transactions_bulk():
+    """
+    Record a batch of stock movements
+    
+    Accepts a JSON array or NDJSON (one movement per line) and returns a
+    result for every line. With ?atomic=1 nothing is applied unless every
+    line is valid.
+    """
+    movements = _parse_movement_batch()
+    if movements is None:
+        return jsonify({'error': 'Expected a JSON array or NDJSON body'}), 400
+    
+    max_movements = current_app.config['BULK_MAX_MOVEMENTS']
+    if len(movements) > max_movements:
+        return jsonify({'error': f'Batch exceeds {max_movements} movements'}), 413
+    
+    atomic = request.args.get('atomic', 0, type=int) == 1
+    
+    try:
+        results = transaction_service.record_movements(movements, atomic=atomic)
+    except StockError as e:
+        return jsonify({'error': str(e)}), 409
+    
+    accepted = sum(1 for r in results if r['status'] == 'ok')
+    rejected = sum(1 for r in results if r['status'] == 'error')
     
     return jsonify({
-        'total_items': total_items,
-        'low_stock_items': low_stock
-    })
\ No newline at end of file
+        'accepted': accepted,
+        'rejected': rejected,
+        'results': results
+    }), 422 if atomic and rejected else 200
+
+
+# HELPER FUNCTIONS
+
+def _items_watermark():
+    """
+    (max updated_at, row count) of items: changes with every insert,
+    update (stock movements included) and delete
+    """
+    return tuple(db.session.query(func.max(Item.updated_at), func.count(Item.item_id)).one())
+
+
+def _category_version(fields):
+    """Categories write version, when the payload includes category names"""
+    if 'category' not in fields:
+        return None
+    return table_versions.current_versions().get('categories', 0)
+
+
+def _requested_fields(default):
+    """Field names from ?fields=, the default list, or None if any is unknown"""
+    raw = request.args.get('fields')
+    if not raw:
+        return default
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    if not fields or any(name not in ITEM_FIELDS for name in fields):
+        return None
+    return fields
+
+
+def _item_columns_query(fields):
+    """Query selecting only the requested columns (plus the item_id key)"""
+    columns = [ITEM_FIELDS[name] for name in fields]
+    if 'item_id' not in fields:
+        columns.append(Item.item_id)
+    
+    query = db.session.query(*columns)
+    if 'category' in fields:
+        query = query.join(Category, Item.category_id == Category.category_id)
+    return query
+
+
+def _item_dict(row, fields):
+    """JSON-ready dict of the requested fields of a row"""
+    data = {}
+    for name in fields:
+        value = getattr(row, name)
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[name] = value
+    return data
+
+
+def _parse_movement_batch():
+    """Read the request body as a JSON array or NDJSON, or None if neither"""
+    body = request.get_data(as_text=True)
+    
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        movements = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                movements.append(json.loads(line))
+            except ValueError:
+                # Reported per line by the service validation
+                movements.append(line)
+        return movements
+    
+    try:
+        movements = json.loads(body)
+    except ValueError:
+        return None
+    return movements if isinstance(movements, list) else None
@@ -1,10 +1,11 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from invent_app import db
 from invent_app.models.normalized.item import Item
-from invent_app.models.normalized.category import Category
-from invent_app.models.normalized.supplier import Supplier
-from invent_app.models.normalized.location import Location
 from invent_app.forms.item_forms import ItemForm
+from invent_app.services import reference_cache, search_service
+from invent_app.utils.pagination import keyset_paginate, KeysetPage
+from invent_app.database.loading_profiles import apply_profile, profile_options
+from invent_app.database.read_models import item_query
 
 bp = Blueprint('items', __name__)
 
@@ -12,32 +13,41 @@ bp = Blueprint('items', __name__)
 @bp.route('/')
 def list():
     """List all items with pagination and search"""
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     search = request.args.get('search', '')
     category_id = request.args.get('category', type=int)
     
-    query = db.session.query(Item)
+    model, query = item_query('item_list')
     
-    # Apply search filter
     if search:
-        query = query.filter(
-            (Item.item_name.ilike(f'%{search}%')) |
-            (Item.item_code.ilike(f'%{search}%'))
+        # Ranked matches from the search index, best first, on one page;
+        # the total counts every match so the page can say it is partial
+        ranked = search_service.search_item_ids(search, category_id=category_id)
+        ids = [item_id for item_id, _ in ranked]
+        rows = query.filter(model.item_id.in_(ids)).all() if ids else []
+        by_id = {row.item_id: row for row in rows}
+        matches = [by_id[item_id] for item_id in ids if item_id in by_id]
+        total = len(ranked)
+        if total >= search_service.SEARCH_RESULT_LIMIT:
+            total = search_service.count_item_matches(search, category_id=category_id)
+        items = KeysetPage(matches, [], has_next=False, has_prev=False, total=total)
+    else:
+        # Apply category filter
+        if category_id:
+            query = query.filter(model.category_id == category_id)
+        
+        # Seek on (item_name, item_id) instead of OFFSET
+        items = keyset_paginate(
+            query,
+            (model.item_name, model.item_id),
+            cursor=cursor,
+            per_page=20,
+            descending=False,
+            with_total=True
         )
     
-    # Apply category filter
-    if category_id:
-        query = query.filter(Item.category_id == category_id)
-    
-    # Paginate results
-    items = query.order_by(Item.item_name).paginate(
-        page=page,
-        per_page=20,
-        error_out=False
-    )
-    
     # Get all categories for filter dropdown
-    categories = db.session.query(Category).order_by(Category.category_name).all()
+    categories = reference_cache.categories()
     
     return render_template(
         'items/list.html',
@@ -52,18 +62,9 @@ def create():
     form = ItemForm()
     
     # Populate select fields
-    form.category_id.choices = [
-        (c.category_id, c.category_name) 
-        for c in db.session.query(Category).order_by(Category.category_name).all()
-    ]
-    form.supplier_id.choices = [(0, 'Select Supplier')] + [
-        (s.supplier_id, s.supplier_name)
-        for s in db.session.query(Supplier).order_by(Supplier.supplier_name).all()
-    ]
-    form.location_id.choices = [(0, 'Select Location')] + [
-        (l.location_id, f"{l.warehouse} - {l.aisle}/{l.shelf}")
-        for l in db.session.query(Location).all()
-    ]
+    form.category_id.choices = reference_cache.category_choices()
+    form.supplier_id.choices = reference_cache.supplier_choices()
+    form.location_id.choices = reference_cache.location_choices()
     
     if form.validate_on_submit():
         item = Item(
@@ -90,12 +91,16 @@ def create():
 @bp.route('/<int:id>')
 def detail(id):
     """View item details"""
-    item = db.session.get(Item, id)
+    item = db.session.get(Item, id, options=profile_options('item_detail'))
     if not item:
         flash('Item not found', 'danger')
         return redirect(url_for('items.list'))
     
-    return render_template('items/detail.html', item=item)
+    recent_transactions = apply_profile(item.transactions, 'item_recent_transactions')\
+        .limit(10)\
+        .all()
+    
+    return render_template('items/detail.html', item=item, recent_transactions=recent_transactions)
 
 
 @bp.route('/<int:id>/edit', methods=['GET', 'POST'])
@@ -109,18 +114,9 @@ def edit(id):
     form = ItemForm(obj=item)
     
     # Populate select fields
-    form.category_id.choices = [
-        (c.category_id, c.category_name)
-        for c in db.session.query(Category).order_by(Category.category_name).all()
-    ]
-    form.supplier_id.choices = [(0, 'Select Supplier')] + [
-        (s.supplier_id, s.supplier_name)
-        for s in db.session.query(Supplier).order_by(Supplier.supplier_name).all()
-    ]
-    form.location_id.choices = [(0, 'Select Location')] + [
-        (l.location_id, f"{l.warehouse} - {l.aisle}/{l.shelf}")
-        for l in db.session.query(Location).all()
-    ]
+    form.category_id.choices = reference_cache.category_choices()
+    form.supplier_id.choices = reference_cache.supplier_choices()
+    form.location_id.choices = reference_cache.location_choices()
     
     if form.validate_on_submit():
         item.item_code = form.item_code.data
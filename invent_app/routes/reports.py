@@ -1,9 +1,21 @@
-from flask import Blueprint, render_template, request, redirect, url_for
+from datetime import datetime, timedelta
+from flask import (
+    Blueprint, render_template, request, redirect, url_for, jsonify, Response,
+    stream_with_context, send_file, abort, current_app
+)
 from invent_app import db
-from invent_app.models.normalized import Transaction, TransactionType
 from invent_app.models.normalized.item import Item
-from invent_app.models.normalized.category import Category
-from sqlalchemy import func
+from invent_app.models.denormalized.stock_alert import StockAlert
+from invent_app.services import (
+    reference_cache, rollup_service, export_service, valuation_service, supplier_service,
+    report_service, stock_snapshot_service, report_job_service
+)
+from invent_app.services.export_service import UnknownReport
+from invent_app.services.report_job_service import UnknownJob
+from invent_app.utils.pagination import keyset_paginate
+from invent_app.database.read_models import item_query, transaction_query
+from invent_app.utils.decorators import cached_report
+from performance.profilers import query_profiler
 
 bp = Blueprint('reports', __name__)
 
@@ -16,30 +28,41 @@ def index():
 
 # REPORT 1: STOCK LEVELS REPORT
 @bp.route('/stock-levels')
+@cached_report(('items', 'categories', 'transactions'))
 def stock_levels():
     """
     Current stock levels report
     Shows all items with their current quantities, values, and status
+    Query params: category, as_of (YYYY-MM-DD, stock at the end of that day)
     """
     # Get filter parameters
     category_id = request.args.get('category', type=int)
-    
-    # Base query
-    query = db.session.query(Item)
-    
-    # Apply category filter if provided
-    if category_id:
-        query = query.filter(Item.category_id == category_id)
-    
-    # Get all items, ordered by stock level (lowest first)
-    items = query.order_by(Item.current_stock.asc()).all()
+    as_of = _parse_date(request.args.get('as_of'))
+    
+    if as_of:
+        # Nearest snapshot plus the movements in between
+        items = sorted(
+            stock_snapshot_service.stock_as_of(as_of, category_id),
+            key=lambda item: item.current_stock
+        )
+        total_value = sum(item.stock_value for item in items)
+    else:
+        # Base query
+        model, query = item_query('stock_levels')
+        
+        # Apply category filter if provided
+        if category_id:
+            query = query.filter(model.category_id == category_id)
+        
+        # Get all items, ordered by stock level (lowest first)
+        items = query.order_by(model.current_stock.asc()).all()
+        total_value = float(valuation_service.total_value(category_id))
     
     # Get all categories for filter dropdown
-    categories = db.session.query(Category).order_by(Category.category_name).all()
+    categories = reference_cache.categories()
     
     # Calculate summary statistics
     total_items = len(items)
-    total_value = sum(float(item.current_stock * item.unit_price) for item in items)
     low_stock_count = sum(1 for item in items if item.is_low_stock and not item.is_out_of_stock)
     out_of_stock_count = sum(1 for item in items if item.is_out_of_stock)
     
@@ -50,21 +73,23 @@ def stock_levels():
         total_items=total_items,
         total_value=total_value,
         low_stock_count=low_stock_count,
-        out_of_stock_count=out_of_stock_count
+        out_of_stock_count=out_of_stock_count,
+        as_of=as_of
     )
 
 
 # REPORT 2: LOW STOCK ALERT
 @bp.route('/low-stock')
+@cached_report(('items', 'categories', 'suppliers', 'transactions'))
 def low_stock():
     """
     Low stock alert report
     Shows items at or below reorder level that need attention
     """
-    # Get items below or at reorder level
-    items = db.session.query(Item)\
-        .filter(Item.current_stock <= Item.reorder_level)\
-        .order_by(Item.current_stock.asc())\
+    # Driven by the maintained alert set, one row per alerted item
+    model, query = item_query('low_stock')
+    items = query.join(StockAlert, StockAlert.item_id == model.item_id)\
+        .order_by(StockAlert.current_stock.asc(), StockAlert.item_id)\
         .all()
     
     # Separate by priority
@@ -81,24 +106,25 @@ def low_stock():
 
 # REPORT 3: MOVEMENT HISTORY
 @bp.route('/movement-history')
+@cached_report(('transactions', 'items', 'transaction_types', 'suppliers'))
 def movement_history():
     """
     Stock movement history report
     Shows all transactions with filters for date range and type
     """
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     transaction_type = request.args.get('type')
     
     # Base query
-    query = db.session.query(Transaction)
+    model, query = transaction_query('movement_history')
     
     # Apply filters
     if start_date:
         try:
             start = datetime.strptime(start_date, '%Y-%m-%d')
-            query = query.filter(Transaction.transaction_date >= start)
+            query = query.filter(model.transaction_date >= start)
         except ValueError:
             pass
     
@@ -107,39 +133,33 @@ def movement_history():
             end = datetime.strptime(end_date, '%Y-%m-%d')
             # Add one day to include the end date
             end = end + timedelta(days=1)
-            query = query.filter(Transaction.transaction_date < end)
+            query = query.filter(model.transaction_date < end)
         except ValueError:
             pass
     
     if transaction_type:
-        query = query.join(Transaction.transaction_type)\
-            .filter(TransactionType.type_name == transaction_type)
-    
-    # Paginate results
-    transactions = query.order_by(Transaction.transaction_date.desc())\
-        .paginate(page=page, per_page=50, error_out=False)
-    
-    # Calculate totals for current filter
-    total_stock_in = db.session.query(func.sum(Transaction.quantity))\
-        .join(Transaction.transaction_type)\
-        .filter(TransactionType.type_name == 'STOCK_IN')
-    
-    total_stock_out = db.session.query(func.sum(Transaction.quantity))\
-        .join(Transaction.transaction_type)\
-        .filter(TransactionType.type_name == 'STOCK_OUT')
-    
-    if start_date:
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        total_stock_in = total_stock_in.filter(Transaction.transaction_date >= start)
-        total_stock_out = total_stock_out.filter(Transaction.transaction_date >= start)
-    
-    if end_date:
-        end = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
-        total_stock_in = total_stock_in.filter(Transaction.transaction_date < end)
-        total_stock_out = total_stock_out.filter(Transaction.transaction_date < end)
+        # Filter on the cached type id so the type_id/date index is used
+        query = query.filter(
+            model.type_id == reference_cache.transaction_type_ids().get(transaction_type)
+        )
+    
+    # Seek on (transaction_date, transaction_id) instead of OFFSET
+    transactions = keyset_paginate(
+        query,
+        (model.transaction_date, model.transaction_id),
+        cursor=cursor,
+        per_page=50,
+        with_total=True
+    )
     
-    stock_in_total = total_stock_in.scalar() or 0
-    stock_out_total = total_stock_out.scalar() or 0
+    # Totals for the date filter, read from the daily rollup
+    type_ids = reference_cache.transaction_type_ids()
+    totals = rollup_service.quantity_by_type(
+        start_date=_parse_date(start_date),
+        end_date=_parse_date(end_date)
+    )
+    stock_in_total = totals.get(type_ids.get('STOCK_IN'), 0)
+    stock_out_total = totals.get(type_ids.get('STOCK_OUT'), 0)
     
     return render_template(
         'reports/movement_history.html',
@@ -151,25 +171,24 @@ def movement_history():
 
 # REPORT 4: CATEGORY SUMMARY
 @bp.route('/category-summary')
+@cached_report(('categories', 'items', 'transactions'))
 def category_summary():
     """
     Summary report by category
     Shows inventory distribution across categories
     """
-    # Get all categories with item counts and values
-    categories_data = db.session.query(
-        Category.category_name,
-        func.count(Item.item_id).label('item_count'),
-        func.sum(Item.current_stock).label('total_stock'),
-        func.sum(Item.current_stock * Item.unit_price).label('total_value')
-    ).outerjoin(Item, Category.category_id == Item.category_id)\
-     .group_by(Category.category_id, Category.category_name)\
-     .all()
+    # Per-category totals from the valuation summary
+    categories_data = [{
+        'category_name': row.category_name,
+        'item_count': row.item_count,
+        'total_stock': row.total_stock,
+        'total_value': float(row.total_value)
+    } for row in valuation_service.category_totals()]
     
     # Calculate totals
-    grand_total_items = sum(c.item_count for c in categories_data)
-    grand_total_stock = sum(c.total_stock or 0 for c in categories_data)
-    grand_total_value = sum(float(c.total_value or 0) for c in categories_data)
+    grand_total_items = sum(c['item_count'] for c in categories_data)
+    grand_total_stock = sum(c['total_stock'] for c in categories_data)
+    grand_total_value = sum(c['total_value'] for c in categories_data)
     
     return render_template(
         'reports/category_summary.html',
@@ -182,73 +201,76 @@ def category_summary():
 
 # REPORT 5: SUPPLIER PERFORMANCE
 @bp.route('/supplier-performance')
+@cached_report(('suppliers', 'items', 'transactions', 'transaction_types'))
 def supplier_performance():
     """
     Supplier performance report
     Shows transaction counts and values per supplier
     """
-    # Get supplier statistics
-    supplier_stats = db.session.query(
-        Supplier.supplier_name,
-        func.count(Transaction.transaction_id).label('transaction_count'),
-        func.sum(Transaction.quantity).label('total_quantity'),
-        func.sum(Transaction.quantity * Transaction.unit_price).label('total_value'),
-        func.count(Item.item_id.distinct()).label('items_supplied')
-    ).outerjoin(Item, Supplier.supplier_id == Item.supplier_id)\
-     .outerjoin(Transaction, and_(
-         Transaction.supplier_id == Supplier.supplier_id,
-         Transaction.transaction_type.has(type_name='STOCK_IN')
-     ))\
-     .group_by(Supplier.supplier_id, Supplier.supplier_name)\
-     .all()
+    # Items supplied and STOCK_IN totals, aggregated separately
+    supplier_stats = [{
+        'supplier_name': row.supplier_name,
+        'items_supplied': row.items_supplied,
+        'transaction_count': row.transaction_count,
+        'total_quantity': int(row.total_quantity),
+        'total_value': float(row.total_value)
+    } for row in supplier_service.performance()]
+    
+    grand_total_value = sum(s['total_value'] for s in supplier_stats)
     
     return render_template(
         'reports/supplier_performance.html',
-        supplier_stats=supplier_stats
+        supplier_stats=supplier_stats,
+        grand_total_value=grand_total_value
     )
 
 
 # REPORT 6: INVENTORY VALUATION
 @bp.route('/inventory-valuation')
+@cached_report(('items', 'categories', 'transactions'))
 def inventory_valuation():
     """
     Inventory valuation report
     Shows total inventory value broken down by various dimensions
+    Query params: as_of (YYYY-MM-DD, value at the end of that day)
     """
+    as_of = _parse_date(request.args.get('as_of'))
+    
+    if as_of:
+        # Nearest snapshot plus the movements in between
+        category_values, top_items = stock_snapshot_service.valuation_as_of(as_of)
+    else:
+        # Value by category, from the valuation summary
+        category_values = [{
+            'category_name': row.category_name,
+            'value': float(row.total_value)
+        } for row in valuation_service.category_totals() if row.item_count]
+        
+        # Top 10 most valuable items
+        top_items = db.session.query(
+            Item.item_name,
+            Item.current_stock,
+            Item.unit_price,
+            (Item.current_stock * Item.unit_price).label('total_value')
+        ).order_by((Item.current_stock * Item.unit_price).desc())\
+         .limit(10)\
+         .all()
+    
     # Total inventory value
-    total_value = db.session.query(
-        func.sum(Item.current_stock * Item.unit_price)
-    ).scalar() or 0
-    
-    # Value by category
-    category_values = db.session.query(
-        Category.category_name,
-        func.sum(Item.current_stock * Item.unit_price).label('value')
-    ).join(Item, Category.category_id == Item.category_id)\
-     .group_by(Category.category_id, Category.category_name)\
-     .order_by(func.sum(Item.current_stock * Item.unit_price).desc())\
-     .all()
-    
-    # Top 10 most valuable items
-    top_items = db.session.query(
-        Item.item_name,
-        Item.current_stock,
-        Item.unit_price,
-        (Item.current_stock * Item.unit_price).label('total_value')
-    ).order_by((Item.current_stock * Item.unit_price).desc())\
-     .limit(10)\
-     .all()
+    total_value = sum(c['value'] for c in category_values)
     
     return render_template(
         'reports/inventory_valuation.html',
-        total_value=float(total_value),
+        total_value=total_value,
         category_values=category_values,
-        top_items=top_items
+        top_items=top_items,
+        as_of=as_of
     )
 
 
 # REPORT 7: MONTHLY SUMMARY
 @bp.route('/monthly-summary')
+@cached_report(('transactions', 'items'), vary=lambda: datetime.now().strftime('%Y-%m'))
 def monthly_summary():
     """
     Monthly summary report
@@ -262,39 +284,18 @@ def monthly_summary():
     else:
         last_day = today.replace(month=today.month + 1, day=1)
     
-    # Transactions this month
-    monthly_transactions = db.session.query(Transaction)\
-        .filter(Transaction.transaction_date >= first_day)\
-        .filter(Transaction.transaction_date < last_day)\
-        .count()
-    
-    # Stock in this month
-    stock_in_count = db.session.query(func.sum(Transaction.quantity))\
-        .join(Transaction.transaction_type)\
-        .filter(TransactionType.type_name == 'STOCK_IN')\
-        .filter(Transaction.transaction_date >= first_day)\
-        .filter(Transaction.transaction_date < last_day)\
-        .scalar() or 0
-    
-    # Stock out this month
-    stock_out_count = db.session.query(func.sum(Transaction.quantity))\
-        .join(Transaction.transaction_type)\
-        .filter(TransactionType.type_name == 'STOCK_OUT')\
-        .filter(Transaction.transaction_date >= first_day)\
-        .filter(Transaction.transaction_date < last_day)\
-        .scalar() or 0
+    # Movement figures for the month, read from the daily rollup
+    month_start, month_end = first_day.date(), last_day.date() - timedelta(days=1)
+    type_ids = reference_cache.transaction_type_ids()
+    
+    monthly_transactions = rollup_service.transaction_count(month_start, month_end)
+    
+    totals = rollup_service.quantity_by_type(month_start, month_end)
+    stock_in_count = totals.get(type_ids.get('STOCK_IN'), 0)
+    stock_out_count = totals.get(type_ids.get('STOCK_OUT'), 0)
     
     # Most active items this month
-    active_items = db.session.query(
-        Item.item_name,
-        func.count(Transaction.transaction_id).label('transaction_count')
-    ).join(Transaction, Item.item_id == Transaction.item_id)\
-     .filter(Transaction.transaction_date >= first_day)\
-     .filter(Transaction.transaction_date < last_day)\
-     .group_by(Item.item_id, Item.item_name)\
-     .order_by(func.count(Transaction.transaction_id).desc())\
-     .limit(10)\
-     .all()
+    active_items = rollup_service.most_active_items(month_start, month_end, limit=10)
     
     return render_template(
         'reports/monthly_summary.html',
@@ -306,42 +307,158 @@ def monthly_summary():
     )
 
 
-# REPORT 8: PERFORMANCE COMPARISON (For Research)
+# REPORT 8: QUERY PERFORMANCE
 @bp.route('/performance')
 def performance():
     """
-    Database performance comparison report
-    Compares normalized vs denormalized schema performance
+    Live query profile of this worker, per endpoint
+    Query counts, DB time, slowest statements with their plans and
+    duplicate (N+1) statements. Not cached: the figures change with
+    every request.
     """
-    return render_template('reports/performance.html')
+    profiler = query_profiler.profiler()
+    
+    return render_template(
+        'reports/performance.html',
+        profile=profiler.snapshot() if profiler else None,
+        read_model=current_app.config['READ_MODEL']
+    )
+
+
+# REPORT 9: STOCK TURNOVER
+@bp.route('/stock-turnover')
+@cached_report(('items', 'transactions'), vary=lambda: datetime.utcnow().strftime('%Y-%m-%d'))
+def stock_turnover():
+    """
+    Stock turnover and days of cover for the whole catalogue
+    Query params: days (window, default 30), sort (turnover/cover)
+    """
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    sort = request.args.get('sort', 'turnover')
+    if sort not in report_service.TURNOVER_SORTS:
+        sort = 'turnover'
+    
+    report = report_service.turnover_report(days, sort)
+    
+    return render_template(
+        'reports/stock_turnover.html',
+        report=report,
+        sort=sort
+    )
 
 
 # API ENDPOINT: Export Report Data
 @bp.route('/export/<report_type>')
 def export_report(report_type):
     """
-    Export report data as JSON
-    Used by frontend for CSV export functionality
+    Stream a full report as JSON, CSV or NDJSON
+    Query params: format (json/csv/ndjson) plus the report's own filters
+    """
+    fmt = request.args.get('format', 'json')
+    
+    try:
+        chunks = export_service.stream_report(report_type, fmt, request.args)
+    except UnknownReport as e:
+        return jsonify({'error': str(e)}), 400
+    
+    mimetype, extension = export_service.FORMATS[fmt]
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    if fmt != 'json':
+        filename = f"{report_type.replace('-', '_')}_{datetime.now():%Y%m%d}.{extension}"
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# BACKGROUND REPORT JOBS
+@bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a report export in the background job pool
+    Params (form or query string): report, format (default csv) plus the
+    report's own filters. Form posts are redirected to the job page,
+    other clients get 202 with the job as JSON.
     """
-    if report_type == 'stock-levels':
-        items = db.session.query(Item).all()
-        data = [{
-            'item_code': item.item_code,
-            'item_name': item.item_name,
-            'category': item.category.category_name,
-            'current_stock': item.current_stock,
-            'reorder_level': item.reorder_level,
-            'unit_price': float(item.unit_price),
-            'total_value': float(item.current_stock * item.unit_price),
-            'status': item.stock_status
-        } for item in items]
-        return jsonify(data)
-    
-    return jsonify({'error': 'Unknown report type'}), 400
+    params = request.values.copy()
+    report_type = params.pop('report', None)
+    fmt = params.pop('format', 'csv')
+    
+    try:
+        job = report_job_service.submit(report_type, fmt, params)
+    except UnknownReport as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if request.form:
+        return redirect(url_for('reports.job_page', job_id=job['job_id']))
+    
+    response = jsonify(_job_json(job))
+    response.status_code = 202
+    response.headers['Location'] = url_for('reports.job_status', job_id=job['job_id'])
+    return response
+
+
+@bp.route('/jobs/<job_id>')
+def job_page(job_id):
+    """Job page that polls the status and links the result when done"""
+    try:
+        job = report_job_service.get(job_id)
+    except UnknownJob:
+        abort(404)
+    
+    return render_template('reports/job.html', job=_job_json(job))
+
+
+@bp.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    """Job status as JSON"""
+    try:
+        job = report_job_service.get(job_id)
+    except UnknownJob:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    return jsonify(_job_json(job))
+
+
+@bp.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Download a finished job's result"""
+    try:
+        job = report_job_service.get(job_id)
+    except UnknownJob:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    if job['status'] != report_job_service.DONE:
+        return jsonify(_job_json(job)), 409
+    
+    mimetype, extension = export_service.FORMATS[job['format']]
+    filename = f"{job['report'].replace('-', '_')}_{datetime.fromtimestamp(job['finished_at']):%Y%m%d}.{extension}"
+    return send_file(
+        report_job_service.result_path(job),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=filename,
+        max_age=0
+    )
 
 
 # HELPER FUNCTIONS
 
+def _job_json(job):
+    """Public fields of a job record plus its URLs"""
+    data = {key: job.get(key) for key in ('job_id', 'report', 'format', 'status', 'error', 'size')}
+    data['status_url'] = url_for('reports.job_status', job_id=job['job_id'])
+    if job['status'] == report_job_service.DONE:
+        data['result_url'] = url_for('reports.job_result', job_id=job['job_id'])
+    return data
+
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD query argument, or None if missing/invalid"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
 def get_date_range(period='month'):
     """
     Get start and end dates for a period
@@ -372,36 +489,3 @@ def get_date_range(period='month'):
     
     return start, end
 
-
-def calculate_stock_turnover(item_id, days=30):
-    """
-    Calculate stock turnover rate for an item
-    
-    Args:
-        item_id: Item ID
-        days: Number of days to calculate over
-    
-    Returns:
-        float: Turnover rate
-    """
-    start_date = datetime.now() - timedelta(days=days)
-    
-    # Get total stock out in period
-    stock_out = db.session.query(func.sum(Transaction.quantity))\
-        .join(Transaction.transaction_type)\
-        .filter(TransactionType.type_name == 'STOCK_OUT')\
-        .filter(Transaction.item_id == item_id)\
-        .filter(Transaction.transaction_date >= start_date)\
-        .scalar() or 0
-    
-    # Get average stock level
-    item = db.session.get(Item, item_id)
-    avg_stock = item.current_stock if item else 0
-    
-    # Calculate turnover
-    if avg_stock > 0:
-        turnover = stock_out / avg_stock
-    else:
-        turnover = 0
-    
-    return turnover
\ No newline at end of file
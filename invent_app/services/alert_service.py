@@ -0,0 +1,256 @@
+"""
+Stock Alerts
+Keeps stock_alerts, the set of items at or below their reorder level,
+current in the same transaction as every stock movement and item write,
+so alert reads cost one row per alert instead of a scan of items.
+
+Each refresh records the items whose alert level changed (ok, low, out);
+once the transaction commits those transitions are pushed to connected
+dashboards through utils.realtime.
+
+rebuild() recomputes the table from items for backfill and repair.
+"""
+
+from datetime import datetime
+from sqlalchemy import event, select, insert, update, delete, func, bindparam, case, inspect
+from sqlalchemy.orm import Session
+from flask import current_app, has_app_context
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.denormalized.stock_alert import StockAlert
+from invent_app.utils import realtime
+
+
+OK, LOW, OUT = 'ok', 'low', 'out'
+
+# Upper bound on ids per IN (...) list
+ALERT_CHUNK_SIZE = 5000
+
+# Socket.IO events: committed transitions, and counts for new clients
+ALERT_EVENT = 'stock_alerts'
+ALERT_COUNTS_EVENT = 'stock_alert_counts'
+
+# Most transitions sent per commit; the rest are only counted
+ALERT_PUSH_LIMIT = 100
+
+# Session.info key collecting transitions until commit
+_PENDING = 'alert_transitions'
+
+
+def alert_level(current_stock, reorder_level):
+    """Alert level of an item: OUT, LOW or OK"""
+    if current_stock <= 0:
+        return OUT
+    if current_stock <= reorder_level:
+        return LOW
+    return OK
+
+
+# MAINTENANCE
+
+def apply_stock_deltas(stock_deltas):
+    """Refresh the alerts of items whose stock just moved ({item_id: units})"""
+    item_ids = [item_id for item_id, delta in stock_deltas.items() if delta]
+    if item_ids:
+        refresh(db.session, db.session.connection(), item_ids)
+
+
+def refresh(session, connection, item_ids):
+    """
+    Bring the alert rows of the given items in line with items
+
+    Rows are inserted, updated or deleted as needed; level changes are
+    queued on the session for publication after commit.
+
+    Args:
+        session: Session whose commit publishes the transitions
+        connection: Connection of that session's transaction
+        item_ids: Items to check (missing items lose their alert)
+    """
+    transitions = []
+    ids = sorted(set(item_ids))
+    for start in range(0, len(ids), ALERT_CHUNK_SIZE):
+        chunk = ids[start:start + ALERT_CHUNK_SIZE]
+        transitions.extend(_refresh_chunk(connection, chunk))
+
+    if transitions:
+        session.info.setdefault(_PENDING, []).extend(transitions)
+
+
+def _refresh_chunk(connection, chunk):
+    """Sync one chunk of item ids; return its level transitions"""
+    items = {
+        row.item_id: row
+        for row in connection.execute(
+            select(Item.item_id, Item.item_code, Item.item_name, Item.current_stock, Item.reorder_level)
+            .where(Item.item_id.in_(chunk))
+        )
+    }
+    previous = dict(connection.execute(
+        select(StockAlert.item_id, StockAlert.level).where(StockAlert.item_id.in_(chunk))
+    ).all())
+
+    now = datetime.utcnow()
+    inserts, updates, deletes, transitions = [], [], [], []
+    for item_id in chunk:
+        item = items.get(item_id)
+        level = alert_level(item.current_stock, item.reorder_level) if item else OK
+        before = previous.get(item_id, OK)
+
+        if level == OK:
+            if before != OK:
+                deletes.append(item_id)
+        elif before == OK:
+            inserts.append({
+                'item_id': item_id,
+                'level': level,
+                'current_stock': item.current_stock,
+                'reorder_level': item.reorder_level,
+                'raised_at': now,
+            })
+        else:
+            updates.append({
+                'alert_id': item_id,
+                'level': level,
+                'current_stock': item.current_stock,
+                'reorder_level': item.reorder_level,
+            })
+
+        if level != before:
+            transitions.append({
+                'item_id': item_id,
+                'item_code': item.item_code if item else None,
+                'item_name': item.item_name if item else None,
+                'level': level,
+                'previous': before,
+                'current_stock': item.current_stock if item else None,
+                'reorder_level': item.reorder_level if item else None,
+            })
+
+    if deletes:
+        connection.execute(delete(StockAlert).where(StockAlert.item_id.in_(deletes)))
+    if inserts:
+        connection.execute(insert(StockAlert), inserts)
+    if updates:
+        connection.execute(
+            update(StockAlert.__table__)
+            .where(StockAlert.__table__.c.item_id == bindparam('alert_id'))
+            .values(
+                level=bindparam('level'),
+                current_stock=bindparam('current_stock'),
+                reorder_level=bindparam('reorder_level')
+            ),
+            updates
+        )
+    return transitions
+
+
+def _changed(obj, *attributes):
+    """True if any of the attributes has pending history on obj"""
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_flushed_items(session, flush_context):
+    """Refresh alerts of items created, deleted or re-stocked through the ORM"""
+    item_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Item):
+            item_ids.add(obj.item_id)
+    for obj in session.dirty:
+        if isinstance(obj, Item) and _changed(obj, 'current_stock', 'reorder_level'):
+            item_ids.add(obj.item_id)
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            item_ids.add(inspect(obj).identity[0])
+
+    if item_ids:
+        refresh(session, session.connection(), item_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_transitions(session):
+    """Push the committed transitions to connected dashboards"""
+    transitions = session.info.pop(_PENDING, None)
+    if not transitions or not has_app_context() or not realtime.enabled():
+        return
+
+    try:
+        with db.engine.connect() as connection:
+            alert_counts = _counts(connection)
+        realtime.emit(ALERT_EVENT, {
+            'transitions': transitions[:ALERT_PUSH_LIMIT],
+            'more': max(len(transitions) - ALERT_PUSH_LIMIT, 0),
+            'counts': alert_counts
+        })
+    except Exception:
+        # The commit already landed; clients resync their counts on reconnect
+        current_app.logger.exception('Publishing stock alert transitions failed')
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_transitions(session):
+    session.info.pop(_PENDING, None)
+
+
+# READS
+
+def _counts(executor):
+    row = executor.execute(
+        select(
+            func.count(StockAlert.item_id),
+            func.coalesce(func.sum(case((StockAlert.level == OUT, 1), else_=0)), 0)
+        )
+    ).one()
+    return {
+        'low_stock_items': int(row[0]) - int(row[1]),
+        'out_of_stock_items': int(row[1]),
+    }
+
+
+def counts():
+    """
+    Number of items at each alert level
+
+    Returns:
+        dict: low_stock_items (stock above zero, at or below reorder
+        level) and out_of_stock_items
+    """
+    return _counts(db.session)
+
+
+@realtime.on_connect
+def _send_counts():
+    return ALERT_COUNTS_EVENT, counts()
+
+
+def alert_count():
+    """Items at or below their reorder level, out of stock included"""
+    return db.session.query(func.count(StockAlert.item_id)).scalar()
+
+
+# REBUILD
+
+def rebuild():
+    """
+    Recompute stock_alerts from items (backfill or repair)
+
+    Returns:
+        int: Number of alert rows written
+    """
+    db.session.execute(delete(StockAlert))
+    db.session.execute(
+        insert(StockAlert).from_select(
+            ['item_id', 'level', 'current_stock', 'reorder_level', 'raised_at'],
+            select(
+                Item.item_id,
+                case((Item.current_stock <= 0, OUT), else_=LOW),
+                Item.current_stock,
+                Item.reorder_level,
+                func.coalesce(Item.updated_at, Item.created_at, datetime.utcnow())
+            ).where(Item.current_stock <= Item.reorder_level)
+        )
+    )
+    db.session.commit()
+    return alert_count()
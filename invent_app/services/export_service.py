@@ -0,0 +1,228 @@
+"""
+Report Export
+Streams report rows as CSV, NDJSON or a JSON array. Each report is one
+column-projected SELECT read through a server-side cursor in batches of
+EXPORT_BATCH_SIZE rows, and the encoded output is yielded batch by batch,
+so memory stays flat and the first bytes leave before the last row is
+read.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from sqlalchemy import select, case
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.category import Category
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.normalized.transaction_type import TransactionType
+from invent_app.models.denormalized.stock_alert import StockAlert
+from invent_app.services import reference_cache
+
+
+# Rows fetched from the cursor and encoded per chunk
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'json': ('application/json', 'json'),
+}
+
+
+class UnknownReport(ValueError):
+    """Raised for a report name with no export"""
+
+
+# REPORT QUERIES
+
+def _stock_status():
+    return case(
+        (Item.current_stock == 0, 'Out of Stock'),
+        (Item.current_stock <= Item.reorder_level, 'Low Stock'),
+        else_='In Stock'
+    ).label('status')
+
+
+def _stock_levels_query(args):
+    query = select(
+        Item.item_code,
+        Item.item_name,
+        Category.category_name.label('category'),
+        Item.current_stock,
+        Item.reorder_level,
+        Item.unit_price,
+        (Item.current_stock * Item.unit_price).label('total_value'),
+        _stock_status()
+    ).join(Category, Item.category_id == Category.category_id)
+
+    category_id = args.get('category', type=int)
+    if category_id:
+        query = query.where(Item.category_id == category_id)
+    return query.order_by(Item.current_stock.asc(), Item.item_id)
+
+
+def _low_stock_query(args):
+    return select(
+        Item.item_code,
+        Item.item_name,
+        Category.category_name.label('category'),
+        Supplier.supplier_name.label('supplier'),
+        Item.current_stock,
+        Item.reorder_level,
+        (Item.reorder_level - Item.current_stock).label('shortfall'),
+        _stock_status()
+    ).join(Category, Item.category_id == Category.category_id)\
+     .outerjoin(Supplier, Item.supplier_id == Supplier.supplier_id)\
+     .join(StockAlert, StockAlert.item_id == Item.item_id)\
+     .order_by(StockAlert.current_stock.asc(), StockAlert.item_id)
+
+
+def _movement_history_query(args):
+    query = select(
+        Transaction.transaction_id,
+        Transaction.transaction_date,
+        Item.item_code,
+        Item.item_name,
+        TransactionType.type_name.label('type'),
+        Transaction.quantity,
+        Transaction.unit_price,
+        (Transaction.quantity * Transaction.unit_price).label('total_value'),
+        Supplier.supplier_name.label('supplier'),
+        Transaction.reference_number
+    ).join(Item, Transaction.item_id == Item.item_id)\
+     .join(TransactionType, Transaction.type_id == TransactionType.type_id)\
+     .outerjoin(Supplier, Transaction.supplier_id == Supplier.supplier_id)
+
+    start_date = _parse_date(args.get('start_date'))
+    end_date = _parse_date(args.get('end_date'))
+    if start_date:
+        query = query.where(Transaction.transaction_date >= start_date)
+    if end_date:
+        query = query.where(Transaction.transaction_date < end_date + timedelta(days=1))
+
+    type_name = args.get('type')
+    if type_name:
+        query = query.where(
+            Transaction.type_id == reference_cache.transaction_type_ids().get(type_name)
+        )
+    return query.order_by(Transaction.transaction_date.desc(), Transaction.transaction_id.desc())
+
+
+def _inventory_valuation_query(args):
+    value = (Item.current_stock * Item.unit_price).label('total_value')
+    return select(
+        Item.item_code,
+        Item.item_name,
+        Category.category_name.label('category'),
+        Item.current_stock,
+        Item.unit_price,
+        value
+    ).join(Category, Item.category_id == Category.category_id)\
+     .order_by(value.desc(), Item.item_id)
+
+
+REPORTS = {
+    'stock-levels': _stock_levels_query,
+    'low-stock': _low_stock_query,
+    'movement-history': _movement_history_query,
+    'inventory-valuation': _inventory_valuation_query,
+}
+
+
+# STREAMING
+
+def stream_report(report_type, fmt, args):
+    """
+    Encoded chunks of a report export
+
+    Args:
+        report_type: Key of REPORTS
+        fmt: Key of FORMATS
+        args: Request arguments used as report filters
+
+    Returns:
+        generator: str chunks, to be wrapped in stream_with_context
+
+    Raises:
+        UnknownReport: for an unknown report or format
+    """
+    if report_type not in REPORTS:
+        raise UnknownReport(f'Unknown report type {report_type}')
+    if fmt not in FORMATS:
+        raise UnknownReport(f'Unknown export format {fmt}')
+
+    statement = REPORTS[report_type](args)
+    encoder = {'csv': _encode_csv, 'ndjson': _encode_ndjson, 'json': _encode_json}[fmt]
+    return encoder(statement)
+
+
+def _batches(statement):
+    """Row batches from a server-side cursor"""
+    result = db.session.execute(
+        statement.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    )
+    try:
+        yield list(result.keys())
+        for batch in result.partitions():
+            yield batch
+    finally:
+        result.close()
+
+
+def _encode_csv(statement):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    batches = _batches(statement)
+
+    writer.writerow(next(batches))
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _encode_ndjson(statement):
+    batches = _batches(statement)
+    columns = next(batches)
+    for batch in batches:
+        yield ''.join(_json_row(columns, row) + '\n' for row in batch)
+
+
+def _encode_json(statement):
+    batches = _batches(statement)
+    columns = next(batches)
+    separator = '['
+    for batch in batches:
+        yield separator + ','.join(_json_row(columns, row) for row in batch)
+        separator = ','
+    yield '[]' if separator == '[' else ']'
+
+
+def _json_row(columns, row):
+    return json.dumps(
+        {name: _plain(value) for name, value in zip(columns, row)},
+        separators=(',', ':')
+    )
+
+
+def _plain(value):
+    """Convert database values to JSON friendly ones"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d') if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,214 @@
+"""
+Item Typeahead Index
+In-process prefix index over item codes and names. Every word of the
+code and name is kept in one sorted list, so a prefix lookup is a
+bisect plus a scan of the narrowest query word's range. Committed Item
+writes from this process are applied incrementally; writes from other
+workers are picked up through the shared 'items' table version.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from datetime import timedelta
+from itertools import chain
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.services import table_versions
+
+
+# Overlap applied to the updated_at watermark to cover slow commits
+CATCH_UP_OVERLAP = timedelta(minutes=1)
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric words"""
+    return _WORD.findall((text or '').lower())
+
+
+class ItemIndex:
+    """Sorted (token, item_id) pairs plus code, name and tokens per item"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = []
+        self._items = {}
+        self.version = None
+        self.watermark = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def rebuild(self, rows):
+        """Replace the index with (item_id, item_code, item_name) rows"""
+        items = {row[0]: (row[1], row[2], self._tokens(row[1], row[2])) for row in rows}
+        entries = sorted(
+            (token, item_id)
+            for item_id, (_, _, tokens) in items.items()
+            for token in tokens
+        )
+        with self._lock:
+            self._items = items
+            self._entries = entries
+
+    def upsert(self, item_id, item_code, item_name):
+        """Add or replace one item"""
+        with self._lock:
+            if self._items.get(item_id, ())[:2] == (item_code, item_name):
+                return
+            self.remove(item_id)
+            tokens = self._tokens(item_code, item_name)
+            self._items[item_id] = (item_code, item_name, tokens)
+            for token in tokens:
+                bisect.insort(self._entries, (token, item_id))
+
+    def remove(self, item_id):
+        """Drop one item if present"""
+        with self._lock:
+            fields = self._items.pop(item_id, None)
+            if fields is None:
+                return
+            for token in fields[2]:
+                position = bisect.bisect_left(self._entries, (token, item_id))
+                if position < len(self._entries) and self._entries[position] == (token, item_id):
+                    del self._entries[position]
+
+    def search(self, query, limit=10):
+        """
+        Find items whose code or name words start with every query word
+
+        Ranked exact code match first, then code prefix, then name
+        prefix, then by name.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        needle = query.strip().lower()
+
+        def rank(match):
+            item_id, code, name = match[0], match[1].lower(), match[2].lower()
+            if code == needle:
+                return (0, name, item_id)
+            if code.startswith(needle):
+                return (1, name, item_id)
+            if name.startswith(needle):
+                return (2, name, item_id)
+            return (3, name, item_id)
+
+        with self._lock:
+            # Drive the scan with the word matching the fewest entries;
+            # every word and the ranking apply to the whole range
+            ranges = [
+                (bisect.bisect_left(self._entries, (word,)),
+                 bisect.bisect_left(self._entries, (word + '\uffff',)))
+                for word in words
+            ]
+            start, end = min(ranges, key=lambda r: r[1] - r[0])
+            candidates = {item_id for _, item_id in self._entries[start:end]}
+
+            matches = []
+            for item_id in candidates:
+                code, name, tokens = self._items[item_id]
+                if all(any(t.startswith(w) for t in tokens) for w in words):
+                    matches.append((item_id, code, name))
+
+        return heapq.nsmallest(limit, matches, key=rank)
+
+    @staticmethod
+    def _tokens(item_code, item_name):
+        tokens = set(tokenize(item_code)) | set(tokenize(item_name))
+        # Keep the whole code as one token so "elec-0" finds "ELEC-001"
+        if item_code:
+            tokens.add(item_code.lower())
+        return tokens
+
+
+_index = ItemIndex()
+
+
+def get_index():
+    """Get the process index, building or catching it up as needed"""
+    version = table_versions.current_versions().get('items', 0)
+    if _index.version == version:
+        return _index
+
+    with _index._lock:
+        if _index.version is None:
+            _full_rebuild()
+        elif _index.version != version:
+            _catch_up()
+        _index.version = version
+    return _index
+
+
+def suggest(query, limit=10):
+    """Top matches as dicts for the typeahead API"""
+    return [
+        {'item_id': item_id, 'item_code': code, 'item_name': name}
+        for item_id, code, name in get_index().search(query, limit)
+    ]
+
+
+def _full_rebuild():
+    rows = db.session.query(Item.item_id, Item.item_code, Item.item_name).all()
+    _index.rebuild(rows)
+    _index.watermark = db.session.query(func.max(Item.updated_at)).scalar()
+
+
+def _catch_up():
+    """
+    Apply item writes made by other workers since the last sync
+
+    Deletions are not visible through updated_at: once every insert
+    and update is applied, an index holding more items than the table
+    has missed a delete (a delete plus an insert leaves the table count
+    unchanged), so it is rebuilt.
+    """
+    if _index.watermark is None:
+        _full_rebuild()
+        return
+
+    rows = db.session.query(Item.item_id, Item.item_code, Item.item_name, Item.updated_at)\
+        .filter(Item.updated_at >= _index.watermark - CATCH_UP_OVERLAP)\
+        .all()
+    for row in rows:
+        _index.upsert(row.item_id, row.item_code, row.item_name)
+        _index.watermark = max(_index.watermark, row.updated_at)
+
+    if db.session.query(func.count(Item.item_id)).scalar() != len(_index):
+        _full_rebuild()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_item_changes(session, flush_context):
+    """Remember item writes until the transaction commits"""
+    pending = session.info.setdefault('item_index_changes', [])
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Item):
+            pending.append((obj.item_id, obj.item_code, obj.item_name))
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            pending.append((obj.item_id, None, None))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_item_changes(session):
+    if _index.version is None:
+        session.info.pop('item_index_changes', None)
+        return
+
+    for item_id, item_code, item_name in session.info.pop('item_index_changes', []):
+        if item_code is None:
+            _index.remove(item_id)
+        else:
+            _index.upsert(item_id, item_code, item_name)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_item_changes(session):
+    session.info.pop('item_index_changes', None)
@@ -0,0 +1,210 @@
+"""
+Read Model Sync
+Keeps item_denorm and transaction_denorm current inside the same
+database transaction as the writes they mirror:
+
+- ORM flushes of items and reference data are copied by an after_flush
+  hook (row refresh for items, name fan-out for renames)
+- Stock movements, which bypass the ORM, are copied by id by
+  transaction_service through apply_movements(); ORM writes to the
+  ledger are rejected there
+
+rebuild() recomputes both tables from the normalized schema for
+backfill and repair.
+"""
+
+from sqlalchemy import event, select, insert, update, delete, inspect
+from sqlalchemy.orm import Session
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.category import Category
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.models.normalized.location import Location
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.normalized.transaction_type import TransactionType
+from invent_app.models.denormalized.item_denorm import ItemDenorm
+from invent_app.models.denormalized.transaction_denorm import TransactionDenorm
+
+
+# Upper bound on ids per IN (...) list
+SYNC_CHUNK_SIZE = 5000
+
+ITEM_DENORM_COLUMNS = [
+    'item_id', 'item_code', 'item_name', 'description', 'category_id', 'category_name',
+    'supplier_id', 'supplier_name', 'location_id', 'warehouse', 'unit_price',
+    'current_stock', 'reorder_level', 'created_at', 'updated_at'
+]
+
+TRANSACTION_DENORM_COLUMNS = [
+    'transaction_id', 'item_id', 'item_code', 'item_name', 'type_id', 'type_name',
+    'quantity', 'unit_price', 'supplier_id', 'supplier_name', 'reference_number',
+    'notes', 'transaction_date', 'created_by'
+]
+
+
+# SOURCE QUERIES
+
+def _item_source():
+    """items joined to their reference names, in ITEM_DENORM_COLUMNS order"""
+    return select(
+        Item.item_id, Item.item_code, Item.item_name, Item.description,
+        Item.category_id, Category.category_name,
+        Item.supplier_id, Supplier.supplier_name,
+        Item.location_id, Location.warehouse,
+        Item.unit_price, Item.current_stock, Item.reorder_level,
+        Item.created_at, Item.updated_at
+    ).join(Category, Item.category_id == Category.category_id)\
+     .outerjoin(Supplier, Item.supplier_id == Supplier.supplier_id)\
+     .outerjoin(Location, Item.location_id == Location.location_id)
+
+
+def _transaction_source():
+    """transactions joined to their names, in TRANSACTION_DENORM_COLUMNS order"""
+    return select(
+        Transaction.transaction_id, Transaction.item_id, Item.item_code, Item.item_name,
+        Transaction.type_id, TransactionType.type_name,
+        Transaction.quantity, Transaction.unit_price,
+        Transaction.supplier_id, Supplier.supplier_name,
+        Transaction.reference_number, Transaction.notes,
+        Transaction.transaction_date, Transaction.created_by
+    ).join(Item, Transaction.item_id == Item.item_id)\
+     .join(TransactionType, Transaction.type_id == TransactionType.type_id)\
+     .outerjoin(Supplier, Transaction.supplier_id == Supplier.supplier_id)
+
+
+def _chunks(ids):
+    ids = sorted(ids)
+    for start in range(0, len(ids), SYNC_CHUNK_SIZE):
+        yield ids[start:start + SYNC_CHUNK_SIZE]
+
+
+# STOCK MOVEMENTS
+
+def apply_movements(transaction_ids, item_ids):
+    """
+    Mirror freshly written ledger rows and the stock levels they changed
+
+    Args:
+        transaction_ids: Ids of the new ledger rows
+        item_ids: Items whose current_stock changed
+    """
+    for chunk in _chunks(item_ids):
+        db.session.execute(
+            update(ItemDenorm)
+            .where(ItemDenorm.item_id.in_(chunk))
+            .values(
+                current_stock=select(Item.current_stock)
+                    .where(Item.item_id == ItemDenorm.item_id)
+                    .scalar_subquery(),
+                updated_at=select(Item.updated_at)
+                    .where(Item.item_id == ItemDenorm.item_id)
+                    .scalar_subquery()
+            )
+        )
+    for chunk in _chunks(transaction_ids):
+        db.session.execute(
+            insert(TransactionDenorm).from_select(
+                TRANSACTION_DENORM_COLUMNS,
+                _transaction_source().where(Transaction.transaction_id.in_(chunk))
+            )
+        )
+
+
+# ORM WRITES
+
+def refresh_items(connection, item_ids):
+    """Replace the item_denorm rows of the given items from the source"""
+    for chunk in _chunks(item_ids):
+        connection.execute(delete(ItemDenorm).where(ItemDenorm.item_id.in_(chunk)))
+        connection.execute(
+            insert(ItemDenorm).from_select(
+                ITEM_DENORM_COLUMNS, _item_source().where(Item.item_id.in_(chunk))
+            )
+        )
+
+
+def _changed(obj, *attributes):
+    """True if any of the attributes has pending history on obj"""
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_flushed_rows(session, flush_context):
+    """Copy ORM changes to items and reference data into the read models"""
+    connection = session.connection()
+    refreshed, removed = set(), set()
+
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            removed.add(obj.item_id)
+
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Item):
+            refreshed.add(obj.item_id)
+            if obj in session.dirty and _changed(obj, 'item_code', 'item_name'):
+                connection.execute(
+                    update(TransactionDenorm)
+                    .where(TransactionDenorm.item_id == obj.item_id)
+                    .values(item_code=obj.item_code, item_name=obj.item_name)
+                )
+        elif obj not in session.dirty:
+            continue
+        elif isinstance(obj, Category) and _changed(obj, 'category_name'):
+            connection.execute(
+                update(ItemDenorm)
+                .where(ItemDenorm.category_id == obj.category_id)
+                .values(category_name=obj.category_name)
+            )
+        elif isinstance(obj, Supplier) and _changed(obj, 'supplier_name'):
+            connection.execute(
+                update(ItemDenorm)
+                .where(ItemDenorm.supplier_id == obj.supplier_id)
+                .values(supplier_name=obj.supplier_name)
+            )
+            connection.execute(
+                update(TransactionDenorm)
+                .where(TransactionDenorm.supplier_id == obj.supplier_id)
+                .values(supplier_name=obj.supplier_name)
+            )
+        elif isinstance(obj, Location) and _changed(obj, 'warehouse'):
+            connection.execute(
+                update(ItemDenorm)
+                .where(ItemDenorm.location_id == obj.location_id)
+                .values(warehouse=obj.warehouse)
+            )
+        elif isinstance(obj, TransactionType) and _changed(obj, 'type_name'):
+            connection.execute(
+                update(TransactionDenorm)
+                .where(TransactionDenorm.type_id == obj.type_id)
+                .values(type_name=obj.type_name)
+            )
+
+    if removed:
+        for chunk in _chunks(removed):
+            connection.execute(delete(ItemDenorm).where(ItemDenorm.item_id.in_(chunk)))
+    if refreshed - removed:
+        refresh_items(connection, refreshed - removed)
+
+
+# BATCH REBUILD
+
+def rebuild():
+    """
+    Recompute both read models from the normalized schema
+
+    Returns:
+        tuple: (item rows, transaction rows) written
+    """
+    db.session.execute(delete(TransactionDenorm))
+    db.session.execute(delete(ItemDenorm))
+    db.session.execute(insert(ItemDenorm).from_select(ITEM_DENORM_COLUMNS, _item_source()))
+    db.session.execute(
+        insert(TransactionDenorm).from_select(TRANSACTION_DENORM_COLUMNS, _transaction_source())
+    )
+    db.session.commit()
+
+    return (
+        db.session.query(ItemDenorm).count(),
+        db.session.query(TransactionDenorm).count()
+    )
@@ -0,0 +1,102 @@
+"""
+Reference Data Cache
+Serves transaction type ids and the category / supplier / location select
+choices from process memory. Entries are tagged with the table version
+they were loaded at and reloaded when the shared version moves on.
+"""
+
+import threading
+from invent_app import db
+from invent_app.models.normalized.category import Category
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.models.normalized.location import Location
+from invent_app.models.normalized.transaction_type import TransactionType
+from invent_app.services import table_versions
+
+
+def _load_transaction_types():
+    return dict(db.session.query(TransactionType.type_name, TransactionType.type_id).all())
+
+
+def _load_categories():
+    return db.session.query(Category.category_id, Category.category_name)\
+        .order_by(Category.category_name).all()
+
+
+def _load_suppliers():
+    return db.session.query(Supplier.supplier_id, Supplier.supplier_name)\
+        .order_by(Supplier.supplier_name).all()
+
+
+def _load_locations():
+    return db.session.query(Location.location_id, Location.warehouse, Location.aisle, Location.shelf)\
+        .order_by(Location.location_id).all()
+
+
+# Cache key -> (table it depends on, loader)
+LOADERS = {
+    'transaction_types': ('transaction_types', _load_transaction_types),
+    'categories': ('categories', _load_categories),
+    'suppliers': ('suppliers', _load_suppliers),
+    'locations': ('locations', _load_locations),
+}
+
+_entries = {}
+_lock = threading.Lock()
+
+
+def get(key):
+    """Get a cached reference list, reloading it if its table changed"""
+    table_name, loader = LOADERS[key]
+    version = table_versions.current_versions().get(table_name, 0)
+
+    entry = _entries.get(key)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    value = loader()
+    with _lock:
+        _entries[key] = (version, value)
+    return value
+
+
+@table_versions.on_commit
+def invalidate(tables):
+    """Drop entries built from any of the given tables"""
+    with _lock:
+        for key, (table_name, _) in LOADERS.items():
+            if table_name in tables:
+                _entries.pop(key, None)
+
+
+def transaction_type_ids():
+    """Map transaction type name to id"""
+    return get('transaction_types')
+
+
+def categories():
+    """Categories as (category_id, category_name) rows, sorted by name"""
+    return get('categories')
+
+
+def category_choices():
+    """Select choices for a required category field"""
+    return [(c.category_id, c.category_name) for c in get('categories')]
+
+
+def supplier_ids():
+    """Ids of every supplier, for validating movement input"""
+    return {s.supplier_id for s in get('suppliers')}
+
+
+def supplier_choices():
+    """Select choices for an optional supplier field"""
+    return [(0, 'Select Supplier')] + [(s.supplier_id, s.supplier_name) for s in get('suppliers')]
+
+
+def location_choices():
+    """Select choices for an optional location field"""
+    return [(0, 'Select Location')] + [
+        (l.location_id, f"{l.warehouse} - {l.aisle}/{l.shelf}")
+        for l in get('locations')
+    ]
@@ -0,0 +1,322 @@
+"""
+Background Report Jobs
+Runs report exports in a local process pool so web workers only queue
+the job and hand back its id. Each job renders one export_service report
+to a file in REPORT_JOB_DIR next to a small JSON status record; both are
+written atomically, so any web worker on the host can poll a job or
+serve its result.
+
+The job id is a hash of the report, format, filters and current table
+write versions: identical requests made while the data is unchanged
+share one job (and its finished result until REPORT_JOB_TTL_SECONDS
+runs out).
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from werkzeug.datastructures import MultiDict
+from invent_app.services import export_service, table_versions
+from invent_app.services.export_service import UnknownReport
+from invent_app.utils.http_cache import make_etag
+
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+_JOB_ID = re.compile(r'^[0-9a-f]{40}$')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Flask app of a pool worker process
+_worker_app = None
+
+
+class UnknownJob(LookupError):
+    """Raised for a job id with no live job"""
+
+
+# SUBMISSION
+
+def submit(report_type, fmt, args):
+    """
+    Queue a report export, or join an identical live job
+
+    Args:
+        report_type: Key of export_service.REPORTS
+        fmt: Key of export_service.FORMATS
+        args: Report filters (MultiDict or dict)
+
+    Returns:
+        dict: Job status record
+
+    Raises:
+        UnknownReport: for an unknown report or format
+    """
+    if report_type not in export_service.REPORTS:
+        raise UnknownReport(f'Unknown report type {report_type}')
+    if fmt not in export_service.FORMATS:
+        raise UnknownReport(f'Unknown export format {fmt}')
+
+    args = MultiDict(args)
+    job_id = make_etag(
+        'report-job', report_type, fmt,
+        sorted(args.items(multi=True)),
+        sorted(table_versions.current_versions().items())
+    )
+
+    purge_expired()
+    job = _read(job_id)
+    if job is not None and job['status'] != FAILED:
+        return job
+    if job is not None:
+        _remove(job)
+
+    now = time.time()
+    job = {
+        'job_id': job_id,
+        'report': report_type,
+        'format': fmt,
+        'args': list(args.items(multi=True)),
+        'status': QUEUED,
+        'created_at': now,
+        'updated_at': now,
+    }
+    if not _create(job):
+        # Another worker queued the same job first
+        return _read(job_id) or job
+
+    _dispatch(job)
+    return job
+
+
+def get(job_id):
+    """
+    Status record of a job
+
+    Raises:
+        UnknownJob: if the id is malformed, unknown or expired
+    """
+    job = _read(job_id) if _JOB_ID.match(job_id or '') else None
+    if job is None:
+        raise UnknownJob(job_id)
+    return job
+
+
+def result_path(job):
+    """Path of a finished job's result file"""
+    extension = export_service.FORMATS[job['format']][1]
+    return os.path.join(current_app.config['REPORT_JOB_DIR'], f"{job['job_id']}.{extension}")
+
+
+def purge_expired():
+    """Delete finished jobs past their TTL; return how many were removed"""
+    directory = current_app.config['REPORT_JOB_DIR']
+    if not os.path.isdir(directory):
+        return 0
+
+    removed = 0
+    for name in os.listdir(directory):
+        job_id, extension = os.path.splitext(name)
+        if extension != '.json' or not _JOB_ID.match(job_id):
+            continue
+        job = _load(job_id)
+        if job is not None and _expired(job) and _remove(job):
+            removed += 1
+    return removed
+
+
+# POOL
+
+def _dispatch(job):
+    """
+    Hand a queued job to the pool
+
+    A pool whose worker died is broken for good: it is replaced and the
+    job submitted once more. If that fails too the job is marked failed
+    so the next identical request queues it afresh.
+    """
+    app = current_app._get_current_object()
+    for _ in range(2):
+        executor = _pool()
+        try:
+            future = executor.submit(_run, app.config['REPORT_JOB_DIR'], job)
+        except BrokenProcessPool:
+            app.logger.warning('Report job pool broken, starting a new one')
+            _discard_pool(executor)
+            continue
+        future.add_done_callback(
+            lambda done, job_id=job['job_id']: _job_settled(app, executor, job_id, done)
+        )
+        return
+    _update(job, status=FAILED, error='Report workers are unavailable')
+
+
+def _job_settled(app, executor, job_id, future):
+    """
+    Fail a job its pool could not finish (runs in the pool's thread)
+
+    _run() records its own errors, so an exception here means the pool
+    broke (a worker died) or the job was cancelled.
+    """
+    error = 'Cancelled' if future.cancelled() else future.exception()
+    if error is None:
+        return
+    if isinstance(error, BrokenProcessPool):
+        _discard_pool(executor)
+
+    with app.app_context():
+        job = _load(job_id)
+        if job is not None and job['status'] in (QUEUED, RUNNING):
+            app.logger.error('Report job %s lost: %s', job_id, error)
+            _update(job, status=FAILED, error='Report worker stopped unexpectedly')
+
+
+def _discard_pool(executor):
+    """Forget a broken pool so the next job starts a new one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _pool():
+    """The process pool of this web worker, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = current_app.config
+            _executor = ProcessPoolExecutor(
+                max_workers=config['REPORT_JOB_WORKERS'],
+                mp_context=multiprocessing.get_context(config['REPORT_JOB_START_METHOD']),
+                initializer=_init_worker
+            )
+        return _executor
+
+
+def _init_worker():
+    """Build the Flask app once per pool process"""
+    global _worker_app
+    from invent_app import create_app
+    _worker_app = create_app()
+
+
+def _run(directory, job):
+    """Render one job to its result file (runs in a pool process)"""
+    from invent_app.database import routing
+
+    job_id = job['job_id']
+    with _worker_app.app_context():
+        _worker_app.config['REPORT_JOB_DIR'] = directory
+        routing.choose_replica(_worker_app)
+
+        _update(job, status=RUNNING, started_at=time.time())
+        path = result_path(job)
+        partial = f'{path}.{os.getpid()}.part'
+        try:
+            with open(partial, 'w', encoding='utf-8', newline='') as output:
+                chunks = export_service.stream_report(
+                    job['report'], job['format'], MultiDict(job['args'])
+                )
+                for chunk in chunks:
+                    output.write(chunk)
+            os.replace(partial, path)
+        except Exception as e:
+            _worker_app.logger.exception('Report job %s failed', job_id)
+            if os.path.exists(partial):
+                os.remove(partial)
+            _update(job, status=FAILED, error=str(e))
+            return
+
+        _update(job, status=DONE, finished_at=time.time(), size=os.path.getsize(path))
+
+
+# STATUS RECORDS
+
+def _status_path(job_id):
+    return os.path.join(current_app.config['REPORT_JOB_DIR'], f'{job_id}.json')
+
+
+def _create(job):
+    """
+    Write a new status record; False if one already exists
+
+    The record is written to a temporary file and hard-linked into
+    place, so readers never see it half written and only one of two
+    concurrent creators wins.
+    """
+    os.makedirs(current_app.config['REPORT_JOB_DIR'], exist_ok=True)
+    path = _status_path(job['job_id'])
+    partial = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+    with open(partial, 'w') as output:
+        json.dump(job, output)
+    try:
+        os.link(partial, path)
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(partial)
+    return True
+
+
+def _update(job, **changes):
+    """Atomically replace a status record"""
+    job.update(changes, updated_at=time.time())
+    path = _status_path(job['job_id'])
+    partial = f'{path}.{os.getpid()}.part'
+    with open(partial, 'w') as output:
+        json.dump(job, output)
+    os.replace(partial, path)
+
+
+def _read(job_id):
+    """
+    Status record of a live job, or None
+
+    Finished jobs past REPORT_JOB_TTL_SECONDS and jobs left queued or
+    running past REPORT_JOB_TIMEOUT_SECONDS (their pool died) are
+    removed and reported as missing.
+    """
+    job = _load(job_id)
+    if job is not None and _expired(job):
+        _remove(job)
+        return None
+    return job
+
+
+def _load(job_id):
+    """Status record as stored, or None"""
+    try:
+        with open(_status_path(job_id)) as source:
+            return json.load(source)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _expired(job):
+    """True once a job is past its TTL (finished) or timeout (queued/running)"""
+    config = current_app.config
+    age = time.time() - job['updated_at']
+    if job['status'] in (QUEUED, RUNNING):
+        return age > config['REPORT_JOB_TIMEOUT_SECONDS']
+    return age > config['REPORT_JOB_TTL_SECONDS']
+
+
+def _remove(job):
+    """Delete a job's result file and status record; True if this call deleted the record"""
+    try:
+        os.remove(result_path(job))
+    except FileNotFoundError:
+        pass
+    try:
+        os.remove(_status_path(job['job_id']))
+    except FileNotFoundError:
+        return False
+    return True
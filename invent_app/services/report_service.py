@@ -0,0 +1,302 @@
+"""
+Report Service
+Aggregations shared by the dashboard and report views.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from sqlalchemy import (
+    select, and_, func, cast, null, union_all, type_coerce, Date, DateTime, Integer, String
+)
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.normalized.transaction_type import TransactionType
+from invent_app.models.denormalized.daily_rollup import TransactionDailyRollup
+from invent_app.models.denormalized.category_valuation import CategoryValuation
+from invent_app.models.denormalized.stock_alert import StockAlert
+from invent_app.services import (
+    reference_cache, table_versions, alert_service
+)
+from invent_app.services.transaction_service import STOCK_DIRECTION
+
+
+# DASHBOARD
+
+# Movement types charted on the dashboard
+SERIES_TYPES = ('STOCK_IN', 'STOCK_OUT')
+
+_dashboard_snapshot = {'built_at': None, 'data': None}
+_dashboard_lock = threading.Lock()
+
+
+def dashboard_snapshot():
+    """
+    Dashboard figures, cached for DASHBOARD_CACHE_SECONDS
+
+    Dropped early when this process commits a stock movement or an item
+    change; other workers converge within the TTL.
+    """
+    ttl = current_app.config['DASHBOARD_CACHE_SECONDS']
+    built_at = _dashboard_snapshot['built_at']
+    if built_at is not None and time.monotonic() - built_at < ttl:
+        return _dashboard_snapshot['data']
+
+    data = build_dashboard()
+    with _dashboard_lock:
+        _dashboard_snapshot.update(built_at=time.monotonic(), data=data)
+    return data
+
+
+@table_versions.on_commit
+def _invalidate_dashboard(tables):
+    if tables & {'items', 'transactions'}:
+        with _dashboard_lock:
+            _dashboard_snapshot.update(built_at=None, data=None)
+
+
+def build_dashboard(days=30):
+    """Compute every dashboard figure from the database (two reads)"""
+    data = item_status_counts()
+    data.update(recent_activity(days))
+    return data
+
+
+def item_status_counts():
+    """
+    Total, in-stock, low-stock and out-of-stock counts
+
+    One read of category_valuation and stock_alerts, so the cost follows
+    the number of categories and alerts rather than items.
+    """
+    alerted, out_of_stock, total = db.session.execute(
+        select(
+            select(func.count(StockAlert.item_id)).scalar_subquery(),
+            select(func.count(StockAlert.item_id))
+                .where(StockAlert.level == alert_service.OUT)
+                .scalar_subquery(),
+            select(func.coalesce(func.sum(CategoryValuation.item_count), 0)).scalar_subquery()
+        )
+    ).one()
+    return {
+        'total_items': int(total),
+        'low_stock_items': alerted - out_of_stock,
+        'out_of_stock_items': out_of_stock,
+        'in_stock_items': max(int(total) - alerted, 0),
+    }
+
+
+def recent_activity(days=30, limit=10):
+    """
+    Latest movements and daily STOCK_IN / STOCK_OUT totals for the last N days
+
+    One UNION ALL of the newest ledger rows and the grouped daily rollup
+    buckets (series rows have no transaction_id). The series is pivoted
+    in Python; days with no movement are filled with 0.
+
+    Returns:
+        dict: recent_transactions (plain rows, safe to keep across
+        requests), chart_labels, stock_in_data, stock_out_data
+    """
+    today = datetime.utcnow().date()
+    Rollup = TransactionDailyRollup
+
+    recent = select(
+        Transaction.transaction_id,
+        Transaction.quantity,
+        Transaction.transaction_date,
+        Item.item_name,
+        TransactionType.type_name,
+        cast(null(), Date).label('rollup_date')
+    ).join(Item, Transaction.item_id == Item.item_id)\
+     .join(TransactionType, Transaction.type_id == TransactionType.type_id)\
+     .order_by(Transaction.transaction_date.desc(), Transaction.transaction_id.desc())\
+     .limit(limit)\
+     .subquery()
+
+    series = select(
+        cast(null(), Integer),
+        func.sum(Rollup.quantity),
+        cast(null(), DateTime),
+        cast(null(), String),
+        TransactionType.type_name,
+        Rollup.rollup_date
+    ).join(TransactionType, Rollup.type_id == TransactionType.type_id)\
+     .where(
+        Rollup.rollup_date >= today - timedelta(days=days - 1),
+        TransactionType.type_name.in_(SERIES_TYPES)
+    ).group_by(Rollup.rollup_date, TransactionType.type_name)
+
+    recent_rows, totals = [], {}
+    for row in db.session.execute(union_all(select(recent), series)):
+        if row.transaction_id is None:
+            totals[(str(row.rollup_date), row.type_name)] = int(row.quantity or 0)
+        else:
+            recent_rows.append(row)
+    recent_rows.sort(key=lambda row: (row.transaction_date, row.transaction_id), reverse=True)
+
+    labels, stock_in, stock_out = [], [], []
+    for offset in range(days - 1, -1, -1):
+        date = today - timedelta(days=offset)
+        labels.append(date.strftime('%b %d'))
+        stock_in.append(totals.get((str(date), 'STOCK_IN'), 0))
+        stock_out.append(totals.get((str(date), 'STOCK_OUT'), 0))
+
+    return {
+        'recent_transactions': recent_rows,
+        'chart_labels': labels,
+        'stock_in_data': stock_in,
+        'stock_out_data': stock_out
+    }
+
+
+# STOCK TURNOVER
+
+TURNOVER_SORTS = ('turnover', 'cover')
+
+
+def stock_turnover(days=30):
+    """
+    Turnover and days of cover for every item over the last N days
+
+    One read of items outer-joined to their daily rollup buckets in the
+    window; everything else is NumPy over the returned columns.
+    Average stock is rebuilt backwards from the current level: a net
+    movement on day k of the window moved the closing stock of the k
+    days before it, so
+
+        average = current - sum(net * k) / days
+
+    Args:
+        days: Window length in days, ending today (UTC)
+
+    Returns:
+        dict: Equal-length arrays item_id, current_stock, stock_out,
+        average_stock, turnover and days_of_cover (inf where nothing
+        went out)
+    """
+    type_ids = reference_cache.transaction_type_ids()
+    directions = {
+        type_ids[name]: sign for name, sign in STOCK_DIRECTION.items() if name in type_ids
+    }
+    stock_out_id = type_ids.get('STOCK_OUT')
+    start_date = datetime.utcnow().date() - timedelta(days=days - 1)
+
+    Rollup = TransactionDailyRollup
+    statement = select(
+        Item.item_id,
+        Item.current_stock,
+        # Raw ISO text (a date on drivers that return one): NumPy parses
+        # either far faster than per-row Date processing
+        type_coerce(Rollup.rollup_date, String),
+        Rollup.type_id,
+        Rollup.quantity
+    ).outerjoin(Rollup, and_(
+        Rollup.item_id == Item.item_id,
+        Rollup.rollup_date >= start_date,
+        Rollup.type_id.in_(list(directions))
+    )).order_by(Item.item_id)
+
+    rows = db.session.execute(statement).all()
+    if not rows:
+        empty = np.array([], dtype=float)
+        return {
+            'item_id': np.array([], dtype=np.int64), 'current_stock': empty,
+            'stock_out': empty, 'average_stock': empty, 'turnover': empty,
+            'days_of_cover': empty
+        }
+
+    item_ids, stock, dates, types, quantities = zip(*rows)
+    item_ids = np.array(item_ids, dtype=np.int64)
+
+    # Rows arrive grouped by item: index of each row's item
+    starts = np.r_[True, item_ids[1:] != item_ids[:-1]]
+    first = np.flatnonzero(starts)
+    item_index = np.cumsum(starts) - 1
+    count = len(first)
+
+    # Items with no movement come back with NULL rollup columns
+    quantity = np.nan_to_num(np.array(quantities, dtype=float))
+    type_id = np.nan_to_num(np.array(types, dtype=float), nan=-1)
+    day = np.array(dates, dtype='datetime64[D]')
+    offset = np.where(np.isnat(day), 0, (day - np.datetime64(start_date, 'D')).astype(np.int64))
+
+    sign = np.zeros(len(rows))
+    for type_key, direction in directions.items():
+        sign[type_id == type_key] = direction
+
+    current = np.array(stock, dtype=float)[first]
+    stock_out = np.bincount(item_index, weights=quantity * (type_id == stock_out_id), minlength=count)
+    moved = np.bincount(item_index, weights=quantity * sign * offset, minlength=count)
+    average = np.maximum(current - moved / days, 0)
+
+    turnover = np.divide(stock_out, average, out=np.zeros(count), where=average > 0)
+    daily_out = stock_out / days
+    cover = np.divide(current, daily_out, out=np.full(count, np.inf), where=daily_out > 0)
+
+    return {
+        'item_id': item_ids[first],
+        'current_stock': current,
+        'stock_out': stock_out,
+        'average_stock': average,
+        'turnover': turnover,
+        'days_of_cover': cover,
+    }
+
+
+def turnover_report(days=30, sort='turnover', limit=100):
+    """
+    Catalogue turnover summary and the top items by a sort key
+
+    Args:
+        days: Window length in days
+        sort: 'turnover' (fastest movers first) or 'cover' (fewest
+            days of cover first)
+        limit: Number of item rows returned
+
+    Returns:
+        dict: days, summary figures and a list of item row dicts
+    """
+    data = stock_turnover(days)
+    turnover, cover = data['turnover'], data['days_of_cover']
+
+    if sort == 'cover':
+        order = np.lexsort((data['item_id'], -turnover, cover))
+    else:
+        order = np.lexsort((data['item_id'], cover, -turnover))
+
+    # Names only for the rows returned
+    top = order[:limit]
+    top_ids = data['item_id'][top].tolist()
+    labels = {
+        row.item_id: row for row in db.session.query(
+            Item.item_id, Item.item_code, Item.item_name
+        ).filter(Item.item_id.in_(top_ids))
+    } if top_ids else {}
+
+    items = [{
+        'item_id': item_id,
+        'item_code': labels[item_id].item_code,
+        'item_name': labels[item_id].item_name,
+        'current_stock': int(data['current_stock'][i]),
+        'stock_out': int(data['stock_out'][i]),
+        'average_stock': round(float(data['average_stock'][i]), 2),
+        'turnover': round(float(turnover[i]), 3),
+        'days_of_cover': round(float(cover[i]), 1) if np.isfinite(cover[i]) else None,
+    } for i, item_id in zip(top, top_ids)]
+
+    total_average = float(data['average_stock'].sum())
+    total_out = float(data['stock_out'].sum())
+    moving = turnover > 0
+    return {
+        'days': days,
+        'total_items': len(turnover),
+        'moving_items': int(moving.sum()),
+        'total_stock_out': int(total_out),
+        'catalogue_turnover': round(total_out / total_average, 3) if total_average > 0 else 0.0,
+        'median_turnover': round(float(np.median(turnover[moving])), 3) if moving.any() else 0.0,
+        'items': items,
+    }
@@ -0,0 +1,145 @@
+"""
+Daily Movement Rollup
+Maintains transaction_daily_rollup in the same database transaction as
+each stock movement and answers date-range movement questions from it,
+so report cost follows the number of days rather than ledger rows.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import select, insert, delete, func
+from invent_app import db
+from invent_app.database.upsert import additive_upsert
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.denormalized.daily_rollup import TransactionDailyRollup
+
+
+Rollup = TransactionDailyRollup
+
+COUNTER_COLUMNS = ('quantity', 'total_value', 'transaction_count')
+
+
+def apply_movements(ledger_rows):
+    """
+    Add ledger rows to their daily buckets
+
+    Rows are merged per (date, item, type) first, then written with one
+    upsert per bucket on the current session connection.
+    """
+    buckets = defaultdict(lambda: [0, Decimal(0), 0])
+    for row in ledger_rows:
+        key = (row['transaction_date'].date(), row['item_id'], row['type_id'])
+        bucket = buckets[key]
+        bucket[0] += row['quantity']
+        bucket[1] += Decimal(row['quantity']) * Decimal(str(row['unit_price'] or 0))
+        bucket[2] += 1
+
+    if not buckets:
+        return
+
+    params = [
+        {
+            'rollup_date': rollup_date,
+            'item_id': item_id,
+            'type_id': type_id,
+            'quantity': quantity,
+            'total_value': value,
+            'transaction_count': count,
+        }
+        for (rollup_date, item_id, type_id), (quantity, value, count) in sorted(buckets.items())
+    ]
+    db.session.execute(
+        additive_upsert(Rollup.__table__, ('rollup_date', 'item_id', 'type_id'), COUNTER_COLUMNS),
+        params
+    )
+
+
+def rebuild(start_date=None, end_date=None):
+    """
+    Recompute rollup rows from the ledger for an inclusive date range
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    day = func.date(Transaction.transaction_date)
+
+    clear = delete(Rollup)
+    source = select(
+        day,
+        Transaction.item_id,
+        Transaction.type_id,
+        func.sum(Transaction.quantity),
+        func.sum(Transaction.quantity * func.coalesce(Transaction.unit_price, 0)),
+        func.count(Transaction.transaction_id)
+    )
+    if start_date:
+        clear = clear.where(Rollup.rollup_date >= start_date)
+        source = source.where(day >= start_date)
+    if end_date:
+        clear = clear.where(Rollup.rollup_date <= end_date)
+        source = source.where(day <= end_date)
+
+    db.session.execute(clear)
+    db.session.execute(
+        insert(Rollup).from_select(
+            ['rollup_date', 'item_id', 'type_id', 'quantity', 'total_value', 'transaction_count'],
+            source.group_by(day, Transaction.item_id, Transaction.type_id)
+        )
+    )
+    db.session.commit()
+
+    count = db.session.query(func.count()).select_from(Rollup)
+    if start_date:
+        count = count.filter(Rollup.rollup_date >= start_date)
+    if end_date:
+        count = count.filter(Rollup.rollup_date <= end_date)
+    return count.scalar()
+
+
+# QUERIES
+
+def _in_range(query, start_date, end_date):
+    if start_date:
+        query = query.filter(Rollup.rollup_date >= start_date)
+    if end_date:
+        query = query.filter(Rollup.rollup_date <= end_date)
+    return query
+
+
+def quantity_by_type(start_date=None, end_date=None, item_id=None):
+    """Total quantity per type_id over an inclusive date range"""
+    query = _in_range(
+        db.session.query(Rollup.type_id, func.sum(Rollup.quantity)),
+        start_date, end_date
+    )
+    if item_id is not None:
+        query = query.filter(Rollup.item_id == item_id)
+    return {type_id: int(total or 0) for type_id, total in query.group_by(Rollup.type_id)}
+
+
+def transaction_count(start_date=None, end_date=None):
+    """Number of ledger rows over an inclusive date range"""
+    return _in_range(
+        db.session.query(func.sum(Rollup.transaction_count)),
+        start_date, end_date
+    ).scalar() or 0
+
+
+def most_active_items(start_date=None, end_date=None, limit=10):
+    """Items with the most movements, as (item_name, transaction_count) rows"""
+    activity = _in_range(
+        db.session.query(
+            Rollup.item_id,
+            func.sum(Rollup.transaction_count).label('transaction_count')
+        ),
+        start_date, end_date
+    ).group_by(Rollup.item_id)\
+     .order_by(func.sum(Rollup.transaction_count).desc())\
+     .limit(limit)\
+     .subquery()
+
+    return db.session.query(Item.item_name, activity.c.transaction_count)\
+        .join(activity, Item.item_id == activity.c.item_id)\
+        .order_by(activity.c.transaction_count.desc())\
+        .all()
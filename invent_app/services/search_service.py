@@ -0,0 +1,192 @@
+"""
+Item Search
+Ranked, index-backed matching on item codes and names:
+
+- PostgreSQL: pg_trgm GIN indexes; substring (ILIKE) and fuzzy (%)
+  matches ranked by word_similarity
+- SQLite: items_fts, an FTS5 trigram table kept in sync by triggers,
+  ranked by bm25
+- Anything else, or a database without the migration applied: the
+  original unranked ILIKE scan
+
+Each call returns the top SEARCH_RESULT_LIMIT item ids, so cost follows
+the number of matches rather than the size of the catalogue.
+count_item_matches() reports how many items match in all, for callers
+showing only the top of a longer result.
+"""
+
+import re
+from sqlalchemy import text, func, or_, literal
+from invent_app import db
+from invent_app.models.normalized.item import Item
+
+
+# Most results a single search returns
+SEARCH_RESULT_LIMIT = 100
+
+# Shortest term the trigram indexes can match
+MIN_TRIGRAM_LENGTH = 3
+
+_TERM = re.compile(r'\S+')
+
+# Per-dialect result of the index availability check
+_backend_ready = {}
+
+
+def search_item_ids(query, limit=SEARCH_RESULT_LIMIT, category_id=None):
+    """
+    Ids of the items best matching a search string, best first
+
+    Args:
+        query: Free text matched against item code and name
+        limit: Maximum number of ids
+        category_id: Only return items in this category
+
+    Returns:
+        list: (item_id, rank) tuples, higher rank is better
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+
+    backend, terms = _backend(query)
+    if backend == 'postgresql':
+        return _search_postgresql(query, limit, category_id)
+    if backend == 'sqlite':
+        return _search_sqlite(terms, limit, category_id)
+    return _search_scan(query, limit, category_id)
+
+
+def count_item_matches(query, category_id=None):
+    """
+    Number of items matching a search string
+
+    Uses the same matching rules as search_item_ids() without its limit.
+    """
+    query = (query or '').strip()
+    if not query:
+        return 0
+
+    backend, terms = _backend(query)
+    if backend == 'postgresql':
+        statement = _postgresql_matches(query, category_id)
+    elif backend == 'sqlite':
+        sql = """
+            SELECT count(*)
+            FROM items_fts
+            {join}
+            WHERE items_fts MATCH :match {category}
+        """.format(**_sqlite_clauses(category_id))
+        return db.session.execute(
+            text(sql), {'match': _sqlite_match(terms), 'category_id': category_id}
+        ).scalar()
+    else:
+        statement = _scan_matches(query, category_id)
+    return statement.with_entities(func.count(Item.item_id)).scalar()
+
+
+def _backend(query):
+    """
+    Which search path serves a query, and its index-searchable terms
+
+    Returns:
+        tuple: ('postgresql' | 'sqlite' | 'scan', terms)
+    """
+    dialect = db.session.get_bind().dialect.name
+    terms = [t for t in _TERM.findall(query) if len(t) >= MIN_TRIGRAM_LENGTH]
+    if terms and dialect in ('postgresql', 'sqlite') and _ready(dialect):
+        return dialect, terms
+    return 'scan', terms
+
+
+def _ready(dialect):
+    """Whether the search indexes from the migration exist (checked once)"""
+    if dialect not in _backend_ready:
+        if dialect == 'postgresql':
+            sql = "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+        elif dialect == 'sqlite':
+            sql = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+        else:
+            _backend_ready[dialect] = False
+            return False
+        _backend_ready[dialect] = db.session.execute(text(sql)).first() is not None
+    return _backend_ready[dialect]
+
+
+def _postgresql_matches(query, category_id):
+    """Items matching a trigram search (uses the gin_trgm_ops indexes)"""
+    pattern = f'%{_escape_like(query)}%'
+    statement = db.session.query(Item.item_id).filter(or_(
+        Item.item_name.ilike(pattern, escape='\\'),
+        Item.item_code.ilike(pattern, escape='\\'),
+        Item.item_name.op('%')(query),
+    ))
+    if category_id:
+        statement = statement.filter(Item.category_id == category_id)
+    return statement
+
+
+def _search_postgresql(query, limit, category_id):
+    """Trigram match ranked by word similarity"""
+    rank = func.greatest(
+        func.word_similarity(query, Item.item_name),
+        func.word_similarity(query, Item.item_code)
+    ).label('rank')
+
+    statement = _postgresql_matches(query, category_id).add_columns(rank)
+    return [
+        (row.item_id, float(row.rank))
+        for row in statement.order_by(rank.desc(), Item.item_id).limit(limit)
+    ]
+
+
+def _sqlite_match(terms):
+    """FTS5 query requiring every term as a quoted string"""
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _sqlite_clauses(category_id):
+    return {
+        'join': 'JOIN items ON items.item_id = items_fts.rowid' if category_id else '',
+        'category': 'AND items.category_id = :category_id' if category_id else '',
+    }
+
+
+def _search_sqlite(terms, limit, category_id):
+    """FTS5 trigram MATCH of every term, ranked by bm25"""
+    sql = """
+        SELECT items_fts.rowid AS item_id, -bm25(items_fts) AS rank
+        FROM items_fts
+        {join}
+        WHERE items_fts MATCH :match {category}
+        ORDER BY bm25(items_fts), items_fts.rowid
+        LIMIT :limit
+    """.format(**_sqlite_clauses(category_id))
+    rows = db.session.execute(
+        text(sql), {'match': _sqlite_match(terms), 'limit': limit, 'category_id': category_id}
+    )
+    return [(row.item_id, row.rank) for row in rows]
+
+
+def _scan_matches(query, category_id):
+    """Items matching an unindexed substring search"""
+    pattern = f'%{_escape_like(query)}%'
+    statement = db.session.query(Item.item_id).filter(
+        Item.item_name.ilike(pattern, escape='\\') | Item.item_code.ilike(pattern, escape='\\')
+    )
+    if category_id:
+        statement = statement.filter(Item.category_id == category_id)
+    return statement
+
+
+def _search_scan(query, limit, category_id):
+    """Unindexed substring match, ordered by name"""
+    statement = _scan_matches(query, category_id).add_columns(literal(0.0).label('rank'))
+    return [
+        (row.item_id, row.rank)
+        for row in statement.order_by(Item.item_name, Item.item_id).limit(limit)
+    ]
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,253 @@
+"""
+Stock Snapshots
+Answers "what was the stock of every item at the end of day X" without
+replaying the ledger. Daily checkpoints in stock_snapshots record each
+item's closing stock and unit price; an as-of query starts from the
+checkpoint nearest to X (an earlier or later snapshot, or the live items
+table) and applies only the signed daily rollup totals between the two
+days.
+
+Items are created with an opening stock that has no ledger row, so the
+ledger alone cannot rebuild history: snapshots are always taken
+backwards from live stock, which is exact.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, func, case, literal
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.category import Category
+from invent_app.models.denormalized.daily_rollup import TransactionDailyRollup
+from invent_app.models.denormalized.stock_snapshot import StockSnapshot
+from invent_app.services import reference_cache
+from invent_app.services.transaction_service import STOCK_DIRECTION
+
+
+Rollup = TransactionDailyRollup
+
+
+class StockPosition(namedtuple('StockPosition', [
+    'item_id', 'item_code', 'item_name', 'category_id', 'category_name',
+    'reorder_level', 'unit_price', 'current_stock'
+])):
+    """An item's stock at the end of a past day (read-only)"""
+    __slots__ = ()
+
+    @property
+    def is_low_stock(self):
+        return self.current_stock <= self.reorder_level
+
+    @property
+    def is_out_of_stock(self):
+        return self.current_stock == 0
+
+    @property
+    def stock_value(self):
+        return float(self.current_stock * self.unit_price)
+
+
+# SNAPSHOTS
+
+def take_snapshot(snapshot_date=None):
+    """
+    Write the closing stock of every item for a day
+
+    Computed as live stock minus the movements after that day, so past
+    days can be backfilled as long as the rollup covers them. Taking a
+    day again replaces it.
+
+    Args:
+        snapshot_date: Day to record (defaults to yesterday, UTC)
+
+    Returns:
+        int: Number of item rows written
+    """
+    if snapshot_date is None:
+        snapshot_date = datetime.utcnow().date() - timedelta(days=1)
+
+    net = _net_movement(after=snapshot_date)
+    source = select(
+        literal(snapshot_date, type_=StockSnapshot.snapshot_date.type),
+        Item.item_id,
+        Item.current_stock - func.coalesce(net.c.net, 0),
+        Item.unit_price
+    ).outerjoin(net, net.c.item_id == Item.item_id)\
+     .where(Item.created_at < _day_end(snapshot_date))
+
+    db.session.execute(delete(StockSnapshot).where(StockSnapshot.snapshot_date == snapshot_date))
+    db.session.execute(
+        insert(StockSnapshot).from_select(
+            ['snapshot_date', 'item_id', 'quantity', 'unit_price'], source
+        )
+    )
+    db.session.commit()
+
+    return db.session.query(func.count())\
+        .select_from(StockSnapshot)\
+        .filter(StockSnapshot.snapshot_date == snapshot_date)\
+        .scalar()
+
+
+def prune_snapshots(keep_days):
+    """Delete snapshots older than keep_days, returning the rows removed"""
+    cutoff = datetime.utcnow().date() - timedelta(days=keep_days)
+    removed = db.session.execute(
+        delete(StockSnapshot).where(StockSnapshot.snapshot_date < cutoff)
+    ).rowcount
+    db.session.commit()
+    return removed
+
+
+# AS-OF QUERIES
+
+def stock_as_of(as_of, category_id=None):
+    """
+    Stock of every item that existed at the end of a day
+
+    Args:
+        as_of: date to report on
+        category_id: Only return items in this category
+
+    Returns:
+        list: StockPosition rows, in item_id order
+    """
+    today = datetime.utcnow().date()
+    if as_of >= today:
+        return _positions(None, None, category_id)
+
+    before, after = _checkpoints(as_of)
+    candidates = [((today - as_of).days, None)]
+    if before:
+        candidates.append(((as_of - before).days, before))
+    if after:
+        candidates.append(((after - as_of).days, after))
+    checkpoint = min(candidates, key=lambda candidate: candidate[0])[1]
+
+    positions = _positions(checkpoint, as_of, category_id)
+    if checkpoint is not None and checkpoint < as_of:
+        # Items created after the snapshot was taken: work back from live
+        positions += _positions(None, as_of, category_id, created_after=checkpoint)
+        positions.sort(key=lambda position: position.item_id)
+    return positions
+
+
+def _checkpoints(as_of):
+    """Nearest snapshot days on or before, and after, a day"""
+    before = db.session.query(func.max(StockSnapshot.snapshot_date))\
+        .filter(StockSnapshot.snapshot_date <= as_of)\
+        .scalar()
+    after = db.session.query(func.min(StockSnapshot.snapshot_date))\
+        .filter(StockSnapshot.snapshot_date > as_of)\
+        .scalar()
+    return before, after
+
+
+def _positions(checkpoint, as_of, category_id, created_after=None):
+    """
+    Stock at the end of as_of, starting from a checkpoint
+
+    Args:
+        checkpoint: Snapshot day, or None for the live items table
+        as_of: Day reported on (None for live stock as is)
+        category_id: Optional category filter
+        created_after: Only items created after the end of this day
+    """
+    if checkpoint is None:
+        base_stock, base_price = Item.current_stock, Item.unit_price
+    else:
+        base_stock, base_price = StockSnapshot.quantity, StockSnapshot.unit_price
+
+    # Forward from an earlier snapshot, backwards from a later one or live
+    if as_of is None:
+        net, sign = None, 0
+    elif checkpoint is not None and checkpoint <= as_of:
+        net, sign = _net_movement(after=checkpoint, through=as_of), 1
+    else:
+        net, sign = _net_movement(after=as_of, through=checkpoint), -1
+
+    stock = base_stock
+    if net is not None:
+        stock = base_stock + sign * func.coalesce(net.c.net, 0)
+
+    query = db.session.query(
+        Item.item_id,
+        Item.item_code,
+        Item.item_name,
+        Item.category_id,
+        Category.category_name,
+        Item.reorder_level,
+        base_price.label('unit_price'),
+        stock.label('current_stock')
+    )
+    if checkpoint is not None:
+        query = query.select_from(StockSnapshot)\
+            .join(Item, Item.item_id == StockSnapshot.item_id)\
+            .filter(StockSnapshot.snapshot_date == checkpoint)
+    query = query.join(Category, Item.category_id == Category.category_id)
+    if net is not None:
+        query = query.outerjoin(net, net.c.item_id == Item.item_id)
+
+    if as_of is not None:
+        query = query.filter(Item.created_at < _day_end(as_of))
+    if created_after is not None:
+        query = query.filter(Item.created_at >= _day_end(created_after))
+    if category_id:
+        query = query.filter(Item.category_id == category_id)
+
+    return [StockPosition(*row) for row in query.order_by(Item.item_id)]
+
+
+def valuation_as_of(as_of, top=10):
+    """
+    Inventory value by category and the most valuable items at a day end
+
+    Ordered as the live report: categories and items by value, highest
+    first, categories with equal value by name.
+
+    Returns:
+        tuple: (category value dicts, top item dicts)
+    """
+    categories, items = {}, []
+    for position in stock_as_of(as_of):
+        value = position.stock_value
+        entry = categories.setdefault(
+            position.category_id, {'category_name': position.category_name, 'value': 0.0}
+        )
+        entry['value'] += value
+        items.append({
+            'item_name': position.item_name,
+            'current_stock': position.current_stock,
+            'unit_price': float(position.unit_price),
+            'total_value': value
+        })
+
+    category_values = sorted(categories.values(), key=lambda c: (-c['value'], c['category_name']))
+    top_items = sorted(items, key=lambda item: item['total_value'], reverse=True)[:top]
+    return category_values, top_items
+
+
+# HELPER FUNCTIONS
+
+def _net_movement(after=None, through=None):
+    """Signed rollup quantity per item for after < day <= through"""
+    type_ids = reference_cache.transaction_type_ids()
+    directions = {
+        type_ids[name]: sign for name, sign in STOCK_DIRECTION.items() if name in type_ids
+    }
+    if directions:
+        signed = case(directions, value=Rollup.type_id, else_=0) * Rollup.quantity
+    else:
+        signed = literal(0)
+
+    query = select(Rollup.item_id, func.sum(signed).label('net'))
+    if after is not None:
+        query = query.where(Rollup.rollup_date > after)
+    if through is not None:
+        query = query.where(Rollup.rollup_date <= through)
+    return query.group_by(Rollup.item_id).subquery()
+
+
+def _day_end(day):
+    """Start of the following day, as a datetime bound"""
+    return datetime.combine(day + timedelta(days=1), datetime.min.time())
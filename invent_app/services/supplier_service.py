@@ -0,0 +1,132 @@
+"""
+Supplier Performance
+STOCK_IN totals and items supplied per supplier. Totals come from the
+supplier_stats table, updated in the same transaction as every STOCK_IN,
+or (with SUPPLIER_STATS_ENABLED off) from pre-aggregated ledger
+subqueries. Items and receipts are aggregated separately and joined
+once, never multiplied against each other.
+
+supplier_stats goes stale while the flag is off; re-enabling it needs a
+rebuild() (flask rebuild-supplier-stats) first.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import select, insert, delete, func
+from invent_app import db
+from invent_app.database.upsert import additive_upsert
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.denormalized.supplier_stats import SupplierStats
+from invent_app.services import reference_cache
+
+
+COUNTER_COLUMNS = ('transaction_count', 'total_quantity', 'total_value')
+
+
+def stats_enabled():
+    """True when supplier_stats is maintained and read"""
+    return current_app.config['SUPPLIER_STATS_ENABLED']
+
+
+# MAINTENANCE
+
+def apply_movements(ledger_rows):
+    """Add STOCK_IN ledger rows with a supplier to supplier_stats"""
+    if not stats_enabled():
+        return
+
+    stock_in_id = reference_cache.transaction_type_ids().get('STOCK_IN')
+    totals = defaultdict(lambda: [0, 0, Decimal(0)])
+    for row in ledger_rows:
+        if row['type_id'] != stock_in_id or row['supplier_id'] is None:
+            continue
+        bucket = totals[row['supplier_id']]
+        bucket[0] += 1
+        bucket[1] += row['quantity']
+        bucket[2] += Decimal(row['quantity']) * Decimal(str(row['unit_price'] or 0))
+
+    if not totals:
+        return
+
+    db.session.execute(
+        additive_upsert(SupplierStats.__table__, ('supplier_id',), COUNTER_COLUMNS),
+        [
+            {
+                'supplier_id': supplier_id,
+                'transaction_count': count,
+                'total_quantity': quantity,
+                'total_value': value,
+            }
+            for supplier_id, (count, quantity, value) in sorted(totals.items())
+        ]
+    )
+
+
+def _stock_in_totals():
+    """STOCK_IN count, quantity and value per supplier from the ledger"""
+    stock_in_id = reference_cache.transaction_type_ids().get('STOCK_IN')
+    return select(
+        Transaction.supplier_id,
+        func.count(Transaction.transaction_id).label('transaction_count'),
+        func.sum(Transaction.quantity).label('total_quantity'),
+        func.sum(Transaction.quantity * func.coalesce(Transaction.unit_price, 0)).label('total_value')
+    ).where(
+        Transaction.type_id == stock_in_id,
+        Transaction.supplier_id.isnot(None)
+    ).group_by(Transaction.supplier_id)
+
+
+def rebuild():
+    """
+    Recompute supplier_stats from the ledger
+
+    Returns:
+        int: Number of suppliers written
+    """
+    db.session.execute(delete(SupplierStats))
+    db.session.execute(
+        insert(SupplierStats).from_select(
+            ['supplier_id', 'transaction_count', 'total_quantity', 'total_value'],
+            _stock_in_totals()
+        )
+    )
+    db.session.commit()
+    return db.session.query(SupplierStats).count()
+
+
+# REPORT
+
+def performance():
+    """
+    One row per supplier, highest STOCK_IN value first
+
+    Returns:
+        list: rows of supplier_name, items_supplied, transaction_count,
+        total_quantity, total_value
+    """
+    items = select(
+        Item.supplier_id,
+        func.count(Item.item_id).label('items_supplied')
+    ).where(Item.supplier_id.isnot(None))\
+     .group_by(Item.supplier_id)\
+     .subquery()
+
+    if stats_enabled():
+        receipts = select(SupplierStats).subquery()
+    else:
+        receipts = _stock_in_totals().subquery()
+
+    total_value = func.coalesce(receipts.c.total_value, 0)
+    return db.session.query(
+        Supplier.supplier_name,
+        func.coalesce(items.c.items_supplied, 0).label('items_supplied'),
+        func.coalesce(receipts.c.transaction_count, 0).label('transaction_count'),
+        func.coalesce(receipts.c.total_quantity, 0).label('total_quantity'),
+        total_value.label('total_value')
+    ).outerjoin(items, items.c.supplier_id == Supplier.supplier_id)\
+     .outerjoin(receipts, receipts.c.supplier_id == Supplier.supplier_id)\
+     .order_by(total_value.desc(), Supplier.supplier_name)\
+     .all()
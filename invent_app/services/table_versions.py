@@ -0,0 +1,124 @@
+"""
+Table Write Versions
+Every flush that touches a tracked table bumps its counter in
+table_versions inside the same database transaction. In-process caches
+compare the counters they were built from against the shared ones, which
+keeps them correct across gunicorn workers for the price of one primary
+key read per request.
+
+Stock movements never bump a shared counter (one row updated by every
+writer would serialise them). Readers see them through the ledger
+watermark instead: the 'transactions' entry of current_versions() pairs
+the shared counter with max(transaction_id), read in the same statement.
+"""
+
+from itertools import chain
+from flask import g, has_request_context
+from sqlalchemy import event, select, literal, func
+from sqlalchemy.orm import Session
+from invent_app import db
+from invent_app.database.upsert import additive_upsert
+from invent_app.models.table_version import TableVersion
+from invent_app.models.normalized.transaction import Transaction
+
+
+# Tables whose ORM writes bump a version
+TRACKED_TABLES = {'transaction_types', 'categories', 'suppliers', 'locations', 'items', 'transactions'}
+
+# Pseudo table name of the ledger watermark row in current_versions()
+LEDGER_WATERMARK = '_ledger_watermark'
+
+# Callbacks run after a commit with the set of tables that changed
+_commit_listeners = []
+
+
+def on_commit(listener):
+    """Register a callback receiving the tables changed by each commit"""
+    _commit_listeners.append(listener)
+    return listener
+
+
+def current_versions():
+    """
+    Get the shared version of every tracked table
+
+    'transactions' maps to (shared version, ledger watermark), so stock
+    movements show up without writing the shared row. Read once per
+    request and reused for the rest of it.
+    """
+    if has_request_context() and 'table_versions' in g:
+        return g.table_versions
+
+    watermark = select(
+        literal(LEDGER_WATERMARK),
+        func.coalesce(func.max(Transaction.transaction_id), 0)
+    )
+    versions = dict(db.session.execute(
+        select(TableVersion.table_name, TableVersion.version).union_all(watermark)
+    ).all())
+    versions['transactions'] = (versions.get('transactions', 0), versions.pop(LEDGER_WATERMARK, 0))
+
+    if has_request_context():
+        g.table_versions = versions
+    return versions
+
+
+def bump(connection, tables):
+    """
+    Increment the version of each table on the given connection
+
+    An additive upsert, so the first writers of a table missing from
+    table_versions cannot race each other into a duplicate key.
+    """
+    if not tables:
+        return
+    connection.execute(
+        additive_upsert(TableVersion.__table__, ('table_name',), ('version',)),
+        [{'table_name': table_name, 'version': 1} for table_name in sorted(tables)]
+    )
+
+
+def note_local_change(session, tables):
+    """
+    Tell this process's commit listeners about a write without bumping
+    the shared counters (used for high-rate stock movements)
+    """
+    session.info.setdefault('changed_tables', set()).update(tables)
+
+
+def mark_changed(session, tables):
+    """Bump versions for writes made outside the ORM unit of work"""
+    tables = set(tables) & TRACKED_TABLES
+    if tables:
+        bump(session.connection(), tables)
+        session.info.setdefault('changed_tables', set()).update(tables)
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    """Bump the version of every tracked table touched by this flush"""
+    tables = {
+        obj.__tablename__
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if getattr(obj, '__tablename__', None) in TRACKED_TABLES
+    }
+    mark_changed(session, tables)
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_commit_listeners(session):
+    """Let local caches drop entries as soon as our own commit lands"""
+    tables = session.info.pop('changed_tables', None)
+    if not tables:
+        return
+
+    if has_request_context():
+        g.pop('table_versions', None)
+    for listener in _commit_listeners:
+        listener(tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_tables(session):
+    """Forget bumps that were rolled back"""
+    session.info.pop('changed_tables', None)
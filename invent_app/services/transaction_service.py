@@ -0,0 +1,482 @@
+"""
+Stock Mutation Engine
+Moves stock with a single conditional UPDATE and records the ledger row
+in the same database transaction, so concurrent movements never lose
+updates and never trip check_stock_positive.
+"""
+
+from collections import namedtuple, defaultdict
+from datetime import datetime
+from decimal import Decimal
+from itertools import chain
+from sqlalchemy import (
+    event, select, update, insert, literal, values, column, bindparam, Integer
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.services import (
+    reference_cache, table_versions, rollup_service, read_model_sync, valuation_service,
+    supplier_service, alert_service
+)
+
+
+# Direction of the stock change for each transaction type
+STOCK_DIRECTION = {
+    'STOCK_IN': 1,
+    'STOCK_OUT': -1,
+    'RETURN': 1,
+}
+
+# Columns written for every ledger row, in insert order
+LEDGER_COLUMNS = [
+    'item_id', 'type_id', 'quantity', 'unit_price', 'supplier_id',
+    'reference_number', 'notes', 'transaction_date', 'created_by'
+]
+
+# Optional free-text movement fields
+TEXT_FIELDS = ('reference_number', 'notes', 'created_by')
+
+# Tables written by every movement
+MOVEMENT_TABLES = {'items', 'transactions'}
+
+# Upper bound on bound parameters per statement in the bulk path
+BULK_CHUNK_SIZE = 5000
+
+MovementResult = namedtuple('MovementResult', ['transaction_id', 'item_id', 'current_stock'])
+
+
+class StockError(Exception):
+    """Base class for stock movement failures"""
+
+
+class UnknownItemError(StockError):
+    """Raised when the target item does not exist"""
+
+    def __init__(self, item_id):
+        self.item_id = item_id
+        super().__init__(f'Item {item_id} not found')
+
+
+class InsufficientStockError(StockError):
+    """Raised when a stock out would take the item below zero"""
+
+    def __init__(self, item_id, requested, available):
+        self.item_id = item_id
+        self.requested = requested
+        self.available = available
+        super().__init__(f'Insufficient stock. Available: {available}')
+
+
+class LedgerWriteError(Exception):
+    """Raised when a ledger row is added, changed or deleted through the ORM"""
+
+
+def get_type_id(type_name):
+    """
+    Resolve a transaction type name to its id
+
+    Raises:
+        StockError: if the type is not seeded
+    """
+    type_id = get_type_ids().get(type_name)
+
+    if type_id is None:
+        raise StockError(f'Transaction type {type_name} not found')
+    return type_id
+
+
+def get_type_ids():
+    """Map every transaction type name to its id"""
+    return reference_cache.transaction_type_ids()
+
+
+def record_movement(item_id, type_name, quantity, unit_price=None, supplier_id=None,
+                    reference_number=None, notes=None, created_by=None, commit=True):
+    """
+    Apply a stock movement and write its ledger row
+
+    The stock change is a single ``UPDATE ... WHERE current_stock >= :q``
+    so the database serialises concurrent movements on the same row. On
+    PostgreSQL the UPDATE and the INSERT are sent as one statement.
+
+    Args:
+        item_id: Item to move
+        type_name: 'STOCK_IN', 'STOCK_OUT' or 'RETURN'
+        quantity: Positive number of units
+        commit: Commit the session when done (False lets callers batch)
+
+    Returns:
+        MovementResult: new transaction id and resulting stock level
+
+    Raises:
+        UnknownItemError, InsufficientStockError, StockError
+    """
+    error = _validate_movement(
+        {
+            'item_id': item_id, 'type': type_name, 'quantity': quantity,
+            'unit_price': unit_price, 'supplier_id': supplier_id,
+            'reference_number': reference_number, 'notes': notes, 'created_by': created_by
+        },
+        get_type_ids(),
+        reference_cache.supplier_ids()
+    )
+    if error:
+        raise StockError(error)
+
+    ledger_values = {
+        'item_id': item_id,
+        'type_id': get_type_id(type_name),
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'supplier_id': supplier_id,
+        'reference_number': reference_number,
+        'notes': notes,
+        'transaction_date': datetime.utcnow(),
+        'created_by': created_by,
+    }
+    delta = quantity * STOCK_DIRECTION[type_name]
+
+    dialect = db.session.get_bind().dialect
+    try:
+        if dialect.name == 'postgresql':
+            result = _move_single_statement(ledger_values, delta)
+        elif dialect.update_returning:
+            result = _move_returning(ledger_values, delta)
+        else:
+            result = _move_rowcount(ledger_values, delta)
+
+        if result is None:
+            _raise_for_failed_move(item_id, quantity)
+
+        _maintain_aggregates([ledger_values], [result.transaction_id], {item_id: delta})
+    except IntegrityError:
+        # e.g. the supplier was deleted after the check above
+        db.session.rollback()
+        raise StockError('Movement rejected by a database constraint')
+    table_versions.note_local_change(db.session, MOVEMENT_TABLES)
+    if commit:
+        db.session.commit()
+    return result
+
+
+def _stock_update(item_id, delta):
+    """Conditional UPDATE that refuses to take stock below zero"""
+    stmt = update(Item).where(Item.item_id == item_id)
+    if delta < 0:
+        stmt = stmt.where(Item.current_stock >= -delta)
+    return stmt.values(
+        current_stock=Item.current_stock + delta,
+        updated_at=datetime.utcnow()
+    )
+
+
+def _move_single_statement(ledger_values, delta):
+    """PostgreSQL: UPDATE and INSERT in one round trip via data-modifying CTEs"""
+    moved = _stock_update(ledger_values['item_id'], delta)\
+        .returning(Item.item_id, Item.current_stock)\
+        .cte('moved')
+
+    ledger_select = select(
+        moved.c.item_id,
+        *[
+            literal(ledger_values[name], Transaction.__table__.c[name].type)
+            for name in LEDGER_COLUMNS[1:]
+        ]
+    )
+    inserted = insert(Transaction)\
+        .from_select(LEDGER_COLUMNS, ledger_select)\
+        .returning(Transaction.transaction_id)\
+        .cte('inserted')
+
+    row = db.session.execute(
+        select(inserted.c.transaction_id, moved.c.item_id, moved.c.current_stock)
+    ).first()
+    return MovementResult(*row) if row else None
+
+
+def _move_returning(ledger_values, delta):
+    """Dialects with UPDATE ... RETURNING (SQLite 3.35+, MariaDB)"""
+    row = db.session.execute(
+        _stock_update(ledger_values['item_id'], delta)
+        .returning(Item.current_stock)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        return None
+
+    transaction_id = db.session.execute(
+        insert(Transaction).values(**ledger_values).returning(Transaction.transaction_id)
+    ).scalar()
+    return MovementResult(transaction_id, ledger_values['item_id'], row.current_stock)
+
+
+def _move_rowcount(ledger_values, delta):
+    """Fallback for dialects without UPDATE ... RETURNING"""
+    updated = db.session.execute(
+        _stock_update(ledger_values['item_id'], delta)
+        .execution_options(synchronize_session=False)
+    )
+    if updated.rowcount != 1:
+        return None
+
+    inserted = db.session.execute(insert(Transaction).values(**ledger_values))
+    current_stock = db.session.query(Item.current_stock)\
+        .filter(Item.item_id == ledger_values['item_id']).scalar()
+    return MovementResult(inserted.inserted_primary_key[0], ledger_values['item_id'], current_stock)
+
+
+def _maintain_aggregates(ledger_rows, transaction_ids, stock_deltas):
+    """
+    Update summary tables in the same transaction as the ledger rows
+
+    Args:
+        ledger_rows: Ledger row dicts just written
+        transaction_ids: Ids of those rows
+        stock_deltas: Net stock change per item_id
+    """
+    rollup_service.apply_movements(ledger_rows)
+    read_model_sync.apply_movements(transaction_ids, stock_deltas.keys())
+    valuation_service.apply_stock_deltas(stock_deltas)
+    supplier_service.apply_movements(ledger_rows)
+    alert_service.apply_stock_deltas(stock_deltas)
+
+
+def _raise_for_failed_move(item_id, quantity):
+    """Work out why the conditional UPDATE matched no row"""
+    available = db.session.query(Item.current_stock)\
+        .filter(Item.item_id == item_id).scalar()
+
+    if available is None:
+        raise UnknownItemError(item_id)
+    raise InsufficientStockError(item_id, quantity, available)
+
+
+def record_movements(movements, atomic=False, commit=True):
+    """
+    Apply a batch of stock movements with set-based SQL
+
+    Movements are validated together, the touched items are locked once
+    (in item_id order, so concurrent batches cannot deadlock), every line
+    is checked against the running stock level, and the accepted lines
+    are written with one UPDATE per chunk of items and one bulk
+    INSERT ... RETURNING for the ledger.
+
+    Args:
+        movements: List of dicts with item_id, type, quantity and the
+            optional unit_price, supplier_id, reference_number, notes,
+            created_by keys
+        atomic: Apply nothing if any line is rejected
+        commit: Commit the session when done
+
+    Returns:
+        list: One result dict per input line, in input order
+
+    Raises:
+        StockError: if a concurrent writer took stock below zero
+    """
+    type_ids = get_type_ids()
+    supplier_ids = reference_cache.supplier_ids()
+    results = [None] * len(movements)
+    pending = []
+
+    for index, movement in enumerate(movements):
+        error = _validate_movement(movement, type_ids, supplier_ids)
+        if error:
+            results[index] = {'line': index + 1, 'status': 'error', 'error': error}
+        else:
+            pending.append((index, movement))
+
+    stock = _lock_stock_levels(sorted({m['item_id'] for _, m in pending}))
+    now = datetime.utcnow()
+    deltas = defaultdict(int)
+    ledger_rows = []
+
+    for index, movement in pending:
+        item_id = movement['item_id']
+        quantity = movement['quantity']
+        delta = quantity * STOCK_DIRECTION[movement['type']]
+
+        if item_id not in stock:
+            error = str(UnknownItemError(item_id))
+        elif stock[item_id] + delta < 0:
+            error = str(InsufficientStockError(item_id, quantity, stock[item_id]))
+        else:
+            error = None
+
+        if error:
+            results[index] = {'line': index + 1, 'status': 'error', 'error': error}
+            continue
+
+        stock[item_id] += delta
+        deltas[item_id] += delta
+        ledger_rows.append({
+            'item_id': item_id,
+            'type_id': type_ids[movement['type']],
+            'quantity': quantity,
+            'unit_price': movement.get('unit_price'),
+            'supplier_id': movement.get('supplier_id'),
+            'reference_number': movement.get('reference_number'),
+            'notes': movement.get('notes'),
+            'transaction_date': now,
+            'created_by': movement.get('created_by'),
+        })
+        results[index] = {
+            'line': index + 1,
+            'status': 'ok',
+            'item_id': item_id,
+            'current_stock': stock[item_id]
+        }
+
+    if atomic and len(ledger_rows) != len(movements):
+        for result in results:
+            if result['status'] == 'ok':
+                result.update(status='skipped')
+                del result['current_stock']
+        return results
+
+    try:
+        _apply_stock_deltas(deltas, now)
+        transaction_ids = _insert_ledger_rows(ledger_rows)
+        _maintain_aggregates(ledger_rows, transaction_ids, deltas)
+    except IntegrityError:
+        db.session.rollback()
+        raise StockError('Stock changed concurrently, please retry the batch')
+
+    if ledger_rows:
+        table_versions.note_local_change(db.session, MOVEMENT_TABLES)
+    if commit:
+        db.session.commit()
+    return results
+
+
+def _is_int(value):
+    """True for ints, but not for JSON true/false"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _validate_movement(movement, type_ids, supplier_ids):
+    """Return an error message for a malformed movement, or None"""
+    if not isinstance(movement, dict):
+        return 'Movement must be a JSON object'
+    if not _is_int(movement.get('item_id')):
+        return 'item_id must be an integer'
+    if movement.get('type') not in STOCK_DIRECTION:
+        return f"Unsupported transaction type {movement.get('type')}"
+    if movement['type'] not in type_ids:
+        return f"Transaction type {movement['type']} not found"
+
+    quantity = movement.get('quantity')
+    if not _is_int(quantity) or quantity <= 0:
+        return 'Quantity must be at least 1'
+
+    unit_price = movement.get('unit_price')
+    if unit_price is not None and (
+        isinstance(unit_price, bool) or not isinstance(unit_price, (int, float, Decimal))
+        or unit_price < 0
+    ):
+        return 'Price cannot be negative'
+
+    supplier_id = movement.get('supplier_id')
+    if supplier_id is not None and not _is_int(supplier_id):
+        return 'supplier_id must be an integer'
+    if supplier_id is not None and supplier_id not in supplier_ids:
+        return f'Supplier {supplier_id} not found'
+
+    for name in TEXT_FIELDS:
+        if movement.get(name) is not None and not isinstance(movement[name], str):
+            return f'{name} must be a string'
+    if len(movement.get('reference_number') or '') > 100:
+        return 'Reference number must be less than 100 characters'
+    if len(movement.get('created_by') or '') > 100:
+        return 'created_by must be less than 100 characters'
+    return None
+
+
+def _lock_stock_levels(item_ids):
+    """Read (and on PostgreSQL lock) current stock for the given items"""
+    stock = {}
+    for start in range(0, len(item_ids), BULK_CHUNK_SIZE):
+        chunk = item_ids[start:start + BULK_CHUNK_SIZE]
+        rows = db.session.execute(
+            select(Item.item_id, Item.current_stock)
+            .where(Item.item_id.in_(chunk))
+            .order_by(Item.item_id)
+            .with_for_update()
+        )
+        stock.update((row.item_id, row.current_stock) for row in rows)
+    return stock
+
+
+def _apply_stock_deltas(deltas, now):
+    """Add the net delta per item with one statement per chunk"""
+    items = Item.__table__
+    changed = [(item_id, delta) for item_id, delta in sorted(deltas.items()) if delta]
+    if not changed:
+        return
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # UPDATE items SET ... FROM (VALUES ...) AS v(item_id, delta)
+        for start in range(0, len(changed), BULK_CHUNK_SIZE):
+            batch = values(
+                column('item_id', Integer), column('delta', Integer), name='v'
+            ).data(changed[start:start + BULK_CHUNK_SIZE])
+            db.session.execute(
+                update(items)
+                .where(items.c.item_id == batch.c.item_id)
+                .values(current_stock=items.c.current_stock + batch.c.delta, updated_at=now)
+            )
+        return
+
+    db.session.execute(
+        update(items)
+        .where(items.c.item_id == bindparam('target_id'))
+        .values(current_stock=items.c.current_stock + bindparam('delta'), updated_at=now),
+        [{'target_id': item_id, 'delta': delta} for item_id, delta in changed]
+    )
+
+
+def _insert_ledger_rows(ledger_rows):
+    """
+    Bulk-insert ledger rows
+
+    Returns:
+        list: New transaction ids, in ledger_rows order
+    """
+    if not ledger_rows:
+        return []
+
+    ledger = Transaction.__table__
+    if db.session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        # Batched multi-row INSERT ... RETURNING (PostgreSQL, SQLite 3.35+)
+        return db.session.execute(
+            insert(ledger).returning(ledger.c.transaction_id, sort_by_parameter_order=True),
+            ledger_rows
+        ).scalars().all()
+
+    return [
+        db.session.execute(insert(ledger).values(**row)).inserted_primary_key[0]
+        for row in ledger_rows
+    ]
+
+
+@event.listens_for(Session, 'before_flush')
+def _reject_orm_ledger_writes(session, flush_context, instances):
+    """
+    Keep the ledger writable only through record_movement(s)
+
+    Stock levels, the daily rollup, valuation, supplier stats, stock
+    alerts and the read models are all maintained by the movement path;
+    a Transaction flushed through the ORM would skip every one of them.
+    """
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Transaction):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        raise LedgerWriteError(
+            'Ledger rows are written by transaction_service.record_movement(s), '
+            'not through the ORM'
+        )
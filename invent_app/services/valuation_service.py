@@ -0,0 +1,268 @@
+"""
+Inventory Valuation
+Keeps category_valuation (item count, stock units and stock value per
+category) current by applying deltas in the same transaction as every
+stock movement and item write, so valuation reads cost one row per
+category instead of a scan of items.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import event, select, insert, delete, func, inspect
+from sqlalchemy.orm import Session, object_session
+from invent_app import db
+from invent_app.database.upsert import additive_upsert
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.category import Category
+from invent_app.models.denormalized.category_valuation import CategoryValuation
+
+
+COUNTER_COLUMNS = ('item_count', 'total_stock', 'total_value')
+
+
+def _apply(connection, deltas):
+    """Add {category_id: [items, stock, value]} deltas in category order"""
+    params = [
+        {
+            'category_id': category_id,
+            'item_count': items,
+            'total_stock': stock,
+            'total_value': value,
+        }
+        for category_id, (items, stock, value) in sorted(deltas.items())
+        if items or stock or value
+    ]
+    if params:
+        connection.execute(
+            additive_upsert(CategoryValuation.__table__, ('category_id',), COUNTER_COLUMNS),
+            params
+        )
+
+
+def _new_deltas():
+    return defaultdict(lambda: [0, 0, Decimal(0)])
+
+
+# STOCK MOVEMENTS
+
+def apply_stock_deltas(stock_deltas):
+    """
+    Add net stock changes ({item_id: units}) to their categories
+
+    Item prices are read after the stock UPDATE, while this transaction
+    holds the item row locks, so a concurrent price edit cannot slip in
+    between.
+    """
+    item_ids = sorted(item_id for item_id, delta in stock_deltas.items() if delta)
+    if not item_ids:
+        return
+
+    deltas = _new_deltas()
+    rows = db.session.execute(
+        select(Item.item_id, Item.category_id, Item.unit_price).where(Item.item_id.in_(item_ids))
+    )
+    for item_id, category_id, unit_price in rows:
+        delta = stock_deltas[item_id]
+        deltas[category_id][1] += delta
+        deltas[category_id][2] += delta * unit_price
+
+    _apply(db.session.connection(), deltas)
+
+
+# ORM WRITES
+
+# Item columns the valuation depends on
+VALUED_ATTRIBUTES = ('category_id', 'current_stock', 'unit_price')
+
+
+def _item_rows(connection, item_ids):
+    """{item_id: (category_id, current_stock, unit_price)} read from the database"""
+    if not item_ids:
+        return {}
+    statement = select(Item.item_id, Item.category_id, Item.current_stock, Item.unit_price)\
+        .where(Item.item_id.in_(sorted(item_ids)))
+    return {row[0]: tuple(row[1:]) for row in connection.execute(statement)}
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    """Registered with active_history, so flush history holds the replaced value"""
+
+
+for _name in VALUED_ATTRIBUTES:
+    event.listen(getattr(Item, _name), 'set', _keep_old_value, active_history=True)
+
+
+def _before_values(obj, after):
+    """
+    Valued columns of a flushed item as they were before the flush
+
+    Columns changed in the flush come from attribute history; the rest
+    are unchanged and equal their flushed values.
+    """
+    state = inspect(obj)
+    values = []
+    for name, current in zip(VALUED_ATTRIBUTES, after):
+        history = state.attrs[name].history
+        values.append(history.deleted[0] if history.deleted else current)
+    return values
+
+
+@event.listens_for(Item, 'before_delete')
+def _capture_deleted_item(mapper, connection, target):
+    """Remember the row of an item just before its DELETE"""
+    row = connection.execute(
+        select(Item.category_id, Item.current_stock, Item.unit_price)
+        .where(Item.item_id == target.item_id)
+    ).first()
+    if row is not None:
+        object_session(target).info.setdefault('valuation_removed', []).append(tuple(row))
+
+
+@event.listens_for(Session, 'after_flush')
+def _apply_flushed_items(session, flush_context):
+    """Turn flushed item and category changes into valuation deltas"""
+    connection = session.connection()
+    removed = session.info.pop('valuation_removed', [])
+    deltas = _new_deltas()
+
+    changed = {
+        obj.item_id: obj for obj in session.dirty
+        if isinstance(obj, Item) and obj not in session.deleted
+    }
+    added = {obj.item_id for obj in session.new if isinstance(obj, Item)}
+
+    # Rows as they were, then as they are now (locked by this flush)
+    after = _item_rows(connection, set(changed) | added)
+    before = removed + [
+        _before_values(obj, after[item_id])
+        for item_id, obj in changed.items() if item_id in after
+    ]
+    for category_id, stock, price in before:
+        deltas[category_id][0] -= 1
+        deltas[category_id][1] -= stock
+        deltas[category_id][2] -= stock * Decimal(str(price))
+    for category_id, stock, price in after.values():
+        deltas[category_id][0] += 1
+        deltas[category_id][1] += stock
+        deltas[category_id][2] += stock * price
+
+    for obj in session.deleted:
+        if isinstance(obj, Category):
+            category_id = inspect(obj).identity[0]
+            deltas.pop(category_id, None)
+            connection.execute(
+                delete(CategoryValuation).where(CategoryValuation.category_id == category_id)
+            )
+
+    # Register new categories with zero totals
+    for obj in session.new:
+        if isinstance(obj, Category):
+            connection.execute(
+                additive_upsert(CategoryValuation.__table__, ('category_id',), COUNTER_COLUMNS),
+                [{'category_id': obj.category_id, 'item_count': 0, 'total_stock': 0, 'total_value': 0}]
+            )
+    _apply(connection, deltas)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_captured_rows(session):
+    session.info.pop('valuation_removed', None)
+
+
+# READS
+
+def category_totals():
+    """
+    Per-category totals, largest value first
+
+    Returns:
+        list: rows of category_id, category_name, item_count,
+        total_stock, total_value
+    """
+    return db.session.query(
+        Category.category_id,
+        Category.category_name,
+        func.coalesce(CategoryValuation.item_count, 0).label('item_count'),
+        func.coalesce(CategoryValuation.total_stock, 0).label('total_stock'),
+        func.coalesce(CategoryValuation.total_value, 0).label('total_value')
+    ).outerjoin(CategoryValuation, Category.category_id == CategoryValuation.category_id)\
+     .order_by(func.coalesce(CategoryValuation.total_value, 0).desc(), Category.category_name)\
+     .all()
+
+
+def item_count(category_id=None):
+    """Number of items, overall or for one category"""
+    query = db.session.query(func.sum(CategoryValuation.item_count))
+    if category_id:
+        query = query.filter(CategoryValuation.category_id == category_id)
+    return int(query.scalar() or 0)
+
+
+def total_value(category_id=None):
+    """Inventory value, overall or for one category"""
+    query = db.session.query(func.sum(CategoryValuation.total_value))
+    if category_id:
+        query = query.filter(CategoryValuation.category_id == category_id)
+    return query.scalar() or Decimal(0)
+
+
+# VERIFICATION
+
+def _live_totals():
+    """Totals computed from items, the source of truth"""
+    rows = db.session.query(
+        Category.category_id,
+        func.count(Item.item_id),
+        func.coalesce(func.sum(Item.current_stock), 0),
+        func.coalesce(func.sum(Item.current_stock * Item.unit_price), 0)
+    ).outerjoin(Item, Category.category_id == Item.category_id)\
+     .group_by(Category.category_id)\
+     .all()
+    return {
+        category_id: (int(count), int(stock), Decimal(str(value)).quantize(Decimal('0.01')))
+        for category_id, count, stock, value in rows
+    }
+
+
+def verify():
+    """
+    Compare the summary with a fresh aggregate of items
+
+    Returns:
+        list: (category_id, stored, actual) for every mismatch, where
+        stored/actual are (item_count, total_stock, total_value)
+    """
+    stored = {
+        row.category_id: (row.item_count, row.total_stock, Decimal(str(row.total_value)).quantize(Decimal('0.01')))
+        for row in db.session.query(CategoryValuation)
+    }
+    live = _live_totals()
+    return [
+        (category_id, stored.get(category_id), live.get(category_id))
+        for category_id in sorted(set(stored) | set(live))
+        if stored.get(category_id) != live.get(category_id)
+    ]
+
+
+def rebuild():
+    """
+    Recompute every category row from items
+
+    Returns:
+        int: Number of categories written
+    """
+    db.session.execute(delete(CategoryValuation))
+    db.session.execute(
+        insert(CategoryValuation).from_select(
+            ['category_id', 'item_count', 'total_stock', 'total_value'],
+            select(
+                Category.category_id,
+                func.count(Item.item_id),
+                func.coalesce(func.sum(Item.current_stock), 0),
+                func.coalesce(func.sum(Item.current_stock * Item.unit_price), 0)
+            ).outerjoin(Item, Category.category_id == Item.category_id)
+             .group_by(Category.category_id)
+        )
+    )
+    db.session.commit()
+    return db.session.query(CategoryValuation).count()
@@ -219,6 +219,65 @@ function debounce(func, wait) {
 }
 
 
+
+// ITEM TYPEAHEAD
+function initItemPicker(searchId, fieldId, listId) {
+    const search = document.getElementById(searchId);
+    const field = document.getElementById(fieldId);
+    const list = document.getElementById(listId);
+    
+    if (!search || !field || !list) return;
+    
+    function choose(item) {
+        field.value = item.item_id;
+        search.value = `${item.item_code} - ${item.item_name}`;
+        list.innerHTML = '';
+        list.style.display = 'none';
+        field.dispatchEvent(new Event('change'));
+    }
+    
+    const lookup = debounce(async () => {
+        const query = search.value.trim();
+        if (!query) {
+            list.style.display = 'none';
+            return;
+        }
+        
+        const response = await fetch(`/api/items/suggest?q=${encodeURIComponent(query)}&limit=10`);
+        const items = await response.json();
+        
+        list.innerHTML = '';
+        items.forEach(item => {
+            const option = document.createElement('div');
+            option.className = 'item-suggestion';
+            option.textContent = `${item.item_code} - ${item.item_name}`;
+            option.addEventListener('mousedown', () => choose(item));
+            list.appendChild(option);
+        });
+        list.style.display = items.length ? 'block' : 'none';
+    }, 150);
+    
+    search.addEventListener('input', () => {
+        field.value = '';
+        lookup();
+    });
+    search.addEventListener('blur', () => {
+        list.style.display = 'none';
+    });
+    
+    // Item pre-selected from the URL or a failed submit
+    if (field.value) {
+        fetch(`/api/items/${field.value}`)
+            .then(response => response.json())
+            .then(item => {
+                if (item.item_id) {
+                    search.value = `${item.item_code} - ${item.item_name}`;
+                    field.dispatchEvent(new Event('change'));
+                }
+            });
+    }
+}
+
 // FORMATTING UTILITIES
 function formatCurrency(amount) {
     if (amount === null || amount === undefined) return '$0.00';
@@ -601,6 +660,7 @@ function truncate(str, length = 50) {
 // EXPORT FUNCTIONS TO GLOBAL SCOPE
 window.searchTable = searchTable;
 window.debouncedSearch = debouncedSearch;
+window.initItemPicker = initItemPicker;
 window.confirmDelete = confirmDelete;
 window.validateForm = validateForm;
 window.submitFormAjax = submitFormAjax;
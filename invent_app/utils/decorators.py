@@ -0,0 +1,92 @@
+"""
+View decorators
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, session, current_app, make_response
+from invent_app.services import table_versions
+from invent_app.utils.http_cache import make_etag, not_modified
+
+
+# (endpoint, args, versions) -> (body, mimetype, last_modified)
+_report_cache = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+
+def cached_report(tables, vary=None):
+    """
+    Serve a report view from a rendered-response cache
+
+    The cache key is the endpoint, the query string and the shared write
+    version of every table the report reads, so any committed write to
+    one of them produces a new key; stale entries age out of the LRU.
+    Reports reading 'transactions' are keyed on the ledger watermark
+    (max transaction_id) plus a REPORT_CACHE_LEDGER_SECONDS time bucket,
+    which bounds staleness when movements commit out of id order.
+    Responses carry an ETag of that key and a Last-Modified of the
+    render time, and revalidations answer 304 without rendering.
+
+    Args:
+        tables: Table names the report reads
+        vary: Optional callable returning extra key parts (e.g. the
+            current month for period reports)
+    """
+    tables = sorted(tables)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Pages carrying flashed messages are per-user
+            if '_flashes' in session:
+                return view(*args, **kwargs)
+
+            versions = table_versions.current_versions()
+            etag = make_etag(
+                request.endpoint,
+                sorted(request.args.items(multi=True)),
+                kwargs,
+                [versions.get(name, 0) for name in tables],
+                _ledger_bucket() if 'transactions' in tables else None,
+                vary() if vary else None
+            )
+            cached = not_modified(etag)
+            if cached:
+                return cached
+
+            with _report_cache_lock:
+                entry = _report_cache.get(etag)
+                if entry:
+                    _report_cache.move_to_end(etag)
+
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = (response.get_data(), response.mimetype, datetime.now(timezone.utc))
+                _store(etag, entry)
+
+            body, mimetype, last_modified = entry
+            response = make_response(body)
+            response.mimetype = mimetype
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def _ledger_bucket():
+    """Current REPORT_CACHE_LEDGER_SECONDS window"""
+    return int(time.time() // current_app.config['REPORT_CACHE_LEDGER_SECONDS'])
+
+
+def _store(key, entry):
+    with _report_cache_lock:
+        _report_cache[key] = entry
+        while len(_report_cache) > current_app.config['REPORT_CACHE_SIZE']:
+            _report_cache.popitem(last=False)
@@ -0,0 +1,40 @@
+"""
+HTTP conditional requests
+Strong ETags built from cheap change watermarks, so a client that
+already holds the current representation gets a 304 before any ORM
+query or serialisation runs.
+"""
+
+import hashlib
+import json
+from flask import request, make_response
+
+
+def make_etag(*parts):
+    """Strong ETag value for an ordered set of JSON-serialisable parts"""
+    raw = json.dumps(parts, default=str, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def not_modified(etag):
+    """
+    A 304 response if the request already holds this ETag, else None
+
+    Args:
+        etag: Value from make_etag
+
+    Returns:
+        Response or None
+    """
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def with_etag(response, etag):
+    """Attach an ETag to a response built by the view"""
+    response = make_response(response)
+    response.set_etag(etag)
+    return response
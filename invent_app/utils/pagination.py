@@ -0,0 +1,210 @@
+"""
+Keyset (seek) pagination
+Pages are addressed by the sort key of the row at the page edge instead
+of an OFFSET, so any page costs one index range scan of per_page rows
+and no COUNT(*). Cursors are opaque URL-safe tokens.
+"""
+
+import base64
+import json
+from datetime import datetime, date
+from decimal import Decimal
+from sqlalchemy import tuple_, text
+from invent_app import db
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+def encode_cursor(direction, values, total=None):
+    """
+    Pack a direction ('next'/'prev') and key values into a token
+
+    A row count computed for the first page rides along in the token so
+    later pages do not count again.
+    """
+    payload = [direction, [_encode_value(v) for v in values]]
+    if total is not None:
+        payload.append(total)
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, order_by=None):
+    """
+    Unpack a token into (direction, values, total)
+
+    Args:
+        order_by: Sort key columns the values must match in number and
+            type (unchecked if None)
+
+    Raises:
+        InvalidCursor: for a malformed or tampered token
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) not in (2, 3):
+            raise InvalidCursor('Malformed cursor')
+        direction, values = payload[0], payload[1]
+        total = payload[2] if len(payload) == 3 else None
+        if not isinstance(values, list):
+            raise InvalidCursor('Malformed cursor values')
+        values = [_decode_value(v) for v in values]
+    except (ValueError, TypeError, ArithmeticError) as e:
+        raise InvalidCursor(str(e))
+
+    if direction not in ('next', 'prev'):
+        raise InvalidCursor(f'Unknown cursor direction {direction}')
+    if total is not None and (type(total) is not int or total < 0):
+        raise InvalidCursor('Malformed cursor total')
+    if order_by is not None:
+        if len(values) != len(order_by):
+            raise InvalidCursor(f'Cursor has {len(values)} values for {len(order_by)} sort keys')
+        for column, value in zip(order_by, values):
+            if not _matches_column(column, value):
+                raise InvalidCursor(f'Cursor value {value!r} does not fit {column.key}')
+    return direction, values, total
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'n': str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'n' in value:
+            return Decimal(value['n'])
+        raise InvalidCursor('Unknown cursor value')
+    if isinstance(value, list):
+        raise InvalidCursor('Cursor values must be scalars')
+    return value
+
+
+def _matches_column(column, value):
+    """True if a decoded cursor value can be compared with a sort key column"""
+    if value is None or isinstance(value, bool):
+        return False
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        return isinstance(value, (str, int, float, Decimal, date))
+    if expected is datetime:
+        return isinstance(value, datetime)
+    if expected is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    if expected is int:
+        return isinstance(value, int)
+    if expected in (float, Decimal):
+        return isinstance(value, (int, float, Decimal))
+    return isinstance(value, expected)
+
+
+class KeysetPage:
+    """One page of rows plus the cursors around it"""
+
+    def __init__(self, items, keys, has_next, has_prev, total=None):
+        self.items = items
+        self.has_next = has_next
+        self.has_prev = has_prev
+        self.total = total
+        self.next_cursor = encode_cursor('next', keys[-1], total) if has_next and items else None
+        self.prev_cursor = encode_cursor('prev', keys[0], total) if has_prev and items else None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_paginate(query, order_by, cursor=None, per_page=20, descending=True, with_total=False):
+    """
+    Paginate a query by a unique sort key
+
+    Args:
+        query: ORM query without ORDER BY / LIMIT
+        order_by: Mapped columns forming a unique key, e.g.
+            (Transaction.transaction_date, Transaction.transaction_id)
+        cursor: Token from a previous page, or None for the first page
+        per_page: Rows per page
+        descending: Sort direction of every key column
+        with_total: Attach an estimated row count (see estimate_count),
+            computed on the first page and carried by the cursors
+
+    Returns:
+        KeysetPage (a malformed cursor falls back to the first page)
+    """
+    direction, values, total = 'next', None, None
+    if cursor:
+        try:
+            direction, values, total = decode_cursor(cursor, order_by)
+        except InvalidCursor:
+            direction, values, total = 'next', None, None
+
+    if with_total and total is None:
+        total = estimate_count(query)
+    elif not with_total:
+        total = None
+
+    # Walking backwards means flipping both the comparison and the sort
+    forward = direction == 'next'
+    seek_down = descending == forward
+
+    if values is not None:
+        key, bound = tuple_(*order_by), tuple_(*values)
+        query = query.filter(key < bound if seek_down else key > bound)
+
+    query = query.order_by(*[c.desc() if seek_down else c.asc() for c in order_by])
+    rows = query.limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    keys = [tuple(_key_value(row, column) for column in order_by) for row in rows]
+
+    return KeysetPage(
+        rows,
+        keys,
+        has_next=has_more if forward else values is not None,
+        has_prev=values is not None if forward else has_more,
+        total=total
+    )
+
+
+def _key_value(row, column):
+    """Read a sort key column from an entity or a named row"""
+    return getattr(row, column.key)
+
+
+def estimate_count(query):
+    """
+    Approximate number of rows a query returns
+
+    Uses the planner estimate on PostgreSQL (no scan); other databases
+    get an exact COUNT.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return query.order_by(None).count()
+
+    statement = query.order_by(None).statement.compile(
+        dialect=db.session.get_bind().dialect,
+        compile_kwargs={'literal_binds': True}
+    )
+    plan = db.session.execute(text(f'EXPLAIN (FORMAT JSON) {statement}')).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
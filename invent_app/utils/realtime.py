@@ -0,0 +1,92 @@
+"""
+Realtime push
+A python-socketio server mounted in front of the Flask WSGI app (same
+host and port, under /socket.io/) so services can push events to open
+browser pages instead of having them poll.
+
+With SOCKETIO_MESSAGE_QUEUE set (redis:// or any Kombu URL) events
+emitted in any process - web workers, background report jobs, CLI
+commands - reach clients connected to every web worker.
+"""
+
+import socketio
+from flask import current_app, has_app_context
+
+
+EXTENSION_KEY = 'socketio'
+
+_connect_listeners = []
+
+
+def on_connect(listener):
+    """
+    Register a callback returning (event, data) to send each new client
+
+    Lets a page opened from a cached render catch up on connect.
+    Callbacks run inside an app context.
+    """
+    _connect_listeners.append(listener)
+    return listener
+
+
+def init_app(app):
+    """Create the Socket.IO server and wrap app.wsgi_app with it"""
+    if not app.config['SOCKETIO_ENABLED']:
+        return None
+
+    # always_connect: the connect handler below emits to the new client
+    sio = socketio.Server(
+        async_mode=app.config['SOCKETIO_ASYNC_MODE'],
+        always_connect=True,
+        client_manager=_client_manager(app.config['SOCKETIO_MESSAGE_QUEUE'])
+    )
+    app.extensions[EXTENSION_KEY] = sio
+    app.wsgi_app = socketio.WSGIApp(sio, app.wsgi_app)
+
+    @sio.event
+    def connect(sid, environ):
+        with app.app_context():
+            for listener in _connect_listeners:
+                event, data = listener()
+                sio.emit(event, data, to=sid)
+
+    return sio
+
+
+def server(app=None):
+    """Socket.IO server of an app (default: the current one), or None"""
+    if app is None:
+        if not has_app_context():
+            return None
+        app = current_app
+    return app.extensions.get(EXTENSION_KEY)
+
+
+def enabled():
+    """True if the current app pushes events"""
+    return server() is not None
+
+
+def emit(event, data, to=None):
+    """
+    Send an event to connected clients
+
+    Args:
+        event: Event name
+        data: JSON-serialisable payload
+        to: Optional room or client id (default: every client)
+    """
+    sio = server()
+    if sio is not None:
+        sio.emit(event, data, to=to)
+
+
+# HELPER FUNCTIONS
+
+def _client_manager(url):
+    """Cross-process manager for a message queue URL, or None for in-process"""
+    if not url:
+        return None
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return socketio.RedisManager(url)
+    return socketio.KombuManager(url)
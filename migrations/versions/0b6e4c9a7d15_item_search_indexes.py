@@ -0,0 +1,71 @@
+"""item search indexes
+
+Revision ID: 0b6e4c9a7d15
+Revises: f1b7d3e86a20
+Create Date: 2026-10-17 17:40:12.504618
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e4c9a7d15'
+down_revision = 'f1b7d3e86a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('idx_items_name_trgm', 'items', ['item_name'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'item_name': 'gin_trgm_ops'})
+        op.create_index('idx_items_code_trgm', 'items', ['item_code'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'item_code': 'gin_trgm_ops'})
+
+    elif dialect == 'sqlite':
+        # External-content FTS5 table over items, kept in sync by triggers
+        op.execute("""
+            CREATE VIRTUAL TABLE items_fts USING fts5(
+                item_code, item_name,
+                content='items', content_rowid='item_id', tokenize='trigram'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER items_fts_insert AFTER INSERT ON items BEGIN
+                INSERT INTO items_fts (rowid, item_code, item_name)
+                VALUES (new.item_id, new.item_code, new.item_name);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER items_fts_delete AFTER DELETE ON items BEGIN
+                INSERT INTO items_fts (items_fts, rowid, item_code, item_name)
+                VALUES ('delete', old.item_id, old.item_code, old.item_name);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER items_fts_update AFTER UPDATE OF item_code, item_name ON items BEGIN
+                INSERT INTO items_fts (items_fts, rowid, item_code, item_name)
+                VALUES ('delete', old.item_id, old.item_code, old.item_name);
+                INSERT INTO items_fts (rowid, item_code, item_name)
+                VALUES (new.item_id, new.item_code, new.item_name);
+            END
+        """)
+        op.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.drop_index('idx_items_code_trgm', table_name='items')
+        op.drop_index('idx_items_name_trgm', table_name='items')
+
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS items_fts_update')
+        op.execute('DROP TRIGGER IF EXISTS items_fts_delete')
+        op.execute('DROP TRIGGER IF EXISTS items_fts_insert')
+        op.execute('DROP TABLE IF EXISTS items_fts')
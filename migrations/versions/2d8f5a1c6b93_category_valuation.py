@@ -0,0 +1,48 @@
+"""category valuation summary
+
+Revision ID: 2d8f5a1c6b93
+Revises: 0b6e4c9a7d15
+Create Date: 2026-10-17 18:55:31.206447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d8f5a1c6b93'
+down_revision = '0b6e4c9a7d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('category_valuation',
+    sa.Column('category_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('item_count', sa.Integer(), nullable=False),
+    sa.Column('total_stock', sa.Integer(), nullable=False),
+    sa.Column('total_value', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('category_id')
+    )
+
+    # Backfill from items
+    op.execute("""
+        INSERT INTO category_valuation (category_id, item_count, total_stock, total_value)
+        SELECT c.category_id, COUNT(i.item_id), COALESCE(SUM(i.current_stock), 0),
+               COALESCE(SUM(i.current_stock * i.unit_price), 0)
+        FROM categories c
+        LEFT JOIN items i ON i.category_id = c.category_id
+        GROUP BY c.category_id
+    """)
+
+    # Expression index for the "most valuable items" ORDER BY ... LIMIT
+    if op.get_bind().dialect.name in ('postgresql', 'sqlite'):
+        op.create_index('idx_items_stock_value', 'items',
+                        [sa.text('(current_stock * unit_price)')], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ('postgresql', 'sqlite'):
+        op.drop_index('idx_items_stock_value', table_name='items')
+
+    op.drop_table('category_valuation')
@@ -0,0 +1,46 @@
+"""stock alerts
+
+Revision ID: 4e7d2b9a1c58
+Revises: 9c3e8b1f4a27
+Create Date: 2026-10-17 22:04:13.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7d2b9a1c58'
+down_revision = '9c3e8b1f4a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_alerts',
+    sa.Column('item_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('level', sa.String(length=10), nullable=False),
+    sa.Column('current_stock', sa.Integer(), nullable=False),
+    sa.Column('reorder_level', sa.Integer(), nullable=False),
+    sa.Column('raised_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('item_id')
+    )
+    with op.batch_alter_table('stock_alerts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_stock_alerts_level'), ['level'], unique=False)
+
+    # Backfill from the current items
+    op.execute("""
+        INSERT INTO stock_alerts (item_id, level, current_stock, reorder_level, raised_at)
+        SELECT item_id,
+               CASE WHEN current_stock = 0 THEN 'out' ELSE 'low' END,
+               current_stock, reorder_level, CURRENT_TIMESTAMP
+        FROM items
+        WHERE current_stock <= reorder_level
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('stock_alerts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_stock_alerts_level'))
+
+    op.drop_table('stock_alerts')
@@ -0,0 +1,47 @@
+"""supplier stats summary
+
+Revision ID: 7a4c2e9d5b10
+Revises: 2d8f5a1c6b93
+Create Date: 2026-10-17 19:42:08.517364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4c2e9d5b10'
+down_revision = '2d8f5a1c6b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('supplier_stats',
+    sa.Column('supplier_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('total_quantity', sa.Integer(), nullable=False),
+    sa.Column('total_value', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('supplier_id')
+    )
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('idx_type_supplier', ['type_id', 'supplier_id'], unique=False)
+
+    # Backfill from the STOCK_IN ledger
+    op.execute("""
+        INSERT INTO supplier_stats (supplier_id, transaction_count, total_quantity, total_value)
+        SELECT t.supplier_id, COUNT(t.transaction_id), SUM(t.quantity),
+               SUM(t.quantity * COALESCE(t.unit_price, 0))
+        FROM transactions t
+        JOIN transaction_types tt ON tt.type_id = t.type_id
+        WHERE tt.type_name = 'STOCK_IN' AND t.supplier_id IS NOT NULL
+        GROUP BY t.supplier_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('idx_type_supplier')
+
+    op.drop_table('supplier_stats')
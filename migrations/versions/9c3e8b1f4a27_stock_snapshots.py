@@ -0,0 +1,30 @@
+"""stock snapshots
+
+Revision ID: 9c3e8b1f4a27
+Revises: 7a4c2e9d5b10
+Create Date: 2026-10-17 20:31:54.902716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3e8b1f4a27'
+down_revision = '7a4c2e9d5b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_snapshots',
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('item_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('snapshot_date', 'item_id')
+    )
+
+
+def downgrade():
+    op.drop_table('stock_snapshots')
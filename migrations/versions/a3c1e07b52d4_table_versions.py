@@ -0,0 +1,32 @@
+"""table versions for cache invalidation
+
+Revision ID: a3c1e07b52d4
+Revises: 6f19a4fd60e5
+Create Date: 2026-10-17 09:12:44.318201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c1e07b52d4'
+down_revision = '6f19a4fd60e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.bulk_insert(table_versions, [
+        {'table_name': name, 'version': 0}
+        for name in ('transaction_types', 'categories', 'suppliers', 'locations')
+    ])
+
+
+def downgrade():
+    op.drop_table('table_versions')
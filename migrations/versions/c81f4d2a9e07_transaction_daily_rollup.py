@@ -0,0 +1,51 @@
+"""transaction daily rollup
+
+Revision ID: c81f4d2a9e07
+Revises: a3c1e07b52d4
+Create Date: 2026-10-17 11:03:27.540112
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f4d2a9e07'
+down_revision = 'a3c1e07b52d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('transaction_daily_rollup',
+    sa.Column('rollup_date', sa.Date(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('type_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('total_value', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.item_id'], ),
+    sa.ForeignKeyConstraint(['type_id'], ['transaction_types.type_id'], ),
+    sa.PrimaryKeyConstraint('rollup_date', 'item_id', 'type_id')
+    )
+    with op.batch_alter_table('transaction_daily_rollup', schema=None) as batch_op:
+        batch_op.create_index('idx_rollup_item_date', ['item_id', 'rollup_date'], unique=False)
+        batch_op.create_index('idx_rollup_type_date', ['type_id', 'rollup_date'], unique=False)
+
+    # Backfill from the existing ledger
+    op.execute("""
+        INSERT INTO transaction_daily_rollup
+            (rollup_date, item_id, type_id, quantity, total_value, transaction_count)
+        SELECT date(transaction_date), item_id, type_id, SUM(quantity),
+               SUM(quantity * COALESCE(unit_price, 0)), COUNT(*)
+        FROM transactions
+        GROUP BY date(transaction_date), item_id, type_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('transaction_daily_rollup', schema=None) as batch_op:
+        batch_op.drop_index('idx_rollup_type_date')
+        batch_op.drop_index('idx_rollup_item_date')
+
+    op.drop_table('transaction_daily_rollup')
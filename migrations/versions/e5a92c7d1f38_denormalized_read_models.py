@@ -0,0 +1,109 @@
+"""denormalized read models
+
+Revision ID: e5a92c7d1f38
+Revises: c81f4d2a9e07
+Create Date: 2026-10-17 14:21:09.318245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a92c7d1f38'
+down_revision = 'c81f4d2a9e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('item_denorm',
+    sa.Column('item_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('item_code', sa.String(length=50), nullable=False),
+    sa.Column('item_name', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('category_name', sa.String(length=100), nullable=False),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('supplier_name', sa.String(length=200), nullable=True),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.Column('warehouse', sa.String(length=50), nullable=True),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('current_stock', sa.Integer(), nullable=False),
+    sa.Column('reorder_level', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('item_id'),
+    sa.UniqueConstraint('item_code')
+    )
+    with op.batch_alter_table('item_denorm', schema=None) as batch_op:
+        batch_op.create_index('idx_item_denorm_name', ['item_name', 'item_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_item_denorm_category_id'), ['category_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_item_denorm_current_stock'), ['current_stock'], unique=False)
+        batch_op.create_index(batch_op.f('ix_item_denorm_supplier_id'), ['supplier_id'], unique=False)
+
+    op.create_table('transaction_denorm',
+    sa.Column('transaction_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('item_code', sa.String(length=50), nullable=False),
+    sa.Column('item_name', sa.String(length=200), nullable=False),
+    sa.Column('type_id', sa.Integer(), nullable=False),
+    sa.Column('type_name', sa.String(length=50), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('supplier_name', sa.String(length=200), nullable=True),
+    sa.Column('reference_number', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('transaction_date', sa.DateTime(), nullable=False),
+    sa.Column('created_by', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('transaction_id')
+    )
+    with op.batch_alter_table('transaction_denorm', schema=None) as batch_op:
+        batch_op.create_index('idx_trx_denorm_date', ['transaction_date', 'transaction_id'], unique=False)
+        batch_op.create_index('idx_trx_denorm_item_date', ['item_id', 'transaction_date'], unique=False)
+        batch_op.create_index('idx_trx_denorm_type_date', ['type_id', 'transaction_date'], unique=False)
+
+    # Backfill from the normalized schema
+    op.execute("""
+        INSERT INTO item_denorm
+            (item_id, item_code, item_name, description, category_id, category_name,
+             supplier_id, supplier_name, location_id, warehouse, unit_price,
+             current_stock, reorder_level, created_at, updated_at)
+        SELECT i.item_id, i.item_code, i.item_name, i.description, i.category_id, c.category_name,
+               i.supplier_id, s.supplier_name, i.location_id, l.warehouse, i.unit_price,
+               i.current_stock, i.reorder_level, i.created_at, i.updated_at
+        FROM items i
+        JOIN categories c ON c.category_id = i.category_id
+        LEFT JOIN suppliers s ON s.supplier_id = i.supplier_id
+        LEFT JOIN locations l ON l.location_id = i.location_id
+    """)
+    op.execute("""
+        INSERT INTO transaction_denorm
+            (transaction_id, item_id, item_code, item_name, type_id, type_name,
+             quantity, unit_price, supplier_id, supplier_name, reference_number,
+             notes, transaction_date, created_by)
+        SELECT t.transaction_id, t.item_id, i.item_code, i.item_name, t.type_id, tt.type_name,
+               t.quantity, t.unit_price, t.supplier_id, s.supplier_name, t.reference_number,
+               t.notes, t.transaction_date, t.created_by
+        FROM transactions t
+        JOIN items i ON i.item_id = t.item_id
+        JOIN transaction_types tt ON tt.type_id = t.type_id
+        LEFT JOIN suppliers s ON s.supplier_id = t.supplier_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('transaction_denorm', schema=None) as batch_op:
+        batch_op.drop_index('idx_trx_denorm_type_date')
+        batch_op.drop_index('idx_trx_denorm_item_date')
+        batch_op.drop_index('idx_trx_denorm_date')
+
+    op.drop_table('transaction_denorm')
+    with op.batch_alter_table('item_denorm', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_item_denorm_supplier_id'))
+        batch_op.drop_index(batch_op.f('ix_item_denorm_current_stock'))
+        batch_op.drop_index(batch_op.f('ix_item_denorm_category_id'))
+        batch_op.drop_index('idx_item_denorm_name')
+
+    op.drop_table('item_denorm')
@@ -0,0 +1,26 @@
+"""items updated_at index
+
+Revision ID: f1b7d3e86a20
+Revises: e5a92c7d1f38
+Create Date: 2026-10-17 16:02:44.873190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7d3e86a20'
+down_revision = 'e5a92c7d1f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_items_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_items_updated_at'))
@@ -0,0 +1,206 @@
+"""
+Benchmark Harness
+Pieces shared by the benchmark scripts: an app context on the database
+named by DATABASE_URL, warm-up plus repeated timing, latency
+percentiles, and result files (JSON with run metadata, CSV, and a
+Markdown table ready for docs/performance_results.md).
+"""
+
+import csv
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+import numpy as np
+from sqlalchemy import func, select, table
+
+
+PERCENTILES = (50, 95, 99)
+
+OUTPUT_FORMATS = ('json', 'csv', 'md')
+
+DEFAULT_OUTPUT_DIR = os.path.join('performance', 'results')
+
+
+def create_benchmark_app():
+    """Flask app on the configured database (work outside requests reads the primary)"""
+    from invent_app import create_app
+    return create_app()
+
+
+# TIMING
+
+def time_runs(run, warmup=5, repeat=50, reset=None):
+    """
+    Time a callable after warming it up
+
+    Args:
+        run: Callable taking the run index and returning a row count
+        warmup: Untimed calls made first (caches, statement compilation)
+        repeat: Timed calls
+        reset: Optional callable run untimed after every call
+
+    Returns:
+        tuple: (list of seconds per timed call, total rows returned)
+    """
+    for index in range(warmup):
+        run(index)
+        if reset:
+            reset()
+
+    seconds, rows = [], 0
+    for index in range(repeat):
+        started = time.perf_counter()
+        rows += run(warmup + index) or 0
+        seconds.append(time.perf_counter() - started)
+        if reset:
+            reset()
+    return seconds, rows
+
+
+def latency_stats(seconds, rows=None):
+    """
+    Summary of a list of call durations
+
+    Returns:
+        dict: runs, mean/min/max and percentile latencies in ms, plus
+        rows_per_run and rows_per_sec when rows is given
+    """
+    samples = np.asarray(seconds, dtype=float)
+    if not samples.size:
+        return {'runs': 0}
+
+    stats = {
+        'runs': int(samples.size),
+        'mean_ms': float(samples.mean() * 1000),
+        'min_ms': float(samples.min() * 1000),
+        'max_ms': float(samples.max() * 1000),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+        stats[f'p{percentile}_ms'] = float(value * 1000)
+
+    if rows is not None:
+        total = samples.sum()
+        stats['rows_per_run'] = rows / samples.size
+        stats['rows_per_sec'] = rows / total if total else 0.0
+    return stats
+
+
+# ENVIRONMENT
+
+def environment(db, tables=()):
+    """
+    Metadata describing where and on what the benchmark ran
+
+    Args:
+        db: Flask-SQLAlchemy extension (inside an app context)
+        tables: Table names whose row counts are recorded
+    """
+    engine = db.engine
+    server_version = engine.dialect.server_version_info
+    return {
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'dialect': engine.dialect.name,
+        'driver': engine.dialect.driver,
+        'server_version': '.'.join(map(str, server_version)) if server_version else None,
+        'row_counts': {
+            name: db.session.execute(select(func.count()).select_from(table(name))).scalar()
+            for name in tables
+        },
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# OUTPUT
+
+def add_output_arguments(parser, name):
+    """Add --output and --format options to an argparse parser"""
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    parser.add_argument(
+        '--output', default=os.path.join(DEFAULT_OUTPUT_DIR, f'{name}-{stamp}'),
+        help='Result path without extension (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--format', nargs='+', choices=OUTPUT_FORMATS, default=['json', 'csv'],
+        help='Result files to write (default: json csv)'
+    )
+
+
+def write_results(output, formats, meta, rows, columns):
+    """
+    Write benchmark rows to <output>.json / .csv / .md
+
+    Args:
+        output: Path without extension
+        formats: Subset of OUTPUT_FORMATS
+        meta: Run metadata (JSON only)
+        rows: Result dicts
+        columns: Column order for CSV and Markdown
+
+    Returns:
+        list: Paths written
+    """
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    if 'json' in formats:
+        paths.append(f'{output}.json')
+        with open(paths[-1], 'w') as target:
+            json.dump({'meta': meta, 'results': rows}, target, indent=2, default=str)
+    if 'csv' in formats:
+        paths.append(f'{output}.csv')
+        with open(paths[-1], 'w', newline='') as target:
+            writer = csv.DictWriter(target, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+    if 'md' in formats:
+        paths.append(f'{output}.md')
+        with open(paths[-1], 'w') as target:
+            target.write(markdown_table(rows, columns))
+    return paths
+
+
+def markdown_table(rows, columns):
+    """Rows as a GitHub Markdown table, floats to two decimals"""
+    lines = [
+        '| ' + ' | '.join(columns) + ' |',
+        '|' + '|'.join('---' for _ in columns) + '|',
+    ]
+    for row in rows:
+        lines.append('| ' + ' | '.join(_cell(row.get(column)) for column in columns) + ' |')
+    return '\n'.join(lines) + '\n'
+
+
+def print_table(rows, columns):
+    """Print rows as aligned text columns"""
+    cells = [[_cell(row.get(column)) for column in columns] for row in rows]
+    widths = [
+        max([len(column)] + [len(line[i]) for line in cells])
+        for i, column in enumerate(columns)
+    ]
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for line in cells:
+        print('  '.join(value.rjust(width) for value, width in zip(line, widths)))
+
+
+def _cell(value):
+    if isinstance(value, float):
+        return f'{value:,.2f}'
+    return '' if value is None else str(value)
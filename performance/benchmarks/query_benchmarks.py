@@ -0,0 +1,248 @@
+"""
+Read-Path Benchmarks
+Times a fixed catalogue of read queries against the normalized (3NF)
+schema and the denormalized read models (item_denorm,
+transaction_denorm) of the same database. Both schemas go through the
+app's own query paths (item_query / transaction_query with READ_MODEL
+switched, keyset pagination, eager-loading profiles), so the numbers
+show what the READ_MODEL setting would buy on our own hardware.
+
+Usage, from the project root with DATABASE_URL set and the read models
+populated (`flask rebuild-read-models`):
+
+    python -m performance.benchmarks.query_benchmarks --repeat 100 --format json csv md
+"""
+
+import argparse
+import random
+import sys
+from datetime import timedelta
+from sqlalchemy import func, select
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.category import Category
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.denormalized.item_denorm import ItemDenorm
+from invent_app.database.read_models import item_query, transaction_query, denormalized_reads
+from invent_app.utils.pagination import keyset_paginate
+from performance.benchmarks.harness import (
+    create_benchmark_app, time_runs, latency_stats, environment,
+    add_output_arguments, write_results, print_table
+)
+
+
+SCHEMAS = ('normalized', 'denormalized')
+
+RESULT_COLUMNS = [
+    'query', 'schema', 'runs', 'rows_per_run', 'mean_ms',
+    'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'rows_per_sec'
+]
+
+# Page sizes used by the views being imitated
+ITEM_PAGE_SIZE = 20
+MOVEMENT_PAGE_SIZE = 50
+
+# Length of the movement history date window
+MOVEMENT_WINDOW_DAYS = 30
+
+# Distinct parameter values drawn per query
+SAMPLE_SIZE = 200
+
+
+class QueryParams:
+    """Seeded parameter pools, cycled through run by run"""
+
+    def __init__(self, seed, size=SAMPLE_SIZE):
+        rng = random.Random(seed)
+
+        low, high = db.session.query(func.min(Item.item_id), func.max(Item.item_id)).one()
+        ids = [rng.randint(low, high) for _ in range(size)] if low is not None else []
+        self.item_codes = [
+            code for (code,) in
+            db.session.query(Item.item_code).filter(Item.item_id.in_(ids)).order_by(Item.item_id)
+        ] or [None]
+        rng.shuffle(self.item_codes)
+
+        self.category_ids = [
+            category_id for (category_id,) in db.session.query(Category.category_id)
+        ] or [None]
+        rng.shuffle(self.category_ids)
+
+        first, last = db.session.query(
+            func.min(Transaction.transaction_date), func.max(Transaction.transaction_date)
+        ).one()
+        self.windows = []
+        if first is not None:
+            span = max((last - first).days - MOVEMENT_WINDOW_DAYS, 0)
+            for _ in range(size):
+                start = first + timedelta(days=rng.randint(0, span))
+                self.windows.append((start, start + timedelta(days=MOVEMENT_WINDOW_DAYS)))
+        self.windows = self.windows or [(None, None)]
+
+    def item_code(self, index):
+        return self.item_codes[index % len(self.item_codes)]
+
+    def category_id(self, index):
+        return self.category_ids[index % len(self.category_ids)]
+
+    def window(self, index):
+        return self.windows[index % len(self.windows)]
+
+
+# QUERY CATALOGUE
+# Each query takes (params, run index) and returns the rows it produced;
+# READ_MODEL decides which schema it reads.
+
+def item_lookup(params, index):
+    """One item by code, with category, supplier and location names"""
+    model, query = item_query('item_detail')
+    item = query.filter(model.item_code == params.item_code(index)).one_or_none()
+    return int(item is not None)
+
+
+def filtered_list(params, index):
+    """First page of the item list filtered by category, with a total"""
+    model, query = item_query('item_list')
+    page = keyset_paginate(
+        query.filter(model.category_id == params.category_id(index)),
+        (model.item_name, model.item_id),
+        per_page=ITEM_PAGE_SIZE,
+        descending=False,
+        with_total=True
+    )
+    return len(page)
+
+
+def category_summary(params, index):
+    """Item count, units and stock value per category"""
+    if denormalized_reads():
+        query = db.session.query(
+            ItemDenorm.category_id,
+            ItemDenorm.category_name,
+            func.count(ItemDenorm.item_id),
+            func.sum(ItemDenorm.current_stock),
+            func.sum(ItemDenorm.current_stock * ItemDenorm.unit_price)
+        ).group_by(ItemDenorm.category_id, ItemDenorm.category_name)
+    else:
+        query = db.session.query(
+            Category.category_id,
+            Category.category_name,
+            func.count(Item.item_id),
+            func.sum(Item.current_stock),
+            func.sum(Item.current_stock * Item.unit_price)
+        ).join(Item, Item.category_id == Category.category_id)\
+         .group_by(Category.category_id, Category.category_name)
+    return len(query.all())
+
+
+def movement_history(params, index):
+    """First page of a 30-day movement history window, with a total"""
+    model, query = transaction_query('movement_history')
+    start, end = params.window(index)
+    if start is not None:
+        query = query.filter(model.transaction_date >= start, model.transaction_date < end)
+    page = keyset_paginate(
+        query,
+        (model.transaction_date, model.transaction_id),
+        per_page=MOVEMENT_PAGE_SIZE,
+        with_total=True
+    )
+    return len(page)
+
+
+def valuation(params, index):
+    """Total stock value and the ten most valuable items"""
+    if denormalized_reads():
+        model, category_name, joins = ItemDenorm, ItemDenorm.category_name, ()
+    else:
+        model, category_name, joins = Item, Category.category_name, (Category,)
+
+    value = model.current_stock * model.unit_price
+    total = db.session.execute(select(func.sum(value))).scalar()
+    top = select(model.item_name, category_name, model.current_stock, model.unit_price, value)
+    for joined in joins:
+        top = top.join(joined, joined.category_id == model.category_id)
+    rows = db.session.execute(top.order_by(value.desc(), model.item_id).limit(10)).all()
+    return len(rows) + int(total is not None)
+
+
+QUERIES = {
+    'item_lookup': item_lookup,
+    'filtered_list': filtered_list,
+    'category_summary': category_summary,
+    'movement_history': movement_history,
+    'valuation': valuation,
+}
+
+
+# RUNNER
+
+def run_benchmarks(app, queries=tuple(QUERIES), schemas=SCHEMAS, warmup=5, repeat=50, seed=42):
+    """
+    Time every query on every schema (inside an app context)
+
+    Returns:
+        list: One result dict per (query, schema)
+    """
+    params = QueryParams(seed)
+    db.session.remove()
+    original = app.config['READ_MODEL']
+
+    results = []
+    try:
+        for name in queries:
+            for schema in schemas:
+                app.config['READ_MODEL'] = schema
+                seconds, rows = time_runs(
+                    lambda index: QUERIES[name](params, index),
+                    warmup=warmup,
+                    repeat=repeat,
+                    reset=db.session.remove
+                )
+                results.append(dict(query=name, schema=schema, **latency_stats(seconds, rows)))
+    finally:
+        app.config['READ_MODEL'] = original
+    return results
+
+
+def _check_read_models():
+    """Refuse to compare against empty or stale read models"""
+    items = db.session.query(func.count(Item.item_id)).scalar()
+    mirrored = db.session.query(func.count(ItemDenorm.item_id)).scalar()
+    if items != mirrored:
+        sys.exit(
+            f'item_denorm has {mirrored} rows for {items} items; '
+            'run `flask rebuild-read-models` first'
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark read queries on the normalized and denormalized schemas'
+    )
+    parser.add_argument('--warmup', type=int, default=5, help='Untimed runs per query')
+    parser.add_argument('--repeat', type=int, default=50, help='Timed runs per query')
+    parser.add_argument('--queries', nargs='+', choices=list(QUERIES), default=list(QUERIES))
+    parser.add_argument('--schemas', nargs='+', choices=SCHEMAS, default=list(SCHEMAS))
+    parser.add_argument('--seed', type=int, default=42, help='Seed for query parameters')
+    add_output_arguments(parser, 'query_benchmarks')
+    args = parser.parse_args(argv)
+
+    app = create_benchmark_app()
+    with app.app_context():
+        if 'denormalized' in args.schemas:
+            _check_read_models()
+        meta = environment(db, ('items', 'transactions', 'item_denorm', 'transaction_denorm'))
+        meta.update(warmup=args.warmup, repeat=args.repeat, seed=args.seed)
+        results = run_benchmarks(
+            app, args.queries, args.schemas, args.warmup, args.repeat, args.seed
+        )
+
+    print_table(results, RESULT_COLUMNS)
+    for path in write_results(args.output, args.format, meta, results, RESULT_COLUMNS):
+        print(f'✓ Results written to {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
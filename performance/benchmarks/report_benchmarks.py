@@ -0,0 +1,283 @@
+"""
+Report Benchmarks
+Runs every report view in routes/reports.py end to end through the
+Flask test client (rendered-response cache cleared before each run) and
+splits its cost into:
+
+- query count and DB time (cursor execute events on every engine;
+  fetching rows from the cursor counts as Python time)
+- render time (Jinja, excluding lazy loads it triggers)
+- Python time (everything else in the view)
+- peak Python memory (tracemalloc, in a separate untimed run)
+
+Each run is labelled with a scale factor (10k/100k/1m items with
+1M/10M/50M transactions, see SCALES). Run it once per database built by
+scripts/generate_test_data.py at that size; the scale is detected
+from the row counts unless --scale is given. A report whose p95 time,
+peak memory or query count exceeds its budget fails the run (non-zero
+exit), so the suite can gate changes in CI.
+
+Usage, from the project root with DATABASE_URL set:
+
+    python -m performance.benchmarks.report_benchmarks --repeat 10 --budget-file budgets.json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from flask import before_render_template, template_rendered, url_for
+from sqlalchemy import event, func
+from sqlalchemy.engine import Engine
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.utils import decorators
+from performance.benchmarks.harness import (
+    create_benchmark_app, latency_stats, environment,
+    add_output_arguments, write_results, print_table
+)
+
+
+# Scale factor -> (items, transactions)
+SCALES = {
+    '10k': (10_000, 1_000_000),
+    '100k': (100_000, 10_000_000),
+    '1m': (1_000_000, 50_000_000),
+}
+
+# Report name -> (endpoint, query string)
+REPORTS = {
+    'stock_levels': ('reports.stock_levels', {}),
+    'low_stock': ('reports.low_stock', {}),
+    'movement_history': ('reports.movement_history', {}),
+    'category_summary': ('reports.category_summary', {}),
+    'supplier_performance': ('reports.supplier_performance', {}),
+    'inventory_valuation': ('reports.inventory_valuation', {}),
+    'monthly_summary': ('reports.monthly_summary', {}),
+    'stock_turnover': ('reports.stock_turnover', {}),
+}
+
+# Per-scale limits applied to every report unless a budget file
+# overrides them: p95 wall time, peak traced memory, queries per run
+DEFAULT_BUDGETS = {
+    '10k': {'total_ms': 500, 'peak_mb': 64, 'queries': 25},
+    '100k': {'total_ms': 2000, 'peak_mb': 256, 'queries': 25},
+    '1m': {'total_ms': 10000, 'peak_mb': 1024, 'queries': 25},
+}
+
+RESULT_COLUMNS = [
+    'report', 'scale', 'runs', 'queries', 'db_ms', 'python_ms', 'render_ms',
+    'p50_ms', 'p95_ms', 'peak_mb', 'response_kb', 'budget_ms', 'over_budget'
+]
+
+
+class RequestProfile:
+    """Query count and time split of the request being run"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.render_db_seconds = 0.0
+        self._render_started = None
+        self._query_started = []
+
+    # SQLAlchemy events
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._query_started.append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - self._query_started.pop()
+        self.queries += 1
+        self.db_seconds += elapsed
+        if self._render_started is not None:
+            self.render_db_seconds += elapsed
+
+    # Flask template signals
+
+    def before_render(self, sender, **extra):
+        if self._render_started is None:
+            self._render_started = time.perf_counter()
+
+    def after_render(self, sender, **extra):
+        if self._render_started is not None:
+            self.render_seconds += time.perf_counter() - self._render_started
+            self._render_started = None
+
+    def attach(self, app):
+        event.listen(Engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self.after_cursor_execute)
+        before_render_template.connect(self.before_render, app)
+        template_rendered.connect(self.after_render, app)
+
+    def detach(self, app):
+        event.remove(Engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.remove(Engine, 'after_cursor_execute', self.after_cursor_execute)
+        before_render_template.disconnect(self.before_render, app)
+        template_rendered.disconnect(self.after_render, app)
+
+
+# RUNNER
+
+def benchmark_report(app, client, profile, name, warmup=1, repeat=5):
+    """
+    Time one report and measure its peak memory
+
+    Returns:
+        dict: Result row without budget columns
+    """
+    endpoint, args = REPORTS[name]
+    with app.test_request_context():
+        url = url_for(endpoint, **args)
+
+    for _ in range(warmup):
+        _get(client, url)
+
+    totals, queries, db_ms, python_ms, render_ms = [], [], [], [], []
+    size = 0
+    for _ in range(repeat):
+        profile.reset()
+        started = time.perf_counter()
+        size = len(_get(client, url))
+        total = time.perf_counter() - started
+
+        render = profile.render_seconds - profile.render_db_seconds
+        totals.append(total)
+        queries.append(profile.queries)
+        db_ms.append(profile.db_seconds * 1000)
+        render_ms.append(render * 1000)
+        python_ms.append((total - profile.db_seconds - render) * 1000)
+
+    # Memory in its own run: tracemalloc slows Python down
+    tracemalloc.start()
+    try:
+        _get(client, url)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    stats = latency_stats(totals)
+    return {
+        'report': name,
+        'runs': repeat,
+        'queries': int(statistics.median(queries)),
+        'db_ms': statistics.median(db_ms),
+        'python_ms': statistics.median(python_ms),
+        'render_ms': statistics.median(render_ms),
+        'p50_ms': stats['p50_ms'],
+        'p95_ms': stats['p95_ms'],
+        'peak_mb': peak / 2 ** 20,
+        'response_kb': size / 1024,
+    }
+
+
+def _get(client, url):
+    """Render a report, bypassing the rendered-response cache"""
+    decorators._report_cache.clear()
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} answered {response.status_code}')
+    return response.get_data()
+
+
+def detect_scale(items, transactions):
+    """Scale factor whose item and transaction counts are closest (log distance)"""
+    def distance(scale):
+        expected_items, expected_transactions = SCALES[scale]
+        return (
+            abs(math.log10(max(items, 1) / expected_items))
+            + abs(math.log10(max(transactions, 1) / expected_transactions))
+        )
+    return min(SCALES, key=distance)
+
+
+def load_budgets(path, scale):
+    """
+    Budgets per report for a scale
+
+    A budget file maps scale -> report name (or "*" for every report)
+    -> limits (total_ms, peak_mb, queries), merged over DEFAULT_BUDGETS.
+    """
+    defaults = dict(DEFAULT_BUDGETS[scale])
+    overrides = {}
+    if path:
+        with open(path) as source:
+            overrides = json.load(source).get(scale, {})
+    defaults.update(overrides.get('*', {}))
+    return {name: dict(defaults, **overrides.get(name, {})) for name in REPORTS}
+
+
+def check_budget(result, budget):
+    """Names of the limits a result exceeds"""
+    over = []
+    if result['p95_ms'] > budget['total_ms']:
+        over.append('total_ms')
+    if result['peak_mb'] > budget['peak_mb']:
+        over.append('peak_mb')
+    if result['queries'] > budget['queries']:
+        over.append('queries')
+    return over
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark report views at a data scale')
+    parser.add_argument('--reports', nargs='+', choices=list(REPORTS), default=list(REPORTS))
+    parser.add_argument('--scale', choices=list(SCALES), help='Scale label (default: detected)')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs per report')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per report')
+    parser.add_argument('--budget-file', help='JSON budgets: {scale: {report or "*": {limit: value}}}')
+    add_output_arguments(parser, 'report_benchmarks')
+    args = parser.parse_args(argv)
+
+    app = create_benchmark_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        items = db.session.query(func.count(Item.item_id)).scalar()
+        transactions = db.session.query(func.count(Transaction.transaction_id)).scalar()
+        meta = environment(db, ('items', 'transactions', 'suppliers', 'categories'))
+        db.session.remove()
+
+    scale = args.scale or detect_scale(items, transactions)
+    budgets = load_budgets(args.budget_file, scale)
+    meta.update(scale=scale, warmup=args.warmup, repeat=args.repeat, budgets=budgets)
+    print(f'Scale {scale}: {items:,} items, {transactions:,} transactions')
+
+    profile = RequestProfile()
+    profile.attach(app)
+    client = app.test_client()
+    results = []
+    try:
+        for name in args.reports:
+            result = benchmark_report(app, client, profile, name, args.warmup, args.repeat)
+            over = check_budget(result, budgets[name])
+            result.update(
+                scale=scale,
+                budget_ms=budgets[name]['total_ms'],
+                over_budget=','.join(over) or None
+            )
+            results.append(result)
+            print(f"{name:<22} p95 {result['p95_ms']:>10,.1f} ms{'  OVER ' + result['over_budget'] if over else ''}")
+    finally:
+        profile.detach(app)
+
+    print_table(results, RESULT_COLUMNS)
+    for path in write_results(args.output, args.format, meta, results, RESULT_COLUMNS):
+        print(f'✓ Results written to {path}')
+
+    failed = [result['report'] for result in results if result['over_budget']]
+    if failed:
+        print(f"✗ Over budget: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
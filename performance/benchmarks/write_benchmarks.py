@@ -0,0 +1,351 @@
+"""
+Write-Throughput Benchmarks
+Drives the stock movement path (transaction_service.record_movement for
+single movements, record_movements for batches) from a thread pool or a
+process pool and measures how many movements per second it sustains and
+how it degrades under contention.
+
+Scenarios are the product of --executors, --workers, --distributions
+(uniform, or Zipf-skewed so a few hot SKUs take most of the traffic)
+and --batch-sizes (1 to 10,000 movements per call). For each one the
+report gives throughput, per-call latency percentiles, rejected
+movements (insufficient stock), deadlock and other retryable-conflict
+counts, and a ledger consistency check: every touched item's stock
+change must equal the signed sum of the ledger rows written during the
+run. Run it against a dedicated database: concurrent outside writers
+break the consistency check.
+
+Usage, from the project root with DATABASE_URL set:
+
+    python -m performance.benchmarks.write_benchmarks --executors thread process \\
+        --workers 1 4 16 --distributions uniform zipf --batch-sizes 1 100 10000
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from sqlalchemy import func, case
+from sqlalchemy.exc import DBAPIError
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.services import transaction_service, valuation_service, reference_cache
+from invent_app.services.transaction_service import STOCK_DIRECTION, StockError
+from performance.benchmarks.harness import (
+    create_benchmark_app, latency_stats, environment,
+    add_output_arguments, write_results, print_table
+)
+
+
+EXECUTORS = ('thread', 'process')
+DISTRIBUTIONS = ('uniform', 'zipf')
+
+RESULT_COLUMNS = [
+    'executor', 'workers', 'distribution', 'batch_size', 'movements', 'applied',
+    'rejected', 'failed', 'retries', 'deadlocks', 'seconds', 'movements_per_sec',
+    'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'consistent', 'mismatched_items'
+]
+
+# SQLSTATE / driver codes worth retrying
+DEADLOCK_CODES = {'40P01', '1213'}
+RETRYABLE_CODES = DEADLOCK_CODES | {'40001', '55P03', '1205'}
+
+# Flask app of a pool worker process
+_worker_app = None
+
+
+# WORKLOAD
+
+def make_workload(item_ids, movements, distribution='uniform', zipf_exponent=1.1,
+                  out_ratio=0.5, max_quantity=5, seed=42):
+    """
+    Seeded list of movement dicts in the record_movements format
+
+    Args:
+        item_ids: Items to move
+        movements: Number of movements
+        distribution: 'uniform', or 'zipf' (item at popularity rank k
+            drawn with probability proportional to 1 / k**zipf_exponent;
+            ranks are shuffled over the ids)
+        out_ratio: Share of STOCK_OUT movements (the rest are STOCK_IN)
+        max_quantity: Units per movement are drawn from 1..max_quantity
+    """
+    rng = np.random.default_rng(seed)
+    item_ids = np.asarray(item_ids)
+
+    if distribution == 'zipf':
+        ranked = rng.permutation(item_ids)
+        weights = 1.0 / np.arange(1, len(ranked) + 1) ** zipf_exponent
+        picks = rng.choice(ranked, size=movements, p=weights / weights.sum())
+    else:
+        picks = rng.choice(item_ids, size=movements)
+
+    outs = rng.random(movements) < out_ratio
+    quantities = rng.integers(1, max_quantity + 1, size=movements)
+    return [
+        {'item_id': int(item_id), 'type': 'STOCK_OUT' if out else 'STOCK_IN', 'quantity': int(quantity)}
+        for item_id, out, quantity in zip(picks, outs, quantities)
+    ]
+
+
+def _batches(workload, batch_size):
+    return [workload[start:start + batch_size] for start in range(0, len(workload), batch_size)]
+
+
+# EXECUTION
+
+def run_batches(batches, retries=3):
+    """
+    Apply batches of movements in the current app context
+
+    Single-movement batches use record_movement, larger ones
+    record_movements. Deadlocks, serialization failures, lock timeouts
+    and concurrent-change errors are rolled back and retried up to
+    `retries` times with a short backoff.
+
+    Returns:
+        dict: latencies (seconds per call, retries included), applied,
+        rejected, failed, retries, deadlocks, started, finished
+        (wall-clock seconds)
+    """
+    stats = {
+        'latencies': [], 'applied': 0, 'rejected': 0, 'failed': 0,
+        'retries': 0, 'deadlocks': 0, 'started': time.time(),
+    }
+    for batch in batches:
+        started = time.perf_counter()
+        for attempt in range(retries + 1):
+            try:
+                applied, rejected = _apply(batch)
+            except StockError as e:
+                db.session.rollback()
+                conflict = 'concurrently' in str(e)
+                if not conflict:
+                    stats['rejected'] += len(batch)
+                    break
+            except DBAPIError as e:
+                db.session.rollback()
+                kind = _classify(e)
+                if kind is None:
+                    stats['failed'] += len(batch)
+                    break
+                if kind == 'deadlock':
+                    stats['deadlocks'] += 1
+            else:
+                stats['applied'] += applied
+                stats['rejected'] += rejected
+                break
+
+            if attempt == retries:
+                stats['failed'] += len(batch)
+            else:
+                stats['retries'] += 1
+                time.sleep(0.005 * 2 ** attempt)
+        stats['latencies'].append(time.perf_counter() - started)
+
+    db.session.remove()
+    stats['finished'] = time.time()
+    return stats
+
+
+def _apply(batch):
+    """Apply one batch; return (applied, rejected) movement counts"""
+    if len(batch) == 1:
+        movement = batch[0]
+        transaction_service.record_movement(
+            movement['item_id'], movement['type'], movement['quantity']
+        )
+        return 1, 0
+
+    results = transaction_service.record_movements(batch)
+    applied = sum(1 for result in results if result['status'] == 'ok')
+    return applied, len(batch) - applied
+
+
+def _classify(error):
+    """'deadlock', 'retry' or None for a DBAPI error"""
+    original = error.orig
+    code = getattr(original, 'pgcode', None)
+    if code is None and getattr(original, 'args', None):
+        code = original.args[0]
+    code = str(code) if code is not None else ''
+
+    if code in DEADLOCK_CODES or 'deadlock' in str(original).lower():
+        return 'deadlock'
+    if code in RETRYABLE_CODES or 'database is locked' in str(original):
+        return 'retry'
+    return None
+
+
+def _run_in_thread(app, batches, retries):
+    with app.app_context():
+        return run_batches(batches, retries)
+
+
+def _init_worker():
+    """Build the Flask app once per pool process"""
+    global _worker_app
+    _worker_app = create_benchmark_app()
+
+
+def _run_in_process(batches, retries):
+    with _worker_app.app_context():
+        return run_batches(batches, retries)
+
+
+def _ready(_):
+    return True
+
+
+# SCENARIOS
+
+def run_scenario(app, executor, workers, workload, batch_size, retries=3, start_method='spawn'):
+    """
+    Apply a workload with a pool and check the ledger afterwards
+
+    Args:
+        app: Flask app (the caller holds its app context)
+        executor: 'thread' or 'process'
+        workers: Pool size
+        workload: Movement dicts from make_workload()
+        batch_size: Movements per call
+
+    Returns:
+        dict: Result row (see RESULT_COLUMNS)
+    """
+    batches = _batches(workload, batch_size)
+    shares = [batches[index::workers] for index in range(workers)]
+    shares = [share for share in shares if share]
+    item_ids = sorted({movement['item_id'] for movement in workload})
+    before = _stock_levels(item_ids)
+    watermark = db.session.query(func.max(Transaction.transaction_id)).scalar() or 0
+    db.session.remove()
+
+    if executor == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(lambda share: _run_in_thread(app, share, retries), shares))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker
+        ) as pool:
+            # Start every process before the clock runs
+            list(pool.map(_ready, range(workers)))
+            outcomes = list(pool.map(_run_in_process, shares, itertools.repeat(retries)))
+
+    mismatched = _check_ledger(item_ids, before, watermark)
+    seconds = max(o['finished'] for o in outcomes) - min(o['started'] for o in outcomes)
+    totals = {
+        key: sum(o[key] for o in outcomes)
+        for key in ('applied', 'rejected', 'failed', 'retries', 'deadlocks')
+    }
+    latencies = list(itertools.chain.from_iterable(o['latencies'] for o in outcomes))
+    stats = latency_stats(latencies)
+
+    return dict(
+        executor=executor,
+        workers=workers,
+        batch_size=batch_size,
+        movements=len(workload),
+        seconds=seconds,
+        movements_per_sec=totals['applied'] / seconds if seconds else 0.0,
+        consistent=not mismatched,
+        mismatched_items=len(mismatched),
+        **totals,
+        **{key: stats.get(key) for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')}
+    )
+
+
+def _stock_levels(item_ids):
+    levels = {}
+    for start in range(0, len(item_ids), transaction_service.BULK_CHUNK_SIZE):
+        chunk = item_ids[start:start + transaction_service.BULK_CHUNK_SIZE]
+        levels.update(
+            db.session.query(Item.item_id, Item.current_stock).filter(Item.item_id.in_(chunk))
+        )
+    return levels
+
+
+def _check_ledger(item_ids, before, watermark):
+    """Items whose stock change differs from the ledger rows written since watermark"""
+    type_ids = reference_cache.transaction_type_ids()
+    signed = case(
+        {type_ids[name]: sign for name, sign in STOCK_DIRECTION.items() if name in type_ids},
+        value=Transaction.type_id,
+        else_=0
+    ) * Transaction.quantity
+    ledger = dict(
+        db.session.query(Transaction.item_id, func.sum(signed))
+        .filter(Transaction.transaction_id > watermark)
+        .group_by(Transaction.item_id)
+    )
+    after = _stock_levels(item_ids)
+    return [
+        item_id for item_id in item_ids
+        if after.get(item_id, 0) - before.get(item_id, 0) != int(ledger.get(item_id) or 0)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark concurrent stock movement throughput')
+    parser.add_argument('--executors', nargs='+', choices=EXECUTORS, default=['thread'])
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 4, 8])
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 100, 10000])
+    parser.add_argument('--movements', type=int, default=10000, help='Movements per scenario')
+    parser.add_argument('--items', type=int, help='Only move the first N items (smaller hot set)')
+    parser.add_argument('--zipf-exponent', type=float, default=1.1)
+    parser.add_argument('--out-ratio', type=float, default=0.5, help='Share of STOCK_OUT movements')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per conflicting call')
+    parser.add_argument('--start-method', default='spawn', help='multiprocessing start method')
+    parser.add_argument('--seed', type=int, default=42)
+    add_output_arguments(parser, 'write_benchmarks')
+    args = parser.parse_args(argv)
+
+    app = create_benchmark_app()
+    results = []
+    with app.app_context():
+        query = db.session.query(Item.item_id).order_by(Item.item_id)
+        if args.items:
+            query = query.limit(args.items)
+        item_ids = [item_id for (item_id,) in query]
+        if not item_ids:
+            sys.exit('No items to move; load data with scripts/generate_test_data.py first')
+
+        meta = environment(db, ('items', 'transactions'))
+        meta.update({key: value for key, value in vars(args).items() if key not in ('output', 'format')})
+
+        scenarios = itertools.product(args.distributions, args.batch_sizes, args.executors, args.workers)
+        for distribution, batch_size, executor, workers in scenarios:
+            workload = make_workload(
+                item_ids, args.movements, distribution, args.zipf_exponent,
+                args.out_ratio, seed=args.seed
+            )
+            result = run_scenario(
+                app, executor, workers, workload, batch_size, args.retries, args.start_method
+            )
+            result['distribution'] = distribution
+            results.append(result)
+            print(
+                f"{executor:>7} x{workers:<3} {distribution:<7} batch {batch_size:>5}: "
+                f"{result['movements_per_sec']:,.0f} movements/s"
+            )
+
+        valuation_drift = valuation_service.verify()
+        meta['valuation_consistent'] = not valuation_drift
+
+    print_table(results, RESULT_COLUMNS)
+    if valuation_drift:
+        print(f'✗ category_valuation drifted for {len(valuation_drift)} categories')
+    for path in write_results(args.output, args.format, meta, results, RESULT_COLUMNS):
+        print(f'✓ Results written to {path}')
+    return 0 if all(r['consistent'] for r in results) and not valuation_drift else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
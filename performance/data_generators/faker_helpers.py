@@ -0,0 +1,86 @@
+"""
+Faker Helpers
+Small seeded string pools built with Faker, and vectorized picks from
+them. Faker is slow per call, so it only ever produces a few hundred
+strings; the generators combine pool entries by NumPy index arrays to
+name millions of rows.
+"""
+
+import numpy as np
+from faker import Faker
+
+
+# Entries per pool; combinations of pools give the variety
+POOL_SIZE = 300
+
+CATEGORY_NAMES = [
+    'Electronics', 'Office Supplies', 'Hardware', 'Furniture', 'Networking',
+    'Storage', 'Cleaning', 'Safety Equipment', 'Packaging', 'Kitchen',
+    'Lighting', 'Plumbing', 'Electrical', 'Tools', 'Fasteners',
+    'Paper Products', 'Printing', 'Medical', 'Automotive', 'Garden',
+]
+
+PRODUCT_NOUNS = [
+    'Adapter', 'Bracket', 'Cable', 'Chair', 'Charger', 'Clamp', 'Cleaner',
+    'Desk', 'Drill', 'Filter', 'Fuse', 'Gloves', 'Hinge', 'Hub', 'Keyboard',
+    'Lamp', 'Marker', 'Monitor', 'Mouse', 'Notebook', 'Pallet', 'Panel',
+    'Printer', 'Pump', 'Router', 'Scanner', 'Screw', 'Sensor', 'Shelf',
+    'Switch', 'Tape', 'Toner', 'Valve', 'Wrench',
+]
+
+WAREHOUSES = ['Main', 'North', 'South', 'East', 'West']
+
+
+def faker(seed):
+    """A Faker instance with its own seeded random state"""
+    fake = Faker()
+    fake.seed_instance(seed)
+    return fake
+
+
+def string_pools(seed, size=POOL_SIZE):
+    """
+    Seeded pools of strings for names, contacts and descriptions
+
+    Returns:
+        dict: name -> NumPy array of strings (companies, brands, people,
+        adjectives, nouns, sentences, cities)
+    """
+    fake = faker(seed)
+    return {
+        'companies': np.array(_unique(fake.company, size)),
+        'brands': np.array(_unique(fake.last_name, size)),
+        'people': np.array(_unique(fake.name, size)),
+        'adjectives': np.array(_unique(lambda: fake.word().capitalize(), size)),
+        'nouns': np.array(PRODUCT_NOUNS),
+        'sentences': np.array([fake.sentence(nb_words=8) for _ in range(size)]),
+        'cities': np.array(_unique(fake.city, size)),
+    }
+
+
+def _unique(make, size, attempts=20):
+    """Up to size distinct values from a Faker provider"""
+    values = set()
+    for _ in range(size * attempts):
+        values.add(make())
+        if len(values) >= size:
+            break
+    return sorted(values)
+
+
+def pick(rng, pool, count):
+    """count entries drawn from a pool, as a NumPy string array"""
+    return pool[rng.integers(0, len(pool), size=count)]
+
+
+def join(*parts, sep=' '):
+    """Element-wise concatenation of string arrays (or scalars)"""
+    result = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        result = np.char.add(np.char.add(result, sep), np.asarray(part).astype(str))
+    return result
+
+
+def numbered(prefix, numbers, width):
+    """Codes like SKU-0000042 for an array of integers"""
+    return np.char.add(prefix, np.char.zfill(np.asarray(numbers).astype(str), width))
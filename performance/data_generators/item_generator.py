@@ -0,0 +1,97 @@
+"""
+Item Generator
+Categories, suppliers, locations and items as NumPy column arrays
+(dict of column name -> array, in table column order), ready for
+loader.load_columns(). Everything is drawn from one seeded Generator,
+so a given seed always produces the same catalogue.
+
+Items are created with current_stock 0: the generate_test_data script
+sets it from the generated ledger once transactions are loaded.
+"""
+
+import numpy as np
+from performance.data_generators import faker_helpers as fh
+
+
+def generate_categories(count, now):
+    """Category rows with ids 1..count (realistic names first)"""
+    names = list(fh.CATEGORY_NAMES[:count])
+    names += [f'Category {number}' for number in range(len(names) + 1, count + 1)]
+    return {
+        'category_id': np.arange(1, count + 1),
+        'category_name': np.array(names),
+        'description': np.char.add('Stock of ', np.char.lower(np.array(names))),
+        'created_at': np.full(count, now, dtype='datetime64[s]'),
+    }
+
+
+def generate_suppliers(rng, pools, count, now):
+    """Supplier rows with ids 1..count"""
+    ids = np.arange(1, count + 1)
+    companies = fh.pick(rng, pools['companies'], count)
+    people = fh.pick(rng, pools['people'], count)
+    handles = np.char.replace(np.char.lower(people), ' ', '.')
+    return {
+        'supplier_id': ids,
+        'supplier_name': companies,
+        'contact_person': people,
+        'email': np.char.add(handles, fh.numbered('@supplier', ids, 4)).astype(str) + '.example.com',
+        'phone': fh.numbered('+1-555-', rng.integers(0, 10_000, size=count), 4),
+        'address': fh.join(fh.pick(rng, pools['cities'], count), 'Industrial Park', sep=', '),
+        'created_at': np.full(count, now, dtype='datetime64[s]'),
+    }
+
+
+def generate_locations(rng, count, now):
+    """Location rows with ids 1..count spread over the warehouses"""
+    ids = np.arange(1, count + 1)
+    return {
+        'location_id': ids,
+        'warehouse': fh.pick(rng, np.array(fh.WAREHOUSES), count),
+        'aisle': fh.numbered('A', rng.integers(1, 41, size=count), 2),
+        'shelf': fh.numbered('S', rng.integers(1, 10, size=count), 1),
+        'bin': fh.numbered('B', rng.integers(1, 51, size=count), 2),
+        'created_at': np.full(count, now, dtype='datetime64[s]'),
+    }
+
+
+def generate_items(rng, pools, count, category_count, supplier_count, location_count,
+                   created_before, history_days=365):
+    """
+    Item rows with ids 1..count
+
+    Prices are log-normal (median about 20, long tail), reorder levels
+    5-50, and creation dates spread over history_days before
+    created_before, so every item exists before its first movement.
+
+    Args:
+        created_before: numpy datetime64 upper bound for created_at
+
+    Returns:
+        dict: Column arrays (current_stock all zero)
+    """
+    ids = np.arange(1, count + 1)
+    created_at = (
+        np.datetime64(created_before, 's')
+        - rng.integers(1, history_days * 86400, size=count).astype('timedelta64[s]')
+    )
+    prices = np.clip(np.round(rng.lognormal(mean=3.0, sigma=1.0, size=count), 2), 0.5, 5000)
+    return {
+        'item_id': ids,
+        'item_code': fh.numbered('SKU-', ids, 7),
+        'item_name': fh.join(
+            fh.pick(rng, pools['brands'], count),
+            fh.pick(rng, pools['adjectives'], count),
+            fh.pick(rng, pools['nouns'], count),
+            fh.numbered('M', rng.integers(100, 1000, size=count), 3)
+        ),
+        'description': fh.pick(rng, pools['sentences'], count),
+        'category_id': rng.integers(1, category_count + 1, size=count),
+        'supplier_id': rng.integers(1, supplier_count + 1, size=count),
+        'location_id': rng.integers(1, location_count + 1, size=count),
+        'unit_price': prices,
+        'current_stock': np.zeros(count, dtype=np.int64),
+        'reorder_level': rng.integers(5, 51, size=count),
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
@@ -0,0 +1,111 @@
+"""
+Bulk Loader
+Streams NumPy column arrays into a table in chunks, bypassing the ORM:
+
+- PostgreSQL (psycopg2): COPY ... FROM STDIN (FORMAT csv)
+- other databases: one driver-level executemany per chunk
+
+Load through a connection from db.engine.begin(); the caller decides
+how much goes into one transaction.
+"""
+
+import csv
+import io
+import numpy as np
+from sqlalchemy import insert, text
+from invent_app import db
+
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Driver paramstyle -> positional placeholder
+PLACEHOLDERS = {'qmark': '?', 'format': '%s', 'pyformat': '%s'}
+
+
+def prepare(connection):
+    """
+    Speed up a loading connection
+
+    SQLite skips fsync for the load (generated data can be regenerated).
+    """
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql('PRAGMA synchronous = OFF')
+
+
+def load_columns(connection, table_name, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert column arrays into a table
+
+    Args:
+        connection: SQLAlchemy connection inside a transaction
+        table_name: Target table
+        columns: dict of column name -> array, all the same length;
+            None entries in object arrays become NULL
+
+    Returns:
+        int: Rows inserted
+    """
+    names = list(columns)
+    total = len(columns[names[0]])
+    copy = _copy_cursor(connection)
+    for start in range(0, total, chunk_size):
+        rows = list(zip(*[_values(columns[name][start:start + chunk_size]) for name in names]))
+        if copy is not None:
+            _copy_rows(copy, table_name, names, rows)
+        else:
+            _insert_rows(connection, table_name, names, rows)
+    return total
+
+
+def _values(array):
+    """Python values of an array slice (datetimes as ISO strings)"""
+    if np.issubdtype(array.dtype, np.datetime64):
+        return np.char.replace(np.datetime_as_string(array, unit='us'), 'T', ' ').tolist()
+    return array.tolist()
+
+
+def _copy_cursor(connection):
+    """psycopg2 cursor able to COPY, or None"""
+    if connection.dialect.name != 'postgresql':
+        return None
+    cursor = connection.connection.cursor()
+    return cursor if hasattr(cursor, 'copy_expert') else None
+
+
+def _copy_rows(cursor, table_name, names, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+
+def _insert_rows(connection, table_name, names, rows):
+    placeholder = PLACEHOLDERS.get(connection.dialect.paramstyle)
+    if placeholder is None:
+        table = db.metadata.tables[table_name]
+        connection.execute(insert(table), [dict(zip(names, row)) for row in rows])
+        return
+    connection.exec_driver_sql(
+        f"INSERT INTO {table_name} ({', '.join(names)}) "
+        f"VALUES ({', '.join([placeholder] * len(names))})",
+        rows
+    )
+
+
+def reset_sequences(connection, tables):
+    """
+    Move PostgreSQL id sequences past ids loaded explicitly
+
+    Args:
+        tables: dict of table name -> primary key column
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    for table_name, column in tables.items():
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', '{column}'), "
+            f"COALESCE((SELECT MAX({column}) FROM {table_name}), 0) + 1, false)"
+        ))
@@ -0,0 +1,221 @@
+"""
+Transaction Generator
+Stock movements as NumPy column arrays, generated in chronological
+chunks so 10M+ rows never sit in memory at once.
+
+Demand is realistic rather than uniform:
+- item popularity follows a Zipf law over a shuffled ranking, so a few
+  items account for most movements
+- daily volume follows a yearly seasonal curve with quieter weekends
+- receipts are sized so supply roughly tracks demand per item
+
+The ledger is always consistent with stock. Each chunk updates every
+item's running balance and its lowest point so far; once all chunks are
+generated, openings() returns one opening STOCK_IN per item, dated at
+the item's creation, large enough that the balance never goes negative.
+current_stock is then exactly opening + net movements.
+"""
+
+import numpy as np
+
+
+# Share of movements by type (the rest are STOCK_OUT)
+STOCK_IN_SHARE = 0.30
+RETURN_SHARE = 0.05
+
+# Mean units per STOCK_OUT (geometric distribution)
+MEAN_OUT_QUANTITY = 3.0
+
+# Receipts cover this much of the expected demand; openings cover the rest
+REPLENISH_RATIO = 1.02
+
+# Seasonal swing of daily volume (+/- share of the mean) and its peak day of year
+SEASONAL_AMPLITUDE = 0.35
+SEASONAL_PEAK_DAY = 330
+
+# Weekend volume relative to a weekday
+WEEKEND_FACTOR = 0.4
+
+# Movements happen between 08:00 and 18:00
+BUSINESS_START_SECONDS = 8 * 3600
+BUSINESS_SECONDS = 10 * 3600
+
+# Ledger columns produced, in insert order
+TRANSACTION_COLUMNS = (
+    'item_id', 'type_id', 'quantity', 'unit_price', 'supplier_id',
+    'reference_number', 'notes', 'transaction_date'
+)
+
+
+def day_weights(start_date, days, amplitude=SEASONAL_AMPLITUDE, weekend_factor=WEEKEND_FACTOR):
+    """
+    Relative movement volume of each day from start_date
+
+    Returns:
+        ndarray: days weights summing to 1
+    """
+    dates = np.datetime64(start_date, 'D') + np.arange(days)
+    day_of_year = (dates - dates.astype('datetime64[Y]')).astype(int)
+    weights = 1 + amplitude * np.cos(2 * np.pi * (day_of_year - SEASONAL_PEAK_DAY) / 365.25)
+    # 1970-01-01 was a Thursday: weekday 5/6 are Saturday/Sunday
+    weekday = (dates.astype(int) + 3) % 7
+    weights = np.where(weekday >= 5, weights * weekend_factor, weights)
+    return weights / weights.sum()
+
+
+def zipf_cdf(rng, count, exponent):
+    """Cumulative Zipf popularity over count items in a random rank order"""
+    ranks = rng.permutation(count) + 1
+    weights = 1.0 / ranks.astype(float) ** exponent
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+class TransactionGenerator:
+    """
+    Seeded movement stream for a generated catalogue
+
+    Args:
+        rng: numpy Generator
+        items: Item column arrays from item_generator.generate_items()
+        type_ids: Transaction type name -> type_id
+        start_date, end_date: Date range of the movements (end exclusive)
+        total: Number of movements (opening receipts come on top)
+        zipf_exponent: Skew of item popularity (0 = uniform)
+    """
+
+    def __init__(self, rng, items, type_ids, start_date, end_date, total, zipf_exponent=1.1):
+        self.rng = rng
+        self.item_ids = items['item_id']
+        self.supplier_ids = items['supplier_id']
+        self.unit_prices = items['unit_price']
+        self.reorder_levels = items['reorder_level']
+        self.created_at = items['created_at']
+        self.type_ids = type_ids
+
+        self.start = np.datetime64(start_date, 'D')
+        self.days = int((np.datetime64(end_date, 'D') - self.start).astype(int))
+        if self.days < 1:
+            raise ValueError('end_date must be after start_date')
+
+        self.total = total
+        self.day_counts = rng.multinomial(total, day_weights(self.start, self.days))
+        self.popularity = zipf_cdf(rng, len(self.item_ids), zipf_exponent)
+
+        out_share = 1 - STOCK_IN_SHARE - RETURN_SHARE
+        self.mean_in_quantity = max(
+            MEAN_OUT_QUANTITY * out_share / STOCK_IN_SHARE * REPLENISH_RATIO - RETURN_SHARE * 2, 1
+        )
+
+        # Per item: net movement so far and the lowest running balance
+        self.balance = np.zeros(len(self.item_ids), dtype=np.int64)
+        self.lowest = np.zeros(len(self.item_ids), dtype=np.int64)
+        self.generated = 0
+
+    def chunks(self, chunk_size=500_000):
+        """
+        Yield chronological chunks of about chunk_size movements
+
+        Chunks cover whole days, so they come out in date order and
+        the running balances stay correct.
+        """
+        first_day = 0
+        while first_day < self.days:
+            cumulative = np.cumsum(self.day_counts[first_day:])
+            last_day = first_day + int(np.searchsorted(cumulative, chunk_size, side='right'))
+            last_day = min(max(last_day, first_day + 1), self.days)
+            chunk = self._generate(first_day, last_day)
+            first_day = last_day
+            if len(chunk['item_id']):
+                yield chunk
+
+    def _generate(self, first_day, last_day):
+        """Movements for days [first_day, last_day), sorted by time"""
+        rng = self.rng
+        counts = self.day_counts[first_day:last_day]
+        size = int(counts.sum())
+
+        day = np.repeat(np.arange(first_day, last_day), counts)
+        seconds = day * 86400 + BUSINESS_START_SECONDS + rng.integers(0, BUSINESS_SECONDS, size=size)
+        order = np.argsort(seconds, kind='stable')
+        seconds = seconds[order]
+        dates = self.start.astype('datetime64[s]') + seconds.astype('timedelta64[s]')
+
+        index = np.searchsorted(self.popularity, rng.random(size), side='right')
+        index = np.minimum(index, len(self.item_ids) - 1)
+
+        draw = rng.random(size)
+        is_in = draw < STOCK_IN_SHARE
+        is_return = ~is_in & (draw < STOCK_IN_SHARE + RETURN_SHARE)
+        is_out = ~is_in & ~is_return
+
+        quantity = rng.geometric(1 / MEAN_OUT_QUANTITY, size=size)
+        quantity[is_in] = rng.poisson(self.mean_in_quantity - 1, size=int(is_in.sum())) + 1
+        quantity[is_return] = rng.integers(1, 3, size=int(is_return.sum()))
+
+        type_id = np.full(size, self.type_ids['STOCK_OUT'], dtype=np.int64)
+        type_id[is_in] = self.type_ids['STOCK_IN']
+        type_id[is_return] = self.type_ids['RETURN']
+
+        self._track(index, np.where(is_out, -quantity, quantity))
+
+        supplier = np.where(is_in, self.supplier_ids[index], None)
+        numbers = np.arange(self.generated, self.generated + size)
+        reference = np.where(
+            is_in, np.char.add('PO-', np.char.zfill(numbers.astype(str), 9)),
+            np.where(is_out, np.char.add('SO-', np.char.zfill(numbers.astype(str), 9)), None)
+        )
+        self.generated += size
+
+        return {
+            'item_id': self.item_ids[index],
+            'type_id': type_id,
+            'quantity': quantity,
+            'unit_price': self.unit_prices[index],
+            'supplier_id': supplier,
+            'reference_number': reference,
+            'notes': np.full(size, None, dtype=object),
+            'transaction_date': dates,
+        }
+
+    def _track(self, index, signed):
+        """Fold a time-ordered chunk into running balances and their minimums"""
+        by_item = np.argsort(index, kind='stable')
+        items = index[by_item]
+        signed = signed[by_item]
+
+        starts = np.flatnonzero(np.r_[True, items[1:] != items[:-1]])
+        running = np.cumsum(signed)
+        before_group = np.repeat(running[starts] - signed[starts], np.diff(np.r_[starts, len(items)]))
+        prefix = running - before_group
+
+        touched = items[starts]
+        group_lowest = np.minimum.reduceat(prefix, starts)
+        self.lowest[touched] = np.minimum(self.lowest[touched], self.balance[touched] + group_lowest)
+        self.balance[touched] += np.add.reduceat(signed, starts)
+
+    def openings(self):
+        """
+        Opening STOCK_IN per item, called after every chunk is generated
+
+        Each opening is the larger of a normal starting level (one to
+        four reorder levels) and the deficit the item ran into, so no
+        item's balance ever drops below zero.
+        """
+        count = len(self.item_ids)
+        normal = self.rng.integers(self.reorder_levels, self.reorder_levels * 4 + 1, size=count)
+        quantity = np.maximum(normal, -self.lowest)
+        return {
+            'item_id': self.item_ids,
+            'type_id': np.full(count, self.type_ids['STOCK_IN'], dtype=np.int64),
+            'quantity': quantity,
+            'unit_price': self.unit_prices,
+            'supplier_id': self.supplier_ids,
+            'reference_number': np.full(count, 'OPENING'),
+            'notes': np.full(count, 'Opening balance'),
+            'transaction_date': self.created_at,
+        }
+
+    def final_stock(self, openings):
+        """Expected current_stock per item once openings are loaded"""
+        return openings['quantity'] + self.balance
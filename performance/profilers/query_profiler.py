@@ -0,0 +1,396 @@
+"""
+Query Profiler
+Per-endpoint database profile of live traffic, collected from
+SQLAlchemy cursor events on every engine (primary and replicas):
+
+- query count and DB time per request, aggregated by endpoint
+- the slowest statements seen for each endpoint
+- duplicate statements: the same SQL run QUERY_PROFILER_DUPLICATE_THRESHOLD
+  or more times in one request, the usual sign of an N+1 lazy load
+- the execution plan of statements slower than QUERY_PROFILER_SLOW_MS,
+  captured with EXPLAIN (ANALYZE) on PostgreSQL / MySQL and EXPLAIN
+  QUERY PLAN on SQLite
+
+Plan capture is off unless QUERY_PROFILER_EXPLAIN is set: EXPLAIN
+ANALYZE runs the statement again. When on, plans are captured on a
+background thread after the request, at most once per statement every
+QUERY_PROFILER_EXPLAIN_INTERVAL seconds, and only for plain SELECTs.
+
+Aggregates live in the worker process; the performance report shows
+those of the worker that serves it.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from flask import current_app, g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+EXTENSION_KEY = 'query_profiler'
+
+# Statements kept per endpoint
+SLOWEST_PER_ENDPOINT = 5
+DUPLICATES_PER_ENDPOINT = 5
+
+# Captured plans kept (least recently captured dropped first)
+PLAN_CACHE_SIZE = 100
+
+# Endpoints never profiled
+IGNORED_ENDPOINTS = {'static'}
+
+# Placeholder lists from expanding IN parameters: (?, ?, ?) -> (?)
+_PLACEHOLDER_LIST = re.compile(
+    r'\(\s*(\?|%s|%\(\w+\)s|:\w+)(\s*,\s*(\?|%s|%\(\w+\)s|:\w+))+\s*\)'
+)
+_WHITESPACE = re.compile(r'\s+')
+
+
+class EndpointStats:
+    """Running totals for one endpoint"""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_seconds = 0.0
+        self.max_db_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.duplicate_requests = 0
+        self.last_seen = None
+        # statement -> seconds of its slowest single run
+        self.slowest = {}
+        # statement -> highest repeat count seen in one request
+        self.duplicates = {}
+
+    def add(self, profile, wall_seconds, duplicates):
+        self.requests += 1
+        self.queries += profile.queries
+        self.max_queries = max(self.max_queries, profile.queries)
+        self.db_seconds += profile.db_seconds
+        self.max_db_seconds = max(self.max_db_seconds, profile.db_seconds)
+        self.wall_seconds += wall_seconds
+        self.last_seen = datetime.now(timezone.utc)
+
+        for statement, seconds in profile.slowest.items():
+            if seconds > self.slowest.get(statement, 0):
+                self.slowest[statement] = seconds
+        _keep_top(self.slowest, SLOWEST_PER_ENDPOINT)
+
+        if duplicates:
+            self.duplicate_requests += 1
+            for statement, count in duplicates.items():
+                self.duplicates[statement] = max(self.duplicates.get(statement, 0), count)
+            _keep_top(self.duplicates, DUPLICATES_PER_ENDPOINT)
+
+    def summary(self, plans):
+        requests = self.requests or 1
+        return {
+            'endpoint': self.endpoint,
+            'requests': self.requests,
+            'avg_queries': self.queries / requests,
+            'max_queries': self.max_queries,
+            'avg_db_ms': self.db_seconds * 1000 / requests,
+            'max_db_ms': self.max_db_seconds * 1000,
+            'avg_ms': self.wall_seconds * 1000 / requests,
+            'db_share': self.db_seconds / self.wall_seconds if self.wall_seconds else 0.0,
+            'duplicate_requests': self.duplicate_requests,
+            'last_seen': self.last_seen,
+            'slowest': [
+                {'statement': statement, 'ms': seconds * 1000, 'plan': plans.get(statement)}
+                for statement, seconds in sorted(self.slowest.items(), key=lambda entry: -entry[1])
+            ],
+            'duplicates': [
+                {'statement': statement, 'count': count}
+                for statement, count in sorted(self.duplicates.items(), key=lambda entry: -entry[1])
+            ],
+        }
+
+
+class RequestProfile:
+    """
+    Statements run by the request in progress
+
+    Args:
+        slow_seconds: Runs at least this slow are kept for EXPLAIN
+            (None keeps none)
+    """
+
+    def __init__(self, slow_seconds=None):
+        self.slow_seconds = slow_seconds
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.counts = Counter()
+        # statement -> slowest run in this request
+        self.slowest = {}
+        # statement -> (engine, raw statement, parameters) of slow runs
+        self.slow_runs = {}
+
+
+class QueryProfiler:
+    """
+    Collects request query profiles and serves their aggregates
+
+    Args:
+        slow_ms: Statements at least this slow get their plan captured
+        duplicate_threshold: Repeats of one statement in a request that
+            count as an N+1 pattern
+        explain: Capture plans of slow statements
+        explain_interval: Seconds before the same statement is explained again
+    """
+
+    def __init__(self, slow_ms=100, duplicate_threshold=5, explain=False, explain_interval=300):
+        self.slow_seconds = slow_ms / 1000
+        self.duplicate_threshold = duplicate_threshold
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.started_at = datetime.now(timezone.utc)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        # statement -> plan dict, in capture order
+        self._plans = OrderedDict()
+        self._explained_at = {}
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='explain')
+
+    # Request hooks
+
+    def start_request(self):
+        if request.endpoint and request.endpoint not in IGNORED_ENDPOINTS:
+            g.query_profile = RequestProfile(self.slow_seconds if self.explain else None)
+
+    def finish_request(self, exc=None):
+        profile = g.pop('query_profile', None)
+        if profile is None:
+            return
+        wall_seconds = time.perf_counter() - profile.started
+        duplicates = {
+            statement: count for statement, count in profile.counts.items()
+            if count >= self.duplicate_threshold
+        }
+        with self._lock:
+            stats = self._endpoints.get(request.endpoint)
+            if stats is None:
+                stats = self._endpoints[request.endpoint] = EndpointStats(request.endpoint)
+            stats.add(profile, wall_seconds, duplicates)
+
+        if self.explain:
+            for key, run in profile.slow_runs.items():
+                self._schedule_explain(key, *run, seconds=profile.slowest[key])
+
+    # EXPLAIN capture
+
+    def _schedule_explain(self, key, engine, statement, parameters, seconds):
+        if not _explainable(statement):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained_at.get(key, -self.explain_interval) < self.explain_interval:
+                return
+            self._explained_at[key] = now
+        self._explainer.submit(self._capture_plan, key, engine, statement, parameters, seconds)
+
+    def _capture_plan(self, key, engine, statement, parameters, seconds):
+        try:
+            plan = explain(engine, statement, parameters)
+        except Exception as exc:
+            plan = f'EXPLAIN failed: {exc}'
+        if plan is None:
+            return
+        entry = {
+            'plan': plan,
+            'ms': seconds * 1000,
+            'captured_at': datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._plans[key] = entry
+            self._plans.move_to_end(key)
+            while len(self._plans) > PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+
+    # Reading
+
+    def snapshot(self):
+        """
+        Aggregates for every endpoint seen by this worker
+
+        Returns:
+            dict: started_at, pid, totals, endpoints (by total DB time),
+            slow statements with plans, duplicate statements
+        """
+        with self._lock:
+            plans = dict(self._plans)
+            endpoints = [stats.summary(plans) for stats in self._endpoints.values()]
+
+        endpoints.sort(key=lambda row: -row['avg_db_ms'] * row['requests'])
+        slow = sorted(
+            (dict(entry, endpoint=row['endpoint']) for row in endpoints for entry in row['slowest']),
+            key=lambda entry: -entry['ms']
+        )
+        duplicates = sorted(
+            (dict(entry, endpoint=row['endpoint']) for row in endpoints for entry in row['duplicates']),
+            key=lambda entry: -entry['count']
+        )
+        return {
+            'started_at': self.started_at,
+            'pid': os.getpid(),
+            'slow_ms': self.slow_seconds * 1000,
+            'explain': self.explain,
+            'duplicate_threshold': self.duplicate_threshold,
+            'requests': sum(row['requests'] for row in endpoints),
+            'queries': sum(row['avg_queries'] * row['requests'] for row in endpoints),
+            'db_ms': sum(row['avg_db_ms'] * row['requests'] for row in endpoints),
+            'endpoints': endpoints,
+            'slow_statements': slow,
+            'duplicates': duplicates,
+        }
+
+    def reset(self):
+        """Forget every aggregate and captured plan"""
+        with self._lock:
+            self._endpoints.clear()
+            self._plans.clear()
+            self._explained_at.clear()
+            self.started_at = datetime.now(timezone.utc)
+
+    def attach(self, app):
+        _listen_once()
+        app.before_request(self.start_request)
+        app.teardown_request(self.finish_request)
+
+
+# SQLALCHEMY EVENTS
+# Registered once per process on the Engine class and recording into
+# the profile of the current request (g), so several apps in one
+# process (tests, report job workers) never count a query twice.
+
+_listening = False
+_listening_lock = threading.Lock()
+
+
+def _listen_once():
+    global _listening
+    with _listening_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+            _listening = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'query_profile' in g:
+        conn.info.setdefault('query_profiler_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_profiler_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    profile = g.get('query_profile') if has_request_context() else None
+    if profile is None:
+        return
+
+    key = normalize(statement)
+    profile.queries += 1
+    profile.db_seconds += elapsed
+    profile.counts[key] += 1
+    if elapsed > profile.slowest.get(key, 0):
+        profile.slowest[key] = elapsed
+        if profile.slow_seconds is not None and elapsed >= profile.slow_seconds and not executemany:
+            profile.slow_runs[key] = (conn.engine, statement, parameters)
+
+
+def _handle_error(context):
+    started = context.connection.info.get('query_profiler_started') if context.connection else None
+    if started:
+        started.pop()
+
+
+def init_app(app):
+    """Start profiling the app's requests if QUERY_PROFILER_ENABLED"""
+    if not app.config['QUERY_PROFILER_ENABLED']:
+        return None
+
+    profiler = QueryProfiler(
+        slow_ms=app.config['QUERY_PROFILER_SLOW_MS'],
+        duplicate_threshold=app.config['QUERY_PROFILER_DUPLICATE_THRESHOLD'],
+        explain=app.config['QUERY_PROFILER_EXPLAIN'],
+        explain_interval=app.config['QUERY_PROFILER_EXPLAIN_INTERVAL']
+    )
+    profiler.attach(app)
+    app.extensions[EXTENSION_KEY] = profiler
+    return profiler
+
+
+def profiler(app=None):
+    """Query profiler of an app (default: the current one), or None"""
+    app = app or current_app
+    return app.extensions.get(EXTENSION_KEY)
+
+
+# HELPER FUNCTIONS
+
+def normalize(statement):
+    """One line of SQL per statement shape (IN lists collapsed)"""
+    return _PLACEHOLDER_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+def _explainable(statement):
+    """Plain reads only: EXPLAIN ANALYZE executes the statement"""
+    text = statement.lstrip().upper()
+    if 'FOR UPDATE' in text or 'FOR SHARE' in text:
+        return False
+    if text.startswith('WITH'):
+        return not re.search(r'\b(INSERT|UPDATE|DELETE)\b', text)
+    return text.startswith('SELECT')
+
+
+def explain(engine, statement, parameters):
+    """
+    Execution plan of a statement as text
+
+    Runs on its own connection in a transaction that is rolled back.
+
+    Returns:
+        str: The plan, or None for dialects without EXPLAIN support
+    """
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    elif dialect in ('mysql', 'mariadb'):
+        prefix = 'EXPLAIN ANALYZE '
+    elif dialect == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        return None
+
+    with engine.connect() as connection:
+        try:
+            rows = connection.exec_driver_sql(prefix + statement, parameters or ()).all()
+        finally:
+            connection.rollback()
+
+    if dialect == 'sqlite':
+        # (id, parent, notused, detail): indent children under their parent
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node] + detail)
+        return '\n'.join(lines)
+    return '\n'.join(str(row[0]) for row in rows)
+
+
+def _keep_top(counts, size):
+    """Drop all but the size largest values of a dict"""
+    if len(counts) > size:
+        for key in sorted(counts, key=counts.get)[:len(counts) - size]:
+            del counts[key]
@@ -0,0 +1,238 @@
+"""
+Generate Test Data
+Fills the database named by DATABASE_URL with a seeded synthetic
+inventory: categories, suppliers, locations, items and a stock movement
+ledger with Zipf item popularity and seasonal daily volume. Rows are
+generated as NumPy arrays and streamed in with COPY (PostgreSQL) or
+executemany (SQLite), so millions of movements load in minutes.
+
+items.current_stock is set from the loaded ledger and checked against
+the generator's own balances, then the derived tables (rollups, read
+models, valuation, supplier stats, stock alerts) are rebuilt.
+
+Usage, from the project root on a migrated database:
+
+    python scripts/generate_test_data.py --scale 100k
+    python scripts/generate_test_data.py --items 5000 --transactions 200000 --truncate
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import case, delete, func, select, update
+from invent_app import create_app, db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.normalized.transaction_type import TransactionType
+from invent_app.services import (
+    rollup_service, read_model_sync, valuation_service, supplier_service, alert_service,
+    table_versions
+)
+from invent_app.services.transaction_service import STOCK_DIRECTION
+from performance.benchmarks.report_benchmarks import SCALES
+from performance.data_generators import faker_helpers, item_generator, loader
+from performance.data_generators.transaction_generator import TransactionGenerator
+
+
+TRANSACTION_TYPES = {
+    'STOCK_IN': 'Stock received from supplier',
+    'STOCK_OUT': 'Stock issued/sold',
+    'ADJUSTMENT': 'Stock adjustment/correction',
+    'RETURN': 'Stock returned from customer',
+}
+
+# Tables given explicit ids, for PostgreSQL sequence reset
+EXPLICIT_ID_TABLES = {
+    'categories': 'category_id',
+    'suppliers': 'supplier_id',
+    'locations': 'location_id',
+    'items': 'item_id',
+}
+
+# Tables kept by --truncate
+KEPT_TABLES = {'transaction_types', 'table_versions', 'alembic_version'}
+
+
+class Phases:
+    """Prints how long each step took"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+
+    def done(self, label, rows=None):
+        now = time.perf_counter()
+        elapsed = now - self.started
+        rate = f' ({rows / elapsed:,.0f} rows/s)' if rows and elapsed > 0 else ''
+        count = f'{rows:,} ' if rows is not None else ''
+        print(f'✓ {label}: {count}in {elapsed:,.1f}s{rate}')
+        self.started = now
+
+
+# HELPER FUNCTIONS
+
+def ensure_transaction_types():
+    """Create missing transaction types; return name -> type_id"""
+    existing = dict(db.session.query(TransactionType.type_name, TransactionType.type_id).all())
+    for name, description in TRANSACTION_TYPES.items():
+        if name not in existing:
+            db.session.add(TransactionType(type_name=name, description=description))
+    db.session.commit()
+    return dict(db.session.query(TransactionType.type_name, TransactionType.type_id).all())
+
+
+def truncate(connection):
+    """Delete all inventory data, keeping transaction types"""
+    for table in reversed(db.metadata.sorted_tables):
+        if table.name not in KEPT_TABLES:
+            connection.execute(delete(table))
+
+
+def set_current_stock(connection, type_ids):
+    """Set every item's current_stock to the net of its ledger"""
+    ledger = Transaction.__table__
+    signed = case(
+        *[
+            (ledger.c.type_id == type_ids[name], ledger.c.quantity * direction)
+            for name, direction in STOCK_DIRECTION.items()
+        ],
+        else_=0
+    )
+    net = select(func.sum(signed)).where(ledger.c.item_id == Item.__table__.c.item_id)
+    connection.execute(
+        update(Item.__table__).values(current_stock=func.coalesce(net.scalar_subquery(), 0))
+    )
+
+
+def stock_mismatches(connection, item_ids, expected):
+    """Number of items whose stored current_stock differs from expected"""
+    stored = dict(connection.execute(
+        select(Item.__table__.c.item_id, Item.__table__.c.current_stock)
+    ).all())
+    actual = np.array([stored.get(item_id, -1) for item_id in item_ids.tolist()])
+    return int((actual != expected).sum())
+
+
+def rebuild_derived():
+    """Rebuild every table derived from items and the ledger"""
+    rollup_service.rebuild()
+    read_model_sync.rebuild()
+    valuation_service.rebuild()
+    supplier_service.rebuild()
+    alert_service.rebuild()
+
+
+# MAIN
+
+def generate(args):
+    if db.session.query(func.count(Item.item_id)).scalar() and not args.truncate:
+        sys.exit('Items already exist; pass --truncate to replace all inventory data')
+
+    phases = Phases()
+    rng = np.random.default_rng(args.seed)
+    pools = faker_helpers.string_pools(args.seed)
+    phases.done('String pools built')
+
+    end_date = args.end_date or date.today()
+    start_date = end_date - timedelta(days=args.days)
+    now = np.datetime64(end_date, 's')
+
+    type_ids = ensure_transaction_types()
+    db.session.remove()
+
+    with db.engine.begin() as connection:
+        loader.prepare(connection)
+        if args.truncate:
+            truncate(connection)
+            phases.done('Existing data deleted')
+
+        categories = item_generator.generate_categories(args.categories, now)
+        suppliers = item_generator.generate_suppliers(rng, pools, args.suppliers, now)
+        locations = item_generator.generate_locations(rng, args.locations, now)
+        items = item_generator.generate_items(
+            rng, pools, args.items, args.categories, args.suppliers, args.locations,
+            created_before=np.datetime64(start_date, 's')
+        )
+        for table_name, columns in (
+            ('categories', categories), ('suppliers', suppliers),
+            ('locations', locations), ('items', items)
+        ):
+            rows = loader.load_columns(connection, table_name, columns, args.load_chunk_size)
+            phases.done(f'{table_name.capitalize()} loaded', rows)
+        loader.reset_sequences(connection, EXPLICIT_ID_TABLES)
+
+    generator = TransactionGenerator(
+        rng, items, type_ids, start_date, end_date, args.transactions, args.zipf_exponent
+    )
+    with db.engine.begin() as connection:
+        loader.prepare(connection)
+        loaded = 0
+        for chunk in generator.chunks(args.chunk_size):
+            loaded += loader.load_columns(connection, 'transactions', chunk, args.load_chunk_size)
+            print(f'  {loaded:,} / {args.transactions:,} movements', end='\r', flush=True)
+        print()
+        openings = generator.openings()
+        loaded += loader.load_columns(connection, 'transactions', openings, args.load_chunk_size)
+        phases.done('Transactions loaded (with opening receipts)', loaded)
+
+        set_current_stock(connection, type_ids)
+        mismatches = stock_mismatches(
+            connection, items['item_id'], generator.final_stock(openings)
+        )
+        if mismatches:
+            raise RuntimeError(f'{mismatches} items do not match the generated ledger')
+        phases.done('Current stock set from the ledger', args.items)
+
+    if not args.skip_derived:
+        rebuild_derived()
+        phases.done('Derived tables rebuilt')
+
+    with db.engine.begin() as connection:
+        table_versions.bump(connection, table_versions.TRACKED_TABLES)
+        connection.exec_driver_sql('ANALYZE')
+    phases.done('Statistics updated')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic inventory dataset')
+    parser.add_argument('--scale', choices=list(SCALES),
+                        help='Preset item/transaction counts (report benchmark scales)')
+    parser.add_argument('--items', type=int, default=10_000)
+    parser.add_argument('--transactions', type=int, default=1_000_000)
+    parser.add_argument('--suppliers', type=int, help='Default: one per 200 items (min 10)')
+    parser.add_argument('--locations', type=int, help='Default: one per 50 items (min 10)')
+    parser.add_argument('--categories', type=int, default=len(faker_helpers.CATEGORY_NAMES))
+    parser.add_argument('--days', type=int, default=730, help='Days of movement history')
+    parser.add_argument('--end-date', type=date.fromisoformat, help='Last day of history (default: today)')
+    parser.add_argument('--zipf-exponent', type=float, default=1.1,
+                        help='Skew of item popularity (0 = uniform)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=500_000,
+                        help='Movements generated per chunk')
+    parser.add_argument('--load-chunk-size', type=int, default=loader.DEFAULT_CHUNK_SIZE,
+                        help='Rows per COPY / executemany call')
+    parser.add_argument('--truncate', action='store_true',
+                        help='Delete existing inventory data first')
+    parser.add_argument('--skip-derived', action='store_true',
+                        help='Do not rebuild rollups, read models and summaries')
+    args = parser.parse_args(argv)
+
+    if args.scale:
+        args.items, args.transactions = SCALES[args.scale]
+    args.suppliers = args.suppliers or max(args.items // 200, 10)
+    args.locations = args.locations or max(args.items // 50, 10)
+
+    app = create_app()
+    with app.app_context():
+        generate(args)
+    print('Test data generation complete!')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Shared fixtures
+
+Tests run against a throwaway SQLite file built once with create_all(),
+emptied and seeded with a small catalogue before every test. Environment
+settings must be in place before invent_app (and so config) is imported.
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+_DB_DIR = tempfile.mkdtemp(prefix='invent_tests_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault('SECRET_KEY', 'test-secret')
+os.environ['SOCKETIO_ENABLED'] = 'False'
+os.environ['QUERY_PROFILER_ENABLED'] = 'False'
+os.environ['REPORT_JOB_DIR'] = os.path.join(_DB_DIR, 'jobs')
+
+import pytest
+from flask import g, request_started
+from invent_app import create_app, db
+from invent_app.models.normalized.category import Category
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.location import Location
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.models.normalized.transaction_type import TransactionType
+from invent_app.services import item_index, reference_cache, report_service
+from invent_app.utils import decorators
+
+
+TRANSACTION_TYPES = ('STOCK_IN', 'STOCK_OUT', 'ADJUSTMENT', 'RETURN')
+
+
+def _reset_process_caches():
+    """
+    Forget per-process caches keyed on table versions, which restart
+    from zero with every fresh database
+    """
+    reference_cache._entries.clear()
+    decorators._report_cache.clear()
+    report_service._dashboard_snapshot.update(built_at=None, data=None)
+    item_index._index.version = None
+
+
+def _fresh_globals(sender, **extra):
+    """
+    Test requests reuse the test's app context; start each with an
+    empty g, as a request in its own context would
+    """
+    for name in list(g):
+        g.pop(name)
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    request_started.connect(_fresh_globals, app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def database(app):
+    """Emptied schema inside an application context"""
+    with app.app_context():
+        with db.engine.begin() as connection:
+            for table in reversed(db.metadata.sorted_tables):
+                connection.execute(table.delete())
+        _reset_process_caches()
+        yield db
+        db.session.remove()
+
+
+@pytest.fixture
+def catalogue(database):
+    """
+    Two categories, two suppliers, one location and six items
+
+    Item i (0-5) has stock i * 2, reorder level 3 and price 10 + i, in
+    the first category for even i and the second for odd i.
+    """
+    for name in TRANSACTION_TYPES:
+        db.session.add(TransactionType(type_name=name))
+    categories = [Category(category_name='Electronics'), Category(category_name='Tools')]
+    suppliers = [Supplier(supplier_name='Acme'), Supplier(supplier_name='Globex')]
+    location = Location(warehouse='Main', aisle='A1', shelf='S1')
+    db.session.add_all(categories + suppliers + [location])
+    db.session.flush()
+
+    items = [
+        Item(
+            item_code=f'SKU-{i:03d}', item_name=f'Widget {i}',
+            category_id=categories[i % 2].category_id,
+            supplier_id=suppliers[0].supplier_id,
+            location_id=location.location_id,
+            unit_price=10 + i, current_stock=i * 2, reorder_level=3
+        )
+        for i in range(6)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+
+    return SimpleNamespace(
+        item_ids=[item.item_id for item in items],
+        category_ids=[category.category_id for category in categories],
+        supplier_ids=[supplier.supplier_id for supplier in suppliers],
+        location_id=location.location_id,
+    )
+
+
+@pytest.fixture
+def client(app, catalogue):
+    return app.test_client()
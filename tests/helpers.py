@@ -0,0 +1,38 @@
+"""Helpers shared by the derived-table tests"""
+
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from invent_app import db
+from invent_app.services import transaction_service
+
+
+def table_rows(model, exclude=()):
+    """Every row of a table as comparable tuples, in primary key order"""
+    table = model.__table__
+    columns = [column for column in table.columns if column.name not in exclude]
+    rows = db.session.execute(select(*columns).order_by(*table.primary_key.columns)).all()
+    return [
+        tuple(str(Decimal(str(v)).quantize(Decimal('0.01'))) if isinstance(v, (Decimal, float)) else v
+              for v in row)
+        for row in rows
+    ]
+
+
+def record_mixed_movements(catalogue):
+    """Single and batched movements of every type over the catalogue"""
+    ids, suppliers = catalogue.item_ids, catalogue.supplier_ids
+    transaction_service.record_movement(
+        ids[5], 'STOCK_OUT', 9, reference_number='SO-1', created_by='clerk'
+    )
+    transaction_service.record_movement(
+        ids[0], 'STOCK_IN', 4, unit_price=2.5, supplier_id=suppliers[1]
+    )
+    transaction_service.record_movements([
+        {'item_id': ids[1], 'type': 'STOCK_IN', 'quantity': 10, 'unit_price': 1.25,
+         'supplier_id': suppliers[0]},
+        {'item_id': ids[2], 'type': 'STOCK_OUT', 'quantity': 4},
+        {'item_id': ids[3], 'type': 'RETURN', 'quantity': 1},
+        {'item_id': ids[1], 'type': 'STOCK_OUT', 'quantity': 7},
+    ])
@@ -0,0 +1,60 @@
+"""Paginated, projected and conditionally cached /api/items"""
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.services import transaction_service
+
+
+def test_items_etag_revalidates(client):
+    response = client.get('/api/items')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    cached = client.get('/api/items', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+
+def test_items_etag_changes_with_stock(client, catalogue):
+    etag = client.get('/api/items').headers['ETag']
+
+    transaction_service.record_movement(catalogue.item_ids[2], 'STOCK_IN', 1)
+
+    response = client.get('/api/items', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_items_etag_changes_with_item_edit(client, catalogue):
+    etag = client.get('/api/items').headers['ETag']
+
+    db.session.get(Item, catalogue.item_ids[0]).item_name = 'Renamed'
+    db.session.commit()
+
+    response = client.get('/api/items', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert 'Renamed' in [row['item_name'] for row in response.get_json()]
+
+
+def test_items_follow_link_header(client, catalogue):
+    seen, url = [], '/api/items?limit=4'
+    while url:
+        response = client.get(url)
+        seen += [row['item_id'] for row in response.get_json()]
+        link = response.headers.get('Link')
+        url = link[link.index('<') + 1:link.index('>')] if link else None
+
+    assert seen == catalogue.item_ids
+
+
+def test_items_unknown_field(client):
+    assert client.get('/api/items?fields=item_id,password').status_code == 400
+
+
+def test_items_projection(client, catalogue):
+    response = client.get('/api/items?fields=item_id,item_code&limit=2')
+
+    assert response.get_json() == [
+        {'item_id': catalogue.item_ids[0], 'item_code': 'SKU-000'},
+        {'item_id': catalogue.item_ids[1], 'item_code': 'SKU-001'},
+    ]
@@ -0,0 +1,131 @@
+"""Batches of stock movements: set-based service path and the bulk endpoint"""
+
+import json
+
+from sqlalchemy import func
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.denormalized.transaction_denorm import TransactionDenorm
+from invent_app.services import transaction_service
+
+
+def _stock(item_id):
+    return db.session.query(Item.current_stock).filter(Item.item_id == item_id).scalar()
+
+
+def _ledger_count():
+    return db.session.query(func.count(Transaction.transaction_id)).scalar()
+
+
+# SERVICE
+
+def test_record_movements_applies_valid_lines(catalogue):
+    ids = catalogue.item_ids
+    results = transaction_service.record_movements([
+        {'item_id': ids[2], 'type': 'STOCK_IN', 'quantity': 3},
+        {'item_id': ids[2], 'type': 'STOCK_OUT', 'quantity': 6},
+        {'item_id': ids[1], 'type': 'STOCK_OUT', 'quantity': 5},
+        {'item_id': 9999, 'type': 'STOCK_IN', 'quantity': 1},
+        {'item_id': ids[0], 'type': 'STOCK_IN', 'quantity': 0},
+    ])
+
+    assert [r['status'] for r in results] == ['ok', 'ok', 'error', 'error', 'error']
+    assert results[1]['current_stock'] == 1
+    assert results[2]['error'] == 'Insufficient stock. Available: 2'
+    assert results[3]['error'] == 'Item 9999 not found'
+    assert _stock(ids[2]) == 1
+    assert _stock(ids[1]) == 2
+    assert _ledger_count() == 2
+
+
+def test_record_movements_running_balance(catalogue):
+    """Later lines see the stock left by earlier lines of the same batch"""
+    item_id = catalogue.item_ids[2]
+    results = transaction_service.record_movements([
+        {'item_id': item_id, 'type': 'STOCK_OUT', 'quantity': 4},
+        {'item_id': item_id, 'type': 'STOCK_OUT', 'quantity': 1},
+    ])
+
+    assert results[1] == {
+        'line': 2, 'status': 'error', 'error': 'Insufficient stock. Available: 0'
+    }
+    assert _stock(item_id) == 0
+
+
+def test_record_movements_atomic_rolls_back(catalogue):
+    ids = catalogue.item_ids
+    results = transaction_service.record_movements([
+        {'item_id': ids[4], 'type': 'STOCK_OUT', 'quantity': 2},
+        {'item_id': ids[1], 'type': 'STOCK_OUT', 'quantity': 50},
+    ], atomic=True)
+
+    assert [r['status'] for r in results] == ['skipped', 'error']
+    assert _stock(ids[4]) == 8
+    assert _ledger_count() == 0
+    assert db.session.query(TransactionDenorm).count() == 0
+
+
+
+# ENDPOINT
+
+def test_bulk_json_array(client, catalogue):
+    ids = catalogue.item_ids
+    response = client.post('/api/transactions/bulk', json=[
+        {'item_id': ids[1], 'type': 'STOCK_IN', 'quantity': 3},
+        {'item_id': ids[1], 'type': 'STOCK_OUT', 'quantity': 9},
+        {'item_id': ids[2], 'type': 'STOCK_OUT', 'quantity': 4},
+    ])
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert (body['accepted'], body['rejected']) == (2, 1)
+    assert body['results'][1]['error'] == 'Insufficient stock. Available: 5'
+    assert _ledger_count() == 2
+
+
+def test_bulk_ndjson(client, catalogue):
+    ids = catalogue.item_ids
+    lines = [
+        json.dumps({'item_id': ids[0], 'type': 'STOCK_IN', 'quantity': 2}),
+        '{not json',
+        '',
+        json.dumps({'item_id': ids[0], 'type': 'STOCK_OUT', 'quantity': 1}),
+    ]
+    response = client.post(
+        '/api/transactions/bulk', data='\n'.join(lines), content_type='application/x-ndjson'
+    )
+
+    results = response.get_json()['results']
+    assert [r['status'] for r in results] == ['ok', 'error', 'ok']
+    assert results[1]['error'] == 'Movement must be a JSON object'
+    assert results[2]['current_stock'] == 1
+
+
+def test_bulk_atomic_applies_nothing(client, catalogue):
+    ids = catalogue.item_ids
+    response = client.post('/api/transactions/bulk?atomic=1', json=[
+        {'item_id': ids[4], 'type': 'STOCK_OUT', 'quantity': 1},
+        {'item_id': ids[4], 'type': 'STOCK_IN', 'quantity': 1, 'supplier_id': True},
+    ])
+
+    assert response.status_code == 422
+    assert [r['status'] for r in response.get_json()['results']] == ['skipped', 'error']
+    assert _ledger_count() == 0
+    assert db.session.get(Item, ids[4]).current_stock == 8
+
+
+def test_bulk_rejects_other_bodies(app, client, catalogue):
+    assert client.post('/api/transactions/bulk', json={'item_id': 1}).status_code == 400
+    assert client.post(
+        '/api/transactions/bulk', data='nope', content_type='application/json'
+    ).status_code == 400
+
+    limit, app.config['BULK_MAX_MOVEMENTS'] = app.config['BULK_MAX_MOVEMENTS'], 1
+    try:
+        movement = {'item_id': catalogue.item_ids[0], 'type': 'STOCK_IN', 'quantity': 1}
+        response = client.post('/api/transactions/bulk', json=[movement, movement])
+    finally:
+        app.config['BULK_MAX_MOVEMENTS'] = limit
+    assert response.status_code == 413
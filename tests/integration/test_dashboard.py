@@ -0,0 +1,40 @@
+"""Dashboard figures and their snapshot cache"""
+
+from invent_app.services import report_service, transaction_service
+
+
+def test_status_counts(catalogue):
+    assert report_service.item_status_counts() == {
+        'total_items': 6,
+        'low_stock_items': 1,
+        'out_of_stock_items': 1,
+        'in_stock_items': 4,
+    }
+
+
+def test_recent_activity_series(catalogue):
+    ids = catalogue.item_ids
+    transaction_service.record_movement(ids[3], 'STOCK_IN', 4)
+    transaction_service.record_movement(ids[3], 'STOCK_IN', 2)
+    transaction_service.record_movement(ids[4], 'STOCK_OUT', 3)
+    transaction_service.record_movement(ids[4], 'RETURN', 1)
+
+    activity = report_service.recent_activity(days=7, limit=3)
+
+    assert [row.type_name for row in activity['recent_transactions']] == \
+        ['RETURN', 'STOCK_OUT', 'STOCK_IN']
+    assert len(activity['chart_labels']) == 7
+    assert activity['stock_in_data'] == [0] * 6 + [6]
+    assert activity['stock_out_data'] == [0] * 6 + [3]
+
+
+def test_dashboard_snapshot_dropped_on_movement(catalogue):
+    before = report_service.dashboard_snapshot()
+    assert before['out_of_stock_items'] == 1
+
+    transaction_service.record_movement(catalogue.item_ids[0], 'STOCK_IN', 5)
+
+    after = report_service.dashboard_snapshot()
+    assert after['out_of_stock_items'] == 0
+    assert after['recent_transactions'][0].item_name == 'Widget 0'
+    assert after['stock_in_data'][-1] == 5
@@ -0,0 +1,43 @@
+"""Streaming report exports"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from invent_app.services import export_service
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(export_service, 'EXPORT_BATCH_SIZE', 4)
+
+
+def test_csv_export(client, small_batches):
+    response = client.get('/reports/export/stock-levels?format=csv')
+
+    assert response.mimetype == 'text/csv'
+    assert 'attachment; filename="stock_levels_' in response.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['item_code'] for row in rows] == [f'SKU-{i:03d}' for i in range(6)]
+    assert rows[0]['status'] == 'Out of Stock'
+
+
+def test_ndjson_and_json_agree(client, small_batches):
+    # Drain each streamed body before the next request
+    ndjson = client.get('/reports/export/inventory-valuation?format=ndjson')
+    assert ndjson.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+    plain = client.get('/reports/export/inventory-valuation').get_json()
+
+    assert lines == plain
+    assert [row['item_code'] for row in lines] == [f'SKU-{i:03d}' for i in range(5, -1, -1)]
+
+
+@pytest.mark.parametrize('url', [
+    '/reports/export/nonsense',
+    '/reports/export/stock-levels?format=xml',
+])
+def test_unknown_export_rejected(client, url):
+    assert client.get(url).status_code == 400
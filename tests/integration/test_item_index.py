@@ -0,0 +1,46 @@
+"""Typeahead suggestions kept in step with item writes"""
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.services import item_index, table_versions
+
+
+def _suggested_ids(query):
+    return [row['item_id'] for row in item_index.suggest(query, limit=50)]
+
+
+def test_suggest_follows_local_commits(catalogue):
+    ids = catalogue.item_ids
+    assert len(_suggested_ids('widget')) == 6
+
+    db.session.get(Item, ids[0]).item_name = 'Sprocket 0'
+    db.session.delete(db.session.get(Item, ids[1]))
+    db.session.commit()
+
+    assert _suggested_ids('sprocket') == [ids[0]]
+    assert sorted(_suggested_ids('widget')) == ids[2:]
+
+
+def test_suggest_drops_items_deleted_by_other_workers(catalogue):
+    ids = catalogue.item_ids
+    assert len(_suggested_ids('widget')) == 6
+
+    # A delete plus an insert elsewhere leaves the item count unchanged
+    with db.engine.begin() as connection:
+        connection.execute(Item.__table__.delete().where(Item.item_id == ids[3]))
+        connection.execute(Item.__table__.insert().values(
+            item_code='SKU-100', item_name='Widget 100', unit_price=1,
+            category_id=catalogue.category_ids[0],
+            current_stock=0, reorder_level=0
+        ))
+        table_versions.bump(connection, {'items'})
+    db.session.commit()
+
+    suggested = _suggested_ids('widget')
+    assert ids[3] not in suggested
+    assert len(suggested) == 6
+
+
+def test_suggest_limit_clamped(client):
+    assert len(client.get('/api/items/suggest?q=widget&limit=0').get_json()) == 1
+    assert len(client.get('/api/items/suggest?q=widget&limit=-5').get_json()) == 1
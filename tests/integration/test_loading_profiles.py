@@ -0,0 +1,48 @@
+"""Pages issue a fixed number of statements regardless of row count"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from invent_app import db
+from invent_app.services import transaction_service
+
+
+@contextmanager
+def _statements():
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        yield seen
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+
+def _statement_count(client, url):
+    # Warm the per-process caches so only the page's own reads count
+    client.get(url)
+    with _statements() as seen:
+        assert client.get(url).status_code == 200
+    return len(seen)
+
+
+@pytest.mark.parametrize('url', [
+    '/transactions/',
+    '/reports/movement-history',
+    '/reports/low-stock',
+])
+def test_statements_do_not_grow_with_rows(client, catalogue, url):
+    transaction_service.record_movement(catalogue.item_ids[1], 'STOCK_IN', 1)
+    few = _statement_count(client, url)
+
+    transaction_service.record_movements([
+        {'item_id': item_id, 'type': 'STOCK_IN', 'quantity': 1,
+         'supplier_id': catalogue.supplier_ids[1]}
+        for item_id in catalogue.item_ids
+    ])
+    assert _statement_count(client, url) == few
@@ -0,0 +1,30 @@
+"""Keyset pagination against the database"""
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.utils.pagination import keyset_paginate
+
+
+def test_keyset_pages_round_trip(catalogue):
+    query = db.session.query(Item.item_id, Item.item_code)
+    key = (Item.item_id,)
+
+    first = keyset_paginate(query, key, per_page=4, descending=False, with_total=True)
+    second = keyset_paginate(query, key, cursor=first.next_cursor, per_page=4,
+                             descending=False, with_total=True)
+    back = keyset_paginate(query, key, cursor=second.prev_cursor, per_page=4,
+                           descending=False, with_total=True)
+
+    assert [row.item_id for row in first] == catalogue.item_ids[:4]
+    assert [row.item_id for row in second] == catalogue.item_ids[4:]
+    assert [row.item_id for row in back] == catalogue.item_ids[:4]
+    assert (first.total, second.total) == (6, 6)
+    assert not second.has_next and second.has_prev
+
+
+def test_keyset_invalid_cursor_starts_over(catalogue):
+    page = keyset_paginate(
+        db.session.query(Item.item_id), (Item.item_id,), cursor='garbage', per_page=2,
+        descending=False
+    )
+    assert [row.item_id for row in page] == catalogue.item_ids[:2]
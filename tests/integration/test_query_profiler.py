@@ -0,0 +1,70 @@
+"""Per-endpoint query profiles collected from live requests"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from invent_app import create_app
+from performance.profilers.query_profiler import QueryProfiler
+
+
+def _profiled_app(**options):
+    app = create_app()
+    app.config.update(TESTING=True)
+    profiler = QueryProfiler(**options)
+    profiler.attach(app)
+    return app, profiler
+
+
+def test_queries_counted_once_with_two_apps(catalogue):
+    first, first_profiler = _profiled_app()
+    second, second_profiler = _profiled_app()
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', count)
+    try:
+        assert first.test_client().get('/api/items').status_code == 200
+        assert second.test_client().get('/api/items').status_code == 200
+        assert second.test_client().get('/api/items?limit=2').status_code == 200
+    finally:
+        event.remove(Engine, 'before_cursor_execute', count)
+
+    first_stats = first_profiler.snapshot()
+    second_stats = second_profiler.snapshot()
+    assert (first_stats['requests'], second_stats['requests']) == (1, 2)
+    assert first_stats['queries'] + second_stats['queries'] == len(statements)
+    assert first_stats['endpoints'][0]['endpoint'] == 'api.get_items'
+
+
+def test_duplicates_reported(catalogue):
+    app, profiler = _profiled_app(duplicate_threshold=1)
+
+    app.test_client().get('/api/items')
+
+    assert profiler.snapshot()['duplicates']
+
+
+def test_plans_not_captured_by_default(catalogue):
+    app, profiler = _profiled_app(slow_ms=0)
+
+    app.test_client().get('/api/items')
+    profiler._explainer.shutdown(wait=True)
+
+    snapshot = profiler.snapshot()
+    assert app.config['QUERY_PROFILER_EXPLAIN'] is False
+    assert not snapshot['explain']
+    assert snapshot['slow_statements']
+    assert all(entry['plan'] is None for entry in snapshot['slow_statements'])
+
+
+def test_plans_captured_when_enabled(catalogue):
+    app, profiler = _profiled_app(slow_ms=0, explain=True)
+
+    app.test_client().get('/api/items')
+    profiler._explainer.shutdown(wait=True)
+
+    plans = [entry['plan'] for entry in profiler.snapshot()['slow_statements'] if entry['plan']]
+    assert plans
+    assert any('SCAN' in plan['plan'] or 'SEARCH' in plan['plan'] for plan in plans)
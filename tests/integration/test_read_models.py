@@ -0,0 +1,82 @@
+"""item_denorm and transaction_denorm kept in step with the normalized schema"""
+
+from datetime import datetime
+
+import pytest
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.models.denormalized.item_denorm import ItemDenorm
+from invent_app.models.denormalized.transaction_denorm import TransactionDenorm
+from invent_app.services import read_model_sync, reference_cache, transaction_service
+from invent_app.services.transaction_service import LedgerWriteError
+from tests.helpers import table_rows, record_mixed_movements
+
+
+@pytest.mark.parametrize('model', [ItemDenorm, TransactionDenorm])
+def test_movements_match_rebuild(catalogue, model):
+    record_mixed_movements(catalogue)
+    maintained = table_rows(model)
+
+    read_model_sync.rebuild()
+
+    assert maintained
+    assert table_rows(model) == maintained
+
+
+def test_renames_fan_out(catalogue):
+    ids = catalogue.item_ids
+    transaction_service.record_movement(
+        ids[2], 'STOCK_IN', 1, supplier_id=catalogue.supplier_ids[1]
+    )
+    db.session.get(Item, ids[2]).item_name = 'Sprocket 2'
+    db.session.get(Supplier, catalogue.supplier_ids[1]).supplier_name = 'Globex Ltd'
+    db.session.commit()
+
+    mirrored = db.session.query(TransactionDenorm).one()
+    assert (mirrored.item_name, mirrored.supplier_name) == ('Sprocket 2', 'Globex Ltd')
+    assert db.session.get(ItemDenorm, ids[2]).item_name == 'Sprocket 2'
+
+
+def test_orm_ledger_insert_rejected(catalogue):
+    db.session.add(Transaction(
+        item_id=catalogue.item_ids[0], quantity=1,
+        type_id=reference_cache.transaction_type_ids()['STOCK_IN'],
+        transaction_date=datetime.utcnow()
+    ))
+
+    with pytest.raises(LedgerWriteError):
+        db.session.flush()
+    db.session.rollback()
+
+    assert db.session.query(Transaction).count() == 0
+
+
+def test_orm_ledger_edit_rejected(catalogue):
+    result = transaction_service.record_movement(catalogue.item_ids[1], 'STOCK_IN', 3)
+    db.session.get(Transaction, result.transaction_id).quantity = 30
+
+    with pytest.raises(LedgerWriteError):
+        db.session.commit()
+    db.session.rollback()
+
+    assert db.session.get(TransactionDenorm, result.transaction_id).quantity == 3
+
+
+def test_bulk_mirror_rows_match_ledger(catalogue):
+    ids = catalogue.item_ids
+    transaction_service.record_movements([
+        {'item_id': ids[4], 'type': 'STOCK_OUT', 'quantity': 1, 'notes': 'first'},
+        {'item_id': ids[4], 'type': 'STOCK_OUT', 'quantity': 2, 'notes': 'second'},
+    ])
+
+    mirrored = db.session.query(
+        TransactionDenorm.transaction_id, TransactionDenorm.quantity, TransactionDenorm.notes
+    ).order_by(TransactionDenorm.transaction_id).all()
+    ledger = db.session.query(
+        Transaction.transaction_id, Transaction.quantity, Transaction.notes
+    ).order_by(Transaction.transaction_id).all()
+    assert mirrored == ledger
+    assert db.session.get(ItemDenorm, ids[4]).current_stock == 5
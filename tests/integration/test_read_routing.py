@@ -0,0 +1,129 @@
+"""Read replica routing of db.session"""
+
+import os
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, text
+
+from invent_app import db
+from invent_app.database import routing
+
+
+probe = Table('probe', MetaData(), Column('probe_id', Integer, primary_key=True))
+
+
+def _database_file():
+    """File of the database that served the statement"""
+    row = db.session.execute(text('PRAGMA database_list')).first()
+    return os.path.basename(row.file)
+
+
+def _make_app(primary, replica):
+    app = Flask(__name__)
+    app.config.update(
+        SECRET_KEY='test-secret',
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{primary}',
+        SQLALCHEMY_BINDS={'replica_0': f'sqlite:///{replica}'},
+        REPLICA_BLUEPRINTS=['reads'],
+        REPLICA_ENDPOINTS=['writes.listing'],
+        REPLICA_STICKY_SECONDS=5,
+    )
+    db.init_app(app)
+    routing.init_app(app)
+
+    reads = Blueprint('reads', __name__)
+    writes = Blueprint('writes', __name__)
+
+    @reads.route('/database')
+    def database():
+        return jsonify(_database_file())
+
+    @reads.route('/locked')
+    def locked():
+        db.session.execute(select(probe.c.probe_id).with_for_update())
+        return jsonify(_database_file())
+
+    @writes.route('/', methods=['GET', 'POST'])
+    def listing():
+        return jsonify(_database_file())
+
+    @writes.route('/add', methods=['POST'])
+    def add():
+        db.session.execute(insert(probe))
+        db.session.commit()
+        return jsonify(_database_file())
+
+    @writes.route('/other')
+    def other():
+        return jsonify(_database_file())
+
+    app.register_blueprint(reads, url_prefix='/reads')
+    app.register_blueprint(writes, url_prefix='/writes')
+    return app
+
+
+@pytest.fixture
+def replica_app(app, tmp_path):
+    """
+    A second app on the shared db, with its own primary and replica
+
+    init_app() registers a metadata per bind key on db; it is dropped
+    afterwards so the main app never sees the replica bind.
+    """
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    for path in (primary, replica):
+        engine = create_engine(f'sqlite:///{path}')
+        probe.metadata.create_all(engine)
+        engine.dispose()
+
+    known = set(db.metadatas)
+    replica_app = _make_app(primary, replica)
+    yield replica_app
+    for key in set(db.metadatas) - known:
+        del db.metadatas[key]
+    with replica_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def _served_by(client, url, method='get'):
+    return getattr(client, method)(url).get_json()
+
+
+def test_read_only_views_use_replica(replica_app):
+    client = replica_app.test_client()
+
+    assert _served_by(client, '/reads/database') == 'replica.db'
+    assert _served_by(client, '/writes/') == 'replica.db'
+    assert _served_by(client, '/writes/other') == 'primary.db'
+    assert _served_by(client, '/writes/', 'post') == 'primary.db'
+
+
+def test_statements_after_a_write_stay_on_primary(replica_app):
+    client = replica_app.test_client()
+
+    assert _served_by(client, '/reads/locked') == 'primary.db'
+
+
+def test_client_reads_its_writes(replica_app):
+    writer, other = replica_app.test_client(), replica_app.test_client()
+
+    assert _served_by(writer, '/writes/add', 'post') == 'primary.db'
+
+    assert _served_by(writer, '/reads/database') == 'primary.db'
+    assert _served_by(other, '/reads/database') == 'replica.db'
+
+
+def test_work_outside_requests_uses_primary(replica_app):
+    with replica_app.app_context():
+        assert _database_file() == 'primary.db'
+
+        routing.choose_replica(replica_app)
+        assert _database_file() == 'replica.db'
+        db.session.remove()
+
+
+def test_no_replica_configured(client):
+    assert routing.replica_binds(client.application) == []
+    assert client.get('/api/items').status_code == 200
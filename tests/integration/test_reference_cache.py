@@ -0,0 +1,54 @@
+"""Reference data cache and the shared table versions behind it"""
+
+from sqlalchemy import insert
+
+from invent_app import db
+from invent_app.models.table_version import TableVersion
+from invent_app.models.normalized.supplier import Supplier
+from invent_app.services import reference_cache, table_versions
+
+
+def _version(table_name):
+    return db.session.query(TableVersion.version)\
+        .filter(TableVersion.table_name == table_name).scalar()
+
+
+def test_bump_counts_up_from_a_missing_row(database):
+    with db.engine.begin() as connection:
+        table_versions.bump(connection, {'categories'})
+        table_versions.bump(connection, {'categories', 'suppliers'})
+
+    assert (_version('categories'), _version('suppliers')) == (2, 1)
+
+
+def test_orm_flush_bumps_version(catalogue):
+    before = _version('suppliers')
+    db.session.add(Supplier(supplier_name='Initech'))
+    db.session.commit()
+
+    assert _version('suppliers') == before + 1
+
+
+def test_reference_cache_reloads_after_commit(catalogue):
+    assert reference_cache.supplier_ids() == set(catalogue.supplier_ids)
+    supplier = Supplier(supplier_name='Initech')
+    db.session.add(supplier)
+    db.session.commit()
+
+    assert supplier.supplier_id in reference_cache.supplier_ids()
+
+
+def test_reference_cache_sees_other_workers(catalogue):
+    """A write committed elsewhere shows up once its version is bumped"""
+    assert reference_cache.supplier_ids() == set(catalogue.supplier_ids)
+
+    with db.engine.begin() as connection:
+        new_id = connection.execute(
+            insert(Supplier.__table__).values(supplier_name='Umbrella')
+        ).inserted_primary_key[0]
+    assert new_id not in reference_cache.supplier_ids()
+
+    with db.engine.begin() as connection:
+        table_versions.bump(connection, {'suppliers'})
+    assert new_id in reference_cache.supplier_ids()
+    assert (new_id, 'Umbrella') in reference_cache.supplier_choices()
@@ -0,0 +1,36 @@
+"""Report pages cached and revalidated on table versions"""
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.services import transaction_service
+
+
+def test_report_revalidates(client):
+    response = client.get('/reports/low-stock')
+    assert response.status_code == 200
+
+    cached = client.get('/reports/low-stock', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def test_report_cache_follows_movements(client, catalogue):
+    first = client.get('/reports/low-stock')
+    assert b'Widget 0' in first.data
+
+    transaction_service.record_movement(catalogue.item_ids[0], 'STOCK_IN', 10)
+
+    second = client.get('/reports/low-stock', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert b'Widget 0' not in second.data
+
+
+def test_report_cache_follows_item_edits(client, catalogue):
+    first = client.get('/reports/stock-levels')
+
+    db.session.get(Item, catalogue.item_ids[5]).item_name = 'Gadget 5'
+    db.session.commit()
+
+    second = client.get('/reports/stock-levels')
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert b'Gadget 5' in second.data
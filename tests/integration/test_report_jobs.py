@@ -0,0 +1,104 @@
+"""Background report jobs and their process pool"""
+
+import csv
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from invent_app.services import report_job_service
+
+
+def _die(directory, job):
+    """Stands in for _run: the worker process exits mid-job"""
+    os._exit(1)
+
+
+def _broken_pool():
+    executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('fork'))
+    with pytest.raises(BrokenProcessPool):
+        executor.submit(os._exit, 1).result()
+    return executor
+
+
+@pytest.fixture
+def jobs(app, client, tmp_path):
+    """Client with a private job directory and a fresh pool"""
+    directory = app.config['REPORT_JOB_DIR']
+    app.config['REPORT_JOB_DIR'] = str(tmp_path)
+    yield client
+    app.config['REPORT_JOB_DIR'] = directory
+    if report_job_service._executor is not None:
+        report_job_service._executor.shutdown(cancel_futures=True)
+        report_job_service._executor = None
+
+
+def _submit(client, report='stock-levels'):
+    response = client.post(f'/reports/jobs?report={report}&format=csv')
+    assert response.status_code == 202
+    return response.get_json()
+
+
+def _wait(client, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f'/reports/jobs/{job_id}/status').get_json()
+        if job['status'] in (report_job_service.DONE, report_job_service.FAILED):
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.1)
+
+
+def _result_codes(client, job_id):
+    response = client.get(f'/reports/jobs/{job_id}/result')
+    assert response.status_code == 200
+    return [row['item_code'] for row in csv.DictReader(io.StringIO(response.get_data(as_text=True)))]
+
+
+def test_job_runs_to_completion(jobs):
+    job = _submit(jobs)
+
+    assert _wait(jobs, job['job_id'])['status'] == report_job_service.DONE
+    assert _result_codes(jobs, job['job_id']) == [f'SKU-{i:03d}' for i in range(6)]
+    assert _submit(jobs)['job_id'] == job['job_id']
+
+
+def test_broken_pool_replaced_on_submit(jobs):
+    broken = _broken_pool()
+    report_job_service._executor = broken
+
+    job = _submit(jobs)
+
+    assert report_job_service._executor is not broken
+    assert _wait(jobs, job['job_id'])['status'] == report_job_service.DONE
+
+
+def test_job_failed_when_no_pool_works(jobs, monkeypatch):
+    monkeypatch.setattr(report_job_service, '_pool', _broken_pool)
+
+    job = _submit(jobs)
+
+    assert job['status'] == report_job_service.FAILED
+    assert jobs.get(f"/reports/jobs/{job['job_id']}/status").get_json()['status'] == \
+        report_job_service.FAILED
+
+
+def test_worker_death_fails_job_and_drops_pool(jobs, monkeypatch):
+    pool = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('fork'))
+    report_job_service._executor = pool
+    monkeypatch.setattr(report_job_service, '_run', _die)
+
+    job = _wait(jobs, _submit(jobs)['job_id'])
+
+    assert job['status'] == report_job_service.FAILED
+    assert report_job_service._executor is None
+
+    # The next identical request queues the job again on a new pool
+    monkeypatch.undo()
+    retried = _submit(jobs)
+    assert retried['status'] == report_job_service.QUEUED
+    assert _wait(jobs, retried['job_id'])['status'] == report_job_service.DONE
@@ -0,0 +1,32 @@
+"""Daily movement rollup kept in step with the ledger"""
+
+from datetime import datetime, timedelta
+
+from invent_app.models.denormalized.daily_rollup import TransactionDailyRollup
+from invent_app.services import reference_cache, rollup_service, transaction_service
+from tests.helpers import table_rows, record_mixed_movements
+
+
+def test_movements_match_rebuild(catalogue):
+    record_mixed_movements(catalogue)
+    maintained = table_rows(TransactionDailyRollup)
+
+    assert rollup_service.rebuild() == len(maintained)
+    assert table_rows(TransactionDailyRollup) == maintained
+
+
+def test_range_queries(catalogue):
+    ids = catalogue.item_ids
+    record_mixed_movements(catalogue)
+    types = reference_cache.transaction_type_ids()
+    today = datetime.utcnow().date()
+
+    assert rollup_service.quantity_by_type(today, today) == {
+        types['STOCK_IN']: 14, types['STOCK_OUT']: 20, types['RETURN']: 1,
+    }
+    assert rollup_service.quantity_by_type(item_id=ids[1]) == {
+        types['STOCK_IN']: 10, types['STOCK_OUT']: 7,
+    }
+    assert rollup_service.transaction_count(today) == 6
+    assert rollup_service.transaction_count(today + timedelta(days=1)) == 0
+    assert rollup_service.most_active_items(limit=1) == [('Widget 1', 2)]
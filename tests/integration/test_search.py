@@ -0,0 +1,57 @@
+"""Ranked item search and the counts shown next to it"""
+
+import pytest
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.services import search_service
+
+
+@pytest.fixture
+def many_gears(catalogue):
+    """More matching items than one search returns"""
+    count = search_service.SEARCH_RESULT_LIMIT + 5
+    db.session.execute(Item.__table__.insert(), [
+        {'item_code': f'GR-{i:04d}', 'item_name': f'Gear {i:04d}',
+         'category_id': catalogue.category_ids[i % 2], 'unit_price': 1,
+         'current_stock': 1, 'reorder_level': 0}
+        for i in range(count)
+    ])
+    db.session.commit()
+    return count
+
+
+def test_search_and_count_agree(catalogue):
+    ranked = search_service.search_item_ids('widget 3')
+
+    assert [item_id for item_id, _ in ranked] == [catalogue.item_ids[3]]
+    assert search_service.count_item_matches('widget') == 6
+    assert search_service.count_item_matches('widget', catalogue.category_ids[1]) == 3
+    assert search_service.count_item_matches('  ') == 0
+
+
+def test_count_goes_past_result_limit(many_gears):
+    assert len(search_service.search_item_ids('gear')) == search_service.SEARCH_RESULT_LIMIT
+    assert search_service.count_item_matches('gear') == many_gears
+
+
+def test_item_list_reports_every_match(client, many_gears):
+    page = client.get('/items/?search=gear').get_data(as_text=True)
+
+    assert f'All Items ({many_gears})' in page
+    assert f'Showing the best {search_service.SEARCH_RESULT_LIMIT} of {many_gears} matches' in page
+
+
+def test_item_list_without_notice_when_complete(client):
+    page = client.get('/items/?search=widget').get_data(as_text=True)
+
+    assert 'All Items (6)' in page
+    assert 'Showing the best' not in page
+
+
+def test_api_search_total_header(client, many_gears):
+    response = client.get('/api/items?q=gear&limit=10')
+
+    assert len(response.get_json()) == 10
+    assert response.headers['X-Total-Count'] == str(many_gears)
+    assert client.get('/api/items?q=widget').headers['X-Total-Count'] == '6'
@@ -0,0 +1,81 @@
+"""Low-stock alert set kept in step with stock and pushed on change"""
+
+import pytest
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.denormalized.stock_alert import StockAlert
+from invent_app.services import alert_service, transaction_service
+from invent_app.utils import realtime
+from tests.helpers import table_rows, record_mixed_movements
+
+
+def _alert_levels():
+    return dict(db.session.query(StockAlert.item_id, StockAlert.level))
+
+
+@pytest.fixture
+def pushed(monkeypatch):
+    """Events emitted to dashboards, as (event, data) pairs"""
+    events = []
+    monkeypatch.setattr(realtime, 'enabled', lambda: True)
+    monkeypatch.setattr(realtime, 'emit', lambda event, data, to=None: events.append((event, data)))
+    return events
+
+
+def test_movements_match_rebuild(catalogue):
+    record_mixed_movements(catalogue)
+    maintained = table_rows(StockAlert, exclude=('raised_at',))
+
+    alert_service.rebuild()
+
+    assert maintained
+    assert table_rows(StockAlert, exclude=('raised_at',)) == maintained
+
+
+def test_stock_alerts_follow_movements(catalogue):
+    ids = catalogue.item_ids
+    assert _alert_levels() == {ids[0]: alert_service.OUT, ids[1]: alert_service.LOW}
+
+    transaction_service.record_movement(ids[0], 'STOCK_IN', 10)
+    transaction_service.record_movement(ids[2], 'STOCK_OUT', 4)
+
+    assert _alert_levels() == {ids[1]: alert_service.LOW, ids[2]: alert_service.OUT}
+    assert alert_service.counts() == {'low_stock_items': 1, 'out_of_stock_items': 1}
+
+
+def test_stock_alerts_follow_item_edits(catalogue):
+    ids = catalogue.item_ids
+    db.session.get(Item, ids[3]).reorder_level = 6
+    db.session.delete(db.session.get(Item, ids[1]))
+    db.session.commit()
+
+    assert _alert_levels() == {ids[0]: alert_service.OUT, ids[3]: alert_service.LOW}
+
+
+def test_transitions_pushed_after_commit(catalogue, pushed):
+    ids = catalogue.item_ids
+    transaction_service.record_movements([
+        {'item_id': ids[2], 'type': 'STOCK_OUT', 'quantity': 2},
+        {'item_id': ids[1], 'type': 'STOCK_OUT', 'quantity': 2},
+        {'item_id': ids[5], 'type': 'STOCK_OUT', 'quantity': 1},
+    ])
+
+    [(event, data)] = pushed
+    assert event == alert_service.ALERT_EVENT
+    assert [(t['item_id'], t['previous'], t['level']) for t in data['transitions']] == [
+        (ids[1], alert_service.LOW, alert_service.OUT),
+        (ids[2], alert_service.OK, alert_service.LOW),
+    ]
+    assert data['counts'] == {'low_stock_items': 1, 'out_of_stock_items': 2}
+
+
+def test_nothing_pushed_without_transitions_or_on_rollback(catalogue, pushed):
+    ids = catalogue.item_ids
+    transaction_service.record_movement(ids[5], 'STOCK_OUT', 1)
+
+    db.session.get(Item, ids[4]).current_stock = 0
+    db.session.flush()
+    db.session.rollback()
+
+    assert pushed == []
@@ -0,0 +1,110 @@
+"""As-of stock levels from snapshots and the daily rollup"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.services import (
+    rollup_service, stock_snapshot_service, transaction_service, valuation_service
+)
+
+
+TODAY = datetime.utcnow().date()
+
+
+def _day(days_ago):
+    return TODAY - timedelta(days=days_ago)
+
+
+@pytest.fixture
+def history(catalogue):
+    """
+    Items created 30 days ago; item 1 moved 20 and 10 days ago, item 4
+    5 days ago. Returns the expected stock per item per day.
+    """
+    ids = catalogue.item_ids
+    db.session.execute(update(Item).values(
+        created_at=datetime.combine(_day(30), datetime.min.time())
+    ))
+    db.session.commit()
+
+    for item_id, kind, quantity, days_ago in [
+        (ids[1], 'STOCK_IN', 8, 20),
+        (ids[1], 'STOCK_OUT', 3, 10),
+        (ids[4], 'STOCK_OUT', 6, 5),
+    ]:
+        result = transaction_service.record_movement(item_id, kind, quantity)
+        db.session.execute(
+            update(Transaction)
+            .where(Transaction.transaction_id == result.transaction_id)
+            .values(transaction_date=datetime.combine(_day(days_ago), datetime.min.time()))
+        )
+        db.session.commit()
+    rollup_service.rebuild()
+
+    def expected(days_ago):
+        stock = {item_id: i * 2 for i, item_id in enumerate(ids)}
+        stock[ids[1]] = 2 + 8 - 3
+        stock[ids[4]] = 8 - 6
+        if days_ago >= 5:
+            stock[ids[4]] += 6
+        if days_ago >= 10:
+            stock[ids[1]] += 3
+        if days_ago >= 20:
+            stock[ids[1]] -= 8
+        return stock
+    return expected
+
+
+def _stock(as_of):
+    return {p.item_id: p.current_stock for p in stock_snapshot_service.stock_as_of(as_of)}
+
+
+@pytest.mark.parametrize('days_ago', [25, 15, 7, 2])
+def test_as_of_without_snapshots(history, days_ago):
+    assert _stock(_day(days_ago)) == history(days_ago)
+
+
+@pytest.mark.parametrize('days_ago', [25, 21, 15, 12, 7, 2])
+def test_as_of_from_nearest_snapshot(history, days_ago):
+    stock_snapshot_service.take_snapshot(_day(22))
+    stock_snapshot_service.take_snapshot(_day(12))
+
+    assert _stock(_day(days_ago)) == history(days_ago)
+
+
+def test_items_created_later_are_left_out(history, catalogue):
+    db.session.add(Item(
+        item_code='SKU-NEW', item_name='New', category_id=catalogue.category_ids[0],
+        unit_price=1, current_stock=5, reorder_level=0
+    ))
+    db.session.commit()
+    stock_snapshot_service.take_snapshot(_day(1))
+
+    assert _stock(_day(3)) == history(3)
+    assert len(_stock(TODAY)) == 7
+
+
+def test_prune_snapshots(history):
+    stock_snapshot_service.take_snapshot(_day(22))
+    stock_snapshot_service.take_snapshot(_day(12))
+
+    assert stock_snapshot_service.prune_snapshots(15) == 6
+    assert _stock(_day(21)) == history(21)
+
+
+def test_valuation_as_of_orders_like_live(history):
+    live = [
+        (row.category_name, float(row.total_value))
+        for row in valuation_service.category_totals() if row.item_count
+    ]
+    categories, top_items = stock_snapshot_service.valuation_as_of(TODAY)
+
+    assert [(c['category_name'], c['value']) for c in categories] == live
+    assert live[0][0] == 'Tools'
+    values = [item['total_value'] for item in top_items]
+    assert values == sorted(values, reverse=True)
@@ -0,0 +1,63 @@
+"""Supplier performance from supplier_stats or the ledger"""
+
+import pytest
+
+from invent_app.models.denormalized.supplier_stats import SupplierStats
+from invent_app.services import supplier_service, transaction_service
+from tests.helpers import table_rows, record_mixed_movements
+
+
+@pytest.fixture
+def stats_disabled(app):
+    app.config['SUPPLIER_STATS_ENABLED'] = False
+    yield
+    app.config['SUPPLIER_STATS_ENABLED'] = True
+
+
+def _performance():
+    return [
+        (row.supplier_name, row.items_supplied, row.transaction_count,
+         row.total_quantity, float(row.total_value))
+        for row in supplier_service.performance()
+    ]
+
+
+EXPECTED = [
+    ('Acme', 6, 1, 10, 12.5),
+    ('Globex', 0, 1, 4, 10.0),
+]
+
+
+def test_movements_match_rebuild(catalogue):
+    record_mixed_movements(catalogue)
+    maintained = table_rows(SupplierStats)
+
+    supplier_service.rebuild()
+
+    assert maintained
+    assert table_rows(SupplierStats) == maintained
+
+
+def test_performance_from_stats(catalogue):
+    record_mixed_movements(catalogue)
+    assert _performance() == EXPECTED
+
+
+def test_performance_from_ledger_when_disabled(catalogue, stats_disabled):
+    record_mixed_movements(catalogue)
+
+    assert table_rows(SupplierStats) == []
+    assert _performance() == EXPECTED
+
+
+def test_reenabled_stats_need_rebuild(app, catalogue, stats_disabled):
+    record_mixed_movements(catalogue)
+    app.config['SUPPLIER_STATS_ENABLED'] = True
+    transaction_service.record_movement(
+        catalogue.item_ids[4], 'STOCK_IN', 2, unit_price=5, supplier_id=catalogue.supplier_ids[1]
+    )
+    assert _performance()[0][0] == 'Globex'
+
+    supplier_service.rebuild()
+
+    assert _performance() == [('Globex', 0, 2, 6, 20.0), ('Acme', 6, 1, 10, 12.5)]
@@ -0,0 +1,90 @@
+"""Single stock movements through the mutation engine and the API"""
+
+import pytest
+from sqlalchemy import func
+
+from invent_app import db
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.services import transaction_service
+from invent_app.services.transaction_service import (
+    StockError, UnknownItemError, InsufficientStockError
+)
+
+
+def _stock(item_id):
+    return db.session.query(Item.current_stock).filter(Item.item_id == item_id).scalar()
+
+
+def _ledger_count():
+    return db.session.query(func.count(Transaction.transaction_id)).scalar()
+
+
+# SERVICE
+
+def test_record_movement_updates_stock(catalogue):
+    item_id = catalogue.item_ids[3]
+
+    result = transaction_service.record_movement(item_id, 'STOCK_OUT', 4)
+
+    assert result.item_id == item_id
+    assert result.current_stock == 2
+    assert _stock(item_id) == 2
+    ledger = db.session.get(Transaction, result.transaction_id)
+    assert (ledger.item_id, ledger.quantity) == (item_id, 4)
+
+
+def test_record_movement_insufficient_stock(catalogue):
+    item_id = catalogue.item_ids[1]
+
+    with pytest.raises(InsufficientStockError) as raised:
+        transaction_service.record_movement(item_id, 'STOCK_OUT', 3)
+
+    assert raised.value.available == 2
+    assert _stock(item_id) == 2
+    assert _ledger_count() == 0
+
+
+def test_record_movement_unknown_item(catalogue):
+    with pytest.raises(UnknownItemError):
+        transaction_service.record_movement(9999, 'STOCK_IN', 1)
+    assert _ledger_count() == 0
+
+
+def test_record_movement_rejects_bad_input(catalogue):
+    with pytest.raises(StockError, match='Quantity must be at least 1'):
+        transaction_service.record_movement(catalogue.item_ids[0], 'STOCK_IN', True)
+    with pytest.raises(StockError, match='Supplier 9999 not found'):
+        transaction_service.record_movement(catalogue.item_ids[0], 'STOCK_IN', 1, supplier_id=9999)
+    assert _ledger_count() == 0
+
+
+
+# API
+
+def test_create_transaction(client, catalogue):
+    item_id = catalogue.item_ids[3]
+    response = client.post('/api/transactions', json={
+        'item_id': item_id, 'type': 'STOCK_OUT', 'quantity': 2
+    })
+
+    assert response.status_code == 201
+    assert response.get_json()['current_stock'] == 4
+
+
+def test_create_transaction_errors(client, catalogue):
+    item_id = catalogue.item_ids[1]
+
+    def post(**data):
+        return client.post('/api/transactions', json=dict({'item_id': item_id}, **data))
+
+    assert post(item_id=9999, type='STOCK_IN', quantity=1).status_code == 404
+
+    insufficient = post(type='STOCK_OUT', quantity=5)
+    assert insufficient.status_code == 409
+    assert insufficient.get_json()['available'] == 2
+
+    assert post(type='STOCK_IN', quantity=True).status_code == 400
+    assert post(type='STOCK_IN', quantity=1, supplier_id=9999).status_code == 400
+    assert post(type='STOCK_IN', quantity=1, reference_number=12).status_code == 400
+    assert _ledger_count() == 0
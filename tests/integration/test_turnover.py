@@ -0,0 +1,85 @@
+"""Stock turnover and days of cover from the daily rollup"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import update
+
+from invent_app import db
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.services import report_service, rollup_service, transaction_service
+
+
+DAYS = 30
+
+
+def _backdate(result, days_ago):
+    db.session.execute(
+        update(Transaction)
+        .where(Transaction.transaction_id == result.transaction_id)
+        .values(transaction_date=datetime.utcnow() - timedelta(days=days_ago))
+    )
+    db.session.commit()
+
+
+def _average_stock(current, movements):
+    """Mean closing stock over the window, replayed day by day"""
+    closing = []
+    for day in range(DAYS):
+        later = sum(net for days_ago, net in movements if DAYS - 1 - days_ago > day)
+        closing.append(current - later)
+    return sum(closing) / DAYS
+
+
+def _spread_movements(catalogue):
+    ids = catalogue.item_ids
+    _backdate(transaction_service.record_movement(ids[2], 'STOCK_IN', 6), 10)
+    _backdate(transaction_service.record_movement(ids[2], 'STOCK_OUT', 5), 2)
+    _backdate(transaction_service.record_movement(ids[3], 'STOCK_OUT', 3), 20)
+    _backdate(transaction_service.record_movement(ids[3], 'RETURN', 1), 40)
+    rollup_service.rebuild()
+
+
+def test_turnover_matches_day_by_day_replay(catalogue):
+    ids = catalogue.item_ids
+    _spread_movements(catalogue)
+
+    data = report_service.stock_turnover(DAYS)
+    by_item = {item_id: i for i, item_id in enumerate(data['item_id'].tolist())}
+
+    # Item 2: stock 4, +6 ten days ago, -5 two days ago, now 5
+    i = by_item[ids[2]]
+    average = _average_stock(5, [(10, 6), (2, -5)])
+    assert data['current_stock'][i] == 5
+    assert data['stock_out'][i] == 5
+    assert np.isclose(data['average_stock'][i], average)
+    assert np.isclose(data['turnover'][i], 5 / average)
+    assert np.isclose(data['days_of_cover'][i], 5 / (5 / DAYS))
+
+    # Item 3: the RETURN is outside the window
+    i = by_item[ids[3]]
+    assert np.isclose(data['average_stock'][i], _average_stock(4, [(20, -3)]))
+
+    # Unmoved items
+    i = by_item[ids[4]]
+    assert (data['stock_out'][i], data['turnover'][i]) == (0, 0)
+    assert np.isinf(data['days_of_cover'][i])
+    assert len(data['item_id']) == 6
+
+
+def test_turnover_report_sorts(catalogue):
+    ids = catalogue.item_ids
+    _spread_movements(catalogue)
+
+    by_turnover = report_service.turnover_report(DAYS, limit=3)
+    by_cover = report_service.turnover_report(DAYS, sort='cover', limit=2)
+
+    assert [row['item_id'] for row in by_turnover['items']] == [ids[2], ids[3], ids[0]]
+    assert by_turnover['items'][2]['days_of_cover'] is None
+    assert [row['item_id'] for row in by_cover['items']] == [ids[2], ids[3]]
+    assert by_turnover['moving_items'] == 2
+    assert by_turnover['total_stock_out'] == 8
+
+
+def test_turnover_page(client):
+    assert client.get('/reports/stock-turnover?sort=cover').status_code == 200
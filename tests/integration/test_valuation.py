@@ -0,0 +1,88 @@
+"""category_valuation kept in step with movements and item writes"""
+
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from invent_app import db
+from invent_app.models.normalized.category import Category
+from invent_app.models.normalized.item import Item
+from invent_app.models.denormalized.category_valuation import CategoryValuation
+from invent_app.services import valuation_service
+from tests.helpers import table_rows, record_mixed_movements
+
+
+def test_movements_match_rebuild(catalogue):
+    record_mixed_movements(catalogue)
+    maintained = table_rows(CategoryValuation)
+
+    valuation_service.rebuild()
+
+    assert table_rows(CategoryValuation) == maintained
+
+
+def test_valuation_after_item_edits(catalogue):
+    ids, categories = catalogue.item_ids, catalogue.category_ids
+    moved = db.session.get(Item, ids[2])
+    moved.category_id = categories[1]
+    moved.unit_price = Decimal('99.95')
+    db.session.get(Item, ids[3]).current_stock = 40
+    db.session.delete(db.session.get(Item, ids[4]))
+    db.session.add(Item(
+        item_code='SKU-NEW', item_name='New widget', category_id=categories[0],
+        unit_price=Decimal('3.10'), current_stock=7, reorder_level=1
+    ))
+    db.session.commit()
+
+    assert valuation_service.verify() == []
+    assert valuation_service.item_count() == 6
+
+
+def test_edits_across_flushes(catalogue):
+    item = db.session.get(Item, catalogue.item_ids[1])
+    item.unit_price = 3.5
+    db.session.flush()
+    item.unit_price = Decimal('4.25')
+    item.current_stock = 9
+    db.session.flush()
+    db.session.commit()
+
+    assert valuation_service.verify() == []
+
+
+def test_item_changed_by_a_later_flush_hook(catalogue):
+    ids = catalogue.item_ids
+
+    def restock(session, flush_context, instances):
+        session.get(Item, ids[3]).current_stock = 50
+
+    event.listen(Session, 'before_flush', restock)
+    try:
+        db.session.get(Item, ids[2]).unit_price = Decimal('1.00')
+        db.session.commit()
+    finally:
+        event.remove(Session, 'before_flush', restock)
+
+    assert db.session.get(Item, ids[3]).current_stock == 50
+    assert valuation_service.verify() == []
+
+
+def test_expired_item_deleted(catalogue):
+    db.session.commit()
+    db.session.delete(db.session.get(Item, catalogue.item_ids[5]))
+    db.session.commit()
+
+    assert valuation_service.verify() == []
+    assert valuation_service.item_count(catalogue.category_ids[1]) == 2
+
+
+def test_category_lifecycle(catalogue):
+    category = Category(category_name='Empty')
+    db.session.add(category)
+    db.session.commit()
+    assert db.session.get(CategoryValuation, category.category_id).item_count == 0
+
+    db.session.delete(category)
+    db.session.commit()
+    assert db.session.get(CategoryValuation, category.category_id) is None
@@ -0,0 +1,45 @@
+"""Typeahead index lookups and ranking"""
+
+from invent_app.services.item_index import ItemIndex
+
+
+def _index(rows):
+    index = ItemIndex()
+    index.rebuild(rows)
+    return index
+
+
+def test_exact_code_first_among_many_prefix_matches():
+    rows = [(i, f'BOLT-{i:04d}', f'Bolt {i}') for i in range(1, 400)]
+    index = _index(rows)
+
+    results = index.search('bolt-0399', limit=5)
+
+    assert results[0] == (399, 'BOLT-0399', 'Bolt 399')
+
+
+def test_every_word_applies_past_the_first_entries():
+    rows = [(i, f'SKU-{i:04d}', f'Steel bracket {i}') for i in range(1, 300)]
+    rows.append((300, 'SKU-9999', 'Steel hinge'))
+    index = _index(rows)
+
+    assert index.search('steel hinge') == [(300, 'SKU-9999', 'Steel hinge')]
+
+
+def test_ranking_spans_whole_range():
+    rows = [(i, f'X-{i:04d}', f'Bolt {i:04d}') for i in range(1, 300)]
+    rows.append((300, 'BOLT', 'Zinc bolt'))
+    index = _index(rows)
+
+    assert [row[0] for row in index.search('bolt', limit=3)] == [300, 1, 2]
+
+
+def test_upsert_and_remove():
+    index = _index([(1, 'A-1', 'Red lamp')])
+    index.upsert(1, 'A-1', 'Blue lamp')
+    index.upsert(2, 'A-2', 'Green lamp')
+    index.remove(2)
+
+    assert index.search('lamp') == [(1, 'A-1', 'Blue lamp')]
+    assert index.search('red') == []
+    assert len(index) == 1
@@ -0,0 +1,58 @@
+"""Keyset cursor encoding and validation"""
+
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from invent_app.models.normalized.item import Item
+from invent_app.models.normalized.transaction import Transaction
+from invent_app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+LEDGER_KEY = (Transaction.transaction_date, Transaction.transaction_id)
+
+
+def _token(payload):
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def test_cursor_round_trip():
+    values = (datetime(2024, 3, 1, 12, 30, 15, 250000), 42)
+    token = encode_cursor('next', values)
+    assert decode_cursor(token, LEDGER_KEY) == ('next', list(values), None)
+
+
+def test_cursor_carries_total():
+    token = encode_cursor('prev', (7,), total=120)
+    assert decode_cursor(token, (Item.item_id,)) == ('prev', [7], 120)
+
+
+@pytest.mark.parametrize('token', [
+    'not base64 at all!',
+    _token({'direction': 'next'}),
+    _token(['sideways', [1]]),
+    _token(['next', 1]),
+    _token(['next', [[1, 2]]]),
+    _token(['next', [{'x': 1}]]),
+    _token(['next', [1], -5]),
+    _token(['next', [1], 'many']),
+])
+def test_malformed_cursor_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize('values', [
+    [1],
+    [{'dt': '2024-03-01T00:00:00'}, 1, 2],
+    [{'dt': '2024-03-01T00:00:00'}, 'abc'],
+    [{'dt': '2024-03-01T00:00:00'}, True],
+    [{'dt': '2024-03-01T00:00:00'}, None],
+    [5, 1],
+])
+def test_cursor_must_fit_sort_key(values):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(_token(['next', values]), LEDGER_KEY)
@@ -0,0 +1,25 @@
+"""Statement normalisation and EXPLAIN eligibility"""
+
+import pytest
+
+from performance.profilers.query_profiler import normalize, _explainable
+
+
+def test_normalize_collapses_whitespace_and_in_lists():
+    assert normalize('SELECT *\n  FROM items\tWHERE item_id IN (?, ?, ?)') == \
+        'SELECT * FROM items WHERE item_id IN (?)'
+    assert normalize('SELECT 1 WHERE a IN (%(a_1)s, %(a_2)s)') == 'SELECT 1 WHERE a IN (?)'
+    assert normalize('SELECT f(?) FROM t') == 'SELECT f(?) FROM t'
+
+
+@pytest.mark.parametrize('statement, explainable', [
+    ('SELECT * FROM items', True),
+    ('  select 1', True),
+    ('WITH recent AS (SELECT 1) SELECT * FROM recent', True),
+    ('WITH moved AS (UPDATE items SET x = 1 RETURNING *) SELECT * FROM moved', False),
+    ('SELECT * FROM items FOR UPDATE', False),
+    ('UPDATE items SET current_stock = 1', False),
+    ('INSERT INTO items VALUES (1)', False),
+])
+def test_explainable(statement, explainable):
+    assert _explainable(statement) is explainable
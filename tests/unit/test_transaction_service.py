@@ -0,0 +1,53 @@
+"""Movement input validation"""
+
+from decimal import Decimal
+
+import pytest
+
+from invent_app.services.transaction_service import _validate_movement
+
+
+TYPE_IDS = {'STOCK_IN': 1, 'STOCK_OUT': 2, 'RETURN': 4}
+SUPPLIER_IDS = {1, 2}
+
+
+def _movement(**overrides):
+    return dict({'item_id': 1, 'type': 'STOCK_IN', 'quantity': 5}, **overrides)
+
+
+@pytest.mark.parametrize('movement', [
+    _movement(),
+    _movement(unit_price=2.5, supplier_id=1, reference_number='PO-1'),
+    _movement(unit_price=Decimal('9.99'), notes='damaged box', created_by='clerk'),
+    _movement(type='STOCK_OUT', unit_price=0),
+])
+def test_valid_movement(movement):
+    assert _validate_movement(movement, TYPE_IDS, SUPPLIER_IDS) is None
+
+
+@pytest.mark.parametrize('movement, error', [
+    ('not a dict', 'Movement must be a JSON object'),
+    (_movement(item_id='1'), 'item_id must be an integer'),
+    (_movement(item_id=True), 'item_id must be an integer'),
+    (_movement(type='TELEPORT'), 'Unsupported transaction type TELEPORT'),
+    (_movement(type='ADJUSTMENT'), 'Unsupported transaction type ADJUSTMENT'),
+    (_movement(quantity=0), 'Quantity must be at least 1'),
+    (_movement(quantity=2.5), 'Quantity must be at least 1'),
+    (_movement(quantity=True), 'Quantity must be at least 1'),
+    (_movement(unit_price=-1), 'Price cannot be negative'),
+    (_movement(unit_price=True), 'Price cannot be negative'),
+    (_movement(unit_price='3'), 'Price cannot be negative'),
+    (_movement(supplier_id=True), 'supplier_id must be an integer'),
+    (_movement(supplier_id=99), 'Supplier 99 not found'),
+    (_movement(reference_number=12345), 'reference_number must be a string'),
+    (_movement(notes={'text': 'x'}), 'notes must be a string'),
+    (_movement(reference_number='x' * 101), 'Reference number must be less than 100 characters'),
+])
+def test_invalid_movement(movement, error):
+    assert _validate_movement(movement, TYPE_IDS, SUPPLIER_IDS) == error
+
+
+def test_type_missing_from_database():
+    movement = _movement(type='RETURN')
+    assert _validate_movement(movement, {'STOCK_IN': 1}, SUPPLIER_IDS) == \
+        'Transaction type RETURN not found'